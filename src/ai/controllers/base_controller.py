@@ -1,35 +1,150 @@
 import os
+import pickle
+from typing import Optional
 
 import numpy as np
-from sb3_contrib import MaskablePPO
-from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
 
-from src.ai.environments import EnvManager, EnvType
+from src.ai.environments import EnvType
 from src.config import Config
-from src.utils import set_random_seed
+from src.utils import set_random_seed, printc
+from .numpy_policy import NumpyPolicy, check_parity, get_source_hash
+
+# Stable Baselines3 (and with it torch) is imported only when the model itself is needed - to convert it to a
+# NumpyPolicy, or for non-deterministic predictions. Deterministic predictions only need the NumpyPolicy.
+
+loaded_models = {}  # model path -> (model, norm_env); each model is loaded only once per process
+loaded_numpy_policies = {}  # model path -> NumpyPolicy (None if the model can't be converted)
 
 
 class BaseModelController:
     def __init__(self, env_type: EnvType, model_name: str, algorithm: str = 'PPO'):
         root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
-        model_path = os.path.join(root_dir, 'ai-models', algorithm, env_type.name.lower(), model_name)
-        norm_stats_path = os.path.join(root_dir, 'ai-models', algorithm, env_type.name.lower(), f"{model_name}_normalization_stats.pkl")
+        self.env_type = env_type
+        self.model_path = os.path.join(root_dir, 'ai-models', algorithm, env_type.name.lower(), model_name)
+        self.norm_stats_path = os.path.join(root_dir, 'ai-models', algorithm, env_type.name.lower(), f"{model_name}_normalization_stats.pkl")
+        # NumPy copy of the model's actor, converted (and checked) automatically when the model changes
+        self.numpy_policy_path = os.path.join(root_dir, 'ai-models', algorithm, env_type.name.lower(), f"{model_name}_numpy_policy.npz")
+
+        self._model = None
+        self._norm_env = None
+        self.numpy_policy: Optional[NumpyPolicy] = None
+        if Config.options['numpy_inference']:
+            self.numpy_policy = self.load_numpy_policy()
+        if self.numpy_policy is None:
+            self.load_model_and_normalizer()
+
+    @property
+    def model(self):
+        if self._model is None:
+            self.load_model_and_normalizer()
+        return self._model
+
+    @property
+    def norm_env(self):
+        if self._norm_env is None:
+            self.load_model_and_normalizer()
+        return self._norm_env
+
+    def get_model_cls(self):
+        from sb3_contrib import MaskablePPO
+        from stable_baselines3 import PPO
+        from src.ai.environments import EnvManager
+
+        return MaskablePPO if getattr(EnvManager(self.env_type).get_env_class(), 'REQUIRES_ACTION_MASKING', False) else PPO
+
+    def load_model_and_normalizer(self) -> None:
+        self._model, self._norm_env = self.load_model(self.get_model_cls(), self.model_path, self.norm_stats_path)
+
+    @staticmethod
+    def load_model(model_cls, model_path: str, norm_stats_path: str) -> tuple:
+        """
+        Loads the model and its normalizer, or returns the already loaded ones if this model was loaded before.
+
+        We don't build a game environment for the normalizer, as it only needs the observation and action space,
+        which are saved with the normalization statistics. Same goes for the model, it doesn't need an env to predict.
+
+        :return: (PPO or MaskablePPO model, VecNormalize)
+        """
+        if model_path in loaded_models:
+            return loaded_models[model_path]
+
+        from stable_baselines3.common.vec_env import VecNormalize
+        from ..vec_envs.spaces_only_vec_env import SpacesOnlyVecEnv
 
-        self.dummy_env = DummyVecEnv([lambda: EnvManager(env_type).get_env()])
-        self.norm_env = VecNormalize.load(norm_stats_path, self.dummy_env)
+        with open(norm_stats_path, 'rb') as f:
+            norm_env: VecNormalize = pickle.load(f)
+        norm_env.set_venv(SpacesOnlyVecEnv(norm_env.observation_space, norm_env.action_space))
+        norm_env.training = False
+        norm_env.norm_reward = False
 
-        self.model_cls = MaskablePPO if getattr(EnvManager(env_type).get_env_class(), 'REQUIRES_ACTION_MASKING', False) else PPO
-        self.model = self.model_cls.load(model_path, env=self.norm_env)
+        model = model_cls.load(model_path, device='cpu')
 
         if Config.handle_seed:
             set_random_seed(Config.seed)  # set random seed after loading the model, to override the model's seed
 
+        loaded_models[model_path] = (model, norm_env)
+        return model, norm_env
+
+    def load_numpy_policy(self) -> Optional[NumpyPolicy]:
+        """
+        Loads the NumPy copy of the model's actor, or converts the model if there's no copy yet or it's outdated
+        (the model or its normalization statistics changed). Converted policies are checked against the model and
+        saved next to it, so torch isn't needed at all the next time.
+
+        :return: the policy, None if the model can't be converted (predictions then go through Stable Baselines3)
+        """
+        if self.model_path in loaded_numpy_policies:
+            return loaded_numpy_policies[self.model_path]
+
+        source_hash = get_source_hash(f"{self.model_path}.zip", self.norm_stats_path)
+        numpy_policy = None
+        if os.path.exists(self.numpy_policy_path):
+            numpy_policy = NumpyPolicy.load(self.numpy_policy_path)
+            if numpy_policy.source_hash != source_hash:
+                numpy_policy = None
+
+        if numpy_policy is not None:
+            if Config.handle_seed:
+                set_random_seed(Config.seed)  # same as when loading the model, so the seed is set for Mode.PLAY
+        else:
+            numpy_policy = self.convert_model(source_hash)
+
+        loaded_numpy_policies[self.model_path] = numpy_policy
+        return numpy_policy
+
+    def convert_model(self, source_hash: str) -> Optional[NumpyPolicy]:
+        printc(f"[INFO] Converting '{os.path.basename(self.model_path)}' model to a NumPy policy...", color="blue")
+        self.load_model_and_normalizer()
+
+        try:
+            numpy_policy = NumpyPolicy.from_model(self._model, self._norm_env, source_hash)
+        except NotImplementedError as e:
+            printc(f"[WARN] Model can't be converted to a NumPy policy, not supported: {e} "
+                   f"Using Stable Baselines3 for predictions.", color="orange")
+            return None
+
+        mismatches = check_parity(numpy_policy, self._model, self._norm_env)
+        if mismatches > 0:
+            printc(f"[WARN] NumPy policy predicted different actions than the model for {mismatches} observations. "
+                   f"Using Stable Baselines3 for predictions.", color="orange")
+            return None
+
+        try:
+            numpy_policy.save(self.numpy_policy_path)
+        except OSError as e:
+            printc(f"[WARN] Couldn't save the NumPy policy: {e}", color="orange")
+        return numpy_policy
+
     def predict_action(self, observation, deterministic=True, use_action_masks=True, entity=None, env=None):
         """
         Predict the action for the given observation using the trained model.
         The observation is normalized before prediction, just like in the training phase.
+        Deterministic predictions go through the NumPy policy (if the model could be converted).
         """
+        if deterministic and self.numpy_policy is not None:
+            action_masks = np.ravel(self.get_action_masks(entity, env))[None] if use_action_masks else None
+            return self.numpy_policy.predict([observation], action_masks)[0]
+
         normalized_obs = self.norm_env.normalize_obs(observation)
 
         if use_action_masks:
@@ -43,6 +158,35 @@ class BaseModelController:
 
         return action
 
+    def predict_actions(self, observations: list, deterministic=True, use_action_masks=True, entities=None, env=None) -> list:
+        """
+        Predict actions for multiple entities controlled by this model at once.
+        Observations are stacked into a single batch, normalized together and passed through the model
+        in a single forward pass, which is a lot cheaper than calling predict_action() for each entity.
+
+        :param observations: observations of all entities (all Box arrays, or all Dicts with the same keys)
+        :param entities: entities the observations belong to (needed for action masks)
+        :return: list of actions, in the same order as the observations
+        """
+        if deterministic and self.numpy_policy is not None:
+            action_masks = np.stack([np.ravel(self.get_action_masks(entity, env)) for entity in entities]) \
+                if use_action_masks else None
+            return list(self.numpy_policy.predict(observations, action_masks))
+
+        if isinstance(observations[0], dict):
+            batched_obs = {key: np.stack([obs[key] for obs in observations]) for key in observations[0]}
+        else:
+            batched_obs = np.stack(observations)
+        normalized_obs = self.norm_env.normalize_obs(batched_obs)
+
+        if use_action_masks:
+            action_masks = np.stack([np.ravel(self.get_action_masks(entity, env)) for entity in entities])
+            actions, _states = self.model.predict(normalized_obs, deterministic=deterministic, action_masks=action_masks)
+        else:
+            actions, _states = self.model.predict(normalized_obs, deterministic=deterministic)
+
+        return list(actions)
+
     @staticmethod
     def perform_action(action, entity, env=None):
         """
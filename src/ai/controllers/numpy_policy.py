@@ -0,0 +1,280 @@
+import hashlib
+import os
+from typing import Optional
+
+import numpy as np
+
+MASKED_LOGIT = -1e8  # same value MaskableCategorical uses for the logits of masked out actions
+
+
+class NumpyPolicy:
+    """
+    NumPy copy of the actor of a trained PPO/MaskablePPO model (features extractor, policy net & action net), which
+    predicts deterministic actions (masked argmax) without torch. SB3's predict() converts the observation to tensors,
+    builds distribution objects and applies the masks through them, which costs way more than the forward pass itself
+    for our tiny networks and a handful of entities.
+
+    The VecNormalize statistics are folded into the first layer: clipping the normalized observation to [-clip, clip]
+    is the same as clipping the raw observation to [mean - clip * std, mean + clip * std], after which the
+    normalization is just an affine transformation, which can be merged with the first layer's weights & biases.
+    All the math is done in float64, so the results match torch's (float32) as closely as possible.
+
+    Only what our models use is supported: Box observations (or a Dict of them) that are flattened, Linear layers with
+    Tanh/ReLU/LeakyReLU activations and Discrete/MultiDiscrete actions.
+    Use from_model() to convert a model, and check_parity() to make sure it predicts the same actions as the model.
+    """
+    def __init__(self, weights: list[np.ndarray], biases: list[np.ndarray], activations: list[str],
+                 negative_slopes: list[float], clip_low: np.ndarray, clip_high: np.ndarray,
+                 obs_keys: Optional[list[str]], action_dims: list[int], multi_discrete: bool, source_hash: str = ""):
+        """
+        :param weights: weights of each layer, of shape (inputs, outputs), the first one with the normalization folded in
+        :param biases: biases of each layer
+        :param activations: activation after each layer ('identity', 'tanh', 'relu' or 'leaky_relu')
+        :param negative_slopes: negative slope of each layer's activation (only used by 'leaky_relu')
+        :param clip_low: lower bounds of the raw (flattened) observation
+        :param clip_high: upper bounds of the raw (flattened) observation
+        :param obs_keys: keys of the Dict observation in the order they're flattened in, None for Box observations
+        :param action_dims: number of actions of each sub-action (a single one for Discrete)
+        :param multi_discrete: whether the action space is MultiDiscrete (actions are arrays) or Discrete (integers)
+        :param source_hash: hash of the files the policy was converted from, see get_source_hash()
+        """
+        self.weights = weights
+        self.biases = biases
+        self.activations = activations
+        self.negative_slopes = negative_slopes
+        self.layers = list(zip(weights, biases, activations, negative_slopes))
+        self.clip_low = clip_low
+        self.clip_high = clip_high
+        self.obs_keys = obs_keys
+        self.action_dims = action_dims
+        self.action_splits = np.cumsum(action_dims)[:-1].tolist()
+        self.multi_discrete = multi_discrete
+        self.source_hash = source_hash
+
+    @classmethod
+    def from_model(cls, model, norm_env=None, source_hash: str = "") -> 'NumpyPolicy':
+        """
+        Converts the model's actor (and the normalizer's statistics) to a NumpyPolicy.
+        :param model: PPO or MaskablePPO model
+        :param norm_env: VecNormalize the model was trained with, None if the observations aren't normalized
+        :raises NotImplementedError: if the model uses something that isn't supported (see class docstring)
+        """
+        # torch is only needed to convert the model, not to use the converted policy
+        from gymnasium import spaces
+        from stable_baselines3.common.torch_layers import CombinedExtractor, FlattenExtractor
+        from stable_baselines3.common.vec_env import VecNormalize
+        from torch import nn
+
+        policy = model.policy
+        observation_space = policy.observation_space
+        extractor = policy.pi_features_extractor
+
+        if isinstance(observation_space, spaces.Dict):
+            if not isinstance(extractor, CombinedExtractor) or \
+                    not all(isinstance(module, nn.Flatten) for module in extractor.extractors.values()):
+                raise NotImplementedError(f"Features extractor {type(extractor).__name__} with non-flatten extractors.")
+            obs_keys = list(extractor.extractors.keys())  # CombinedExtractor concatenates them in this order
+            obs_spaces = [observation_space[key] for key in obs_keys]
+        elif isinstance(extractor, FlattenExtractor):
+            obs_keys = None
+            obs_spaces = [observation_space]
+        else:
+            raise NotImplementedError(f"Features extractor {type(extractor).__name__}.")
+
+        if norm_env is not None and not isinstance(norm_env, VecNormalize):
+            raise NotImplementedError(f"Normalizer {type(norm_env).__name__}.")
+
+        # normalization statistics of each (flattened) observation value; the values that aren't normalized are
+        # left as they are (mean 0, std 1) and aren't clipped
+        means, stds, clip_low, clip_high = [], [], [], []
+        for key, space in zip(obs_keys or [None], obs_spaces):
+            if not isinstance(space, spaces.Box):
+                # SB3 would one-hot encode Discrete/MultiDiscrete observations
+                raise NotImplementedError(f"Observation space {type(space).__name__} ('{key}').")
+            size = int(np.prod(space.shape))
+
+            if norm_env is not None and norm_env.norm_obs and (key is None or key in norm_env.norm_obs_keys):
+                obs_rms = norm_env.obs_rms if key is None else norm_env.obs_rms[key]
+                mean = np.broadcast_to(np.asarray(obs_rms.mean, dtype=np.float64), space.shape).reshape(-1)
+                std = np.broadcast_to(np.sqrt(np.asarray(obs_rms.var, dtype=np.float64) + norm_env.epsilon),
+                                      space.shape).reshape(-1)
+                means.append(mean)
+                stds.append(std)
+                clip_low.append(mean - norm_env.clip_obs * std)
+                clip_high.append(mean + norm_env.clip_obs * std)
+            else:
+                means.append(np.zeros(size))
+                stds.append(np.ones(size))
+                clip_low.append(np.full(size, -np.inf))
+                clip_high.append(np.full(size, np.inf))
+
+        # layers of the policy net + the action net (logits)
+        weights, biases, activations, negative_slopes = [], [], [], []
+        for module in list(policy.mlp_extractor.policy_net) + [policy.action_net]:
+            if isinstance(module, nn.Linear):
+                weights.append(module.weight.detach().cpu().numpy().astype(np.float64).T)
+                biases.append(module.bias.detach().cpu().numpy().astype(np.float64))
+                activations.append('identity')
+                negative_slopes.append(0.0)
+                continue
+
+            if not weights or activations[-1] != 'identity':
+                raise NotImplementedError(f"{type(module).__name__} that doesn't directly follow a Linear layer.")
+            if isinstance(module, nn.Tanh):
+                activations[-1] = 'tanh'
+            elif isinstance(module, nn.ReLU):
+                activations[-1] = 'relu'
+            elif isinstance(module, nn.LeakyReLU) and 0.0 <= module.negative_slope <= 1.0:
+                activations[-1] = 'leaky_relu'
+                negative_slopes[-1] = float(module.negative_slope)
+            else:
+                raise NotImplementedError(f"Layer {type(module).__name__}.")
+
+        # fold the normalization into the first layer: W @ ((x - mean) / std) + b = (W / std) @ x + (b - W @ (mean / std))
+        mean, std = np.concatenate(means), np.concatenate(stds)
+        weights[0] = weights[0] / std[:, None]
+        biases[0] = biases[0] - mean @ weights[0]
+
+        action_space = policy.action_space
+        if isinstance(action_space, spaces.Discrete):
+            action_dims, multi_discrete = [int(action_space.n)], False
+        elif isinstance(action_space, spaces.MultiDiscrete):
+            action_dims, multi_discrete = [int(n) for n in action_space.nvec], True
+        else:
+            raise NotImplementedError(f"Action space {type(action_space).__name__}.")
+
+        return cls([np.ascontiguousarray(weight) for weight in weights], biases, activations, negative_slopes,
+                   np.concatenate(clip_low), np.concatenate(clip_high), obs_keys, action_dims, multi_discrete,
+                   source_hash)
+
+    def save(self, path: str) -> None:
+        """
+        Writes the policy to a temporary file in the same directory first and then moves it into place, because several
+        workers can convert the same model at once - another process must never load a half-written file.
+        """
+        arrays = {f"weight_{index}": weight for index, weight in enumerate(self.weights)}
+        arrays.update({f"bias_{index}": bias for index, bias in enumerate(self.biases)})
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as file:  # pass a file, np.savez() would append .npz to the path
+                np.savez(file, **arrays,
+                         activations=np.array(self.activations), negative_slopes=np.array(self.negative_slopes),
+                         clip_low=self.clip_low, clip_high=self.clip_high,
+                         obs_keys=np.array(self.obs_keys if self.obs_keys is not None else [], dtype=str),
+                         is_dict=np.array(self.obs_keys is not None), action_dims=np.array(self.action_dims),
+                         multi_discrete=np.array(self.multi_discrete), source_hash=np.array(self.source_hash))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyPolicy':
+        with np.load(path, allow_pickle=False) as data:
+            num_layers = len(data['activations'])
+            return cls(
+                weights=[data[f"weight_{index}"] for index in range(num_layers)],
+                biases=[data[f"bias_{index}"] for index in range(num_layers)],
+                activations=data['activations'].tolist(),
+                negative_slopes=data['negative_slopes'].tolist(),
+                clip_low=data['clip_low'],
+                clip_high=data['clip_high'],
+                obs_keys=data['obs_keys'].tolist() if data['is_dict'] else None,
+                action_dims=data['action_dims'].tolist(),
+                multi_discrete=bool(data['multi_discrete']),
+                source_hash=str(data['source_hash']),
+            )
+
+    def flatten_observation(self, observation) -> np.ndarray:
+        """ Flattens the observation the same way the model's features extractor does. """
+        if self.obs_keys is None:
+            return np.ravel(observation)
+        return np.concatenate([np.ravel(observation[key]) for key in self.obs_keys])
+
+    def predict(self, observations: list, action_masks: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Predicts deterministic actions for a batch of raw (not normalized) observations.
+
+        :param observations: observations (Box arrays or Dicts), one for each entity
+        :param action_masks: action masks of shape (len(observations), sum(action_dims)), None to not use masks
+        :return: actions of shape (len(observations), len(action_dims)) for MultiDiscrete, (len(observations),) for Discrete
+        """
+        x = np.array([self.flatten_observation(observation) for observation in observations], dtype=np.float64)
+        np.clip(x, self.clip_low, self.clip_high, out=x)
+
+        for weight, bias, activation, negative_slope in self.layers:
+            x = x @ weight
+            x += bias
+            if activation == 'tanh':
+                np.tanh(x, out=x)
+            elif activation == 'relu':
+                np.maximum(x, 0.0, out=x)
+            elif activation == 'leaky_relu':
+                np.maximum(x, x * negative_slope, out=x)  # negative slope is between 0 and 1
+
+        if action_masks is not None:
+            x = np.where(np.reshape(action_masks, x.shape).astype(bool), x, MASKED_LOGIT)
+
+        if not self.multi_discrete:
+            return x.argmax(axis=1)
+        return np.stack([logits.argmax(axis=1) for logits in np.split(x, self.action_splits, axis=1)], axis=1)
+
+
+def get_source_hash(*paths: str) -> str:
+    """ Hash of the model (and normalizer) files, so a converted policy can tell whether it's outdated. """
+    sha256 = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            sha256.update(f.read())
+    return sha256.hexdigest()
+
+
+def check_parity(numpy_policy: NumpyPolicy, model, norm_env=None, num_samples: int = 2_000, seed: int = 0) -> int:
+    """
+    Compares the NumpyPolicy's actions with the model's deterministic actions on random observations and action masks.
+    Half of the observations are sampled from the observation space, the other half around the normalization mean
+    (the clipping mostly kicks in for the first half, so both ways through the normalization are covered).
+    Uses its own random generator, so the global random state isn't affected.
+
+    :return: number of observations for which the actions differ
+    """
+    from gymnasium import spaces
+    from sb3_contrib.common.maskable.policies import MaskableActorCriticPolicy
+
+    rng = np.random.default_rng(seed)
+    observation_space = model.observation_space
+    obs_spaces = observation_space.spaces if isinstance(observation_space, spaces.Dict) else {None: observation_space}
+
+    batch = {}
+    for key, space in obs_spaces.items():
+        low = np.nan_to_num(space.low.astype(np.float64), neginf=-1e3)
+        high = np.nan_to_num(space.high.astype(np.float64), posinf=1e3)
+        values = rng.uniform(low, high, size=(num_samples, *space.shape))
+
+        obs_rms = None
+        if norm_env is not None and getattr(norm_env, 'norm_obs', False):
+            if key is None:
+                obs_rms = norm_env.obs_rms
+            elif key in (norm_env.norm_obs_keys or []):
+                obs_rms = norm_env.obs_rms[key]
+        if obs_rms is not None:
+            near_mean = obs_rms.mean + np.sqrt(obs_rms.var) * rng.normal(size=(num_samples, *space.shape))
+            values[num_samples // 2:] = near_mean[num_samples // 2:]
+        batch[key] = values.astype(space.dtype)
+
+    batched_obs = batch if isinstance(observation_space, spaces.Dict) else batch[None]
+    observations = [{key: values[index] for key, values in batch.items()} if isinstance(observation_space, spaces.Dict)
+                    else batch[None][index] for index in range(num_samples)]
+
+    normalized_obs = norm_env.normalize_obs(batched_obs) if norm_env is not None else batched_obs
+    if isinstance(model.policy, MaskableActorCriticPolicy):
+        action_masks = rng.random((num_samples, sum(numpy_policy.action_dims))) < 0.7
+        expected_actions, _ = model.predict(normalized_obs, deterministic=True, action_masks=action_masks)
+    else:
+        action_masks = None
+        expected_actions, _ = model.predict(normalized_obs, deterministic=True)
+
+    actions = numpy_policy.predict(observations, action_masks)
+    mismatches = np.asarray(actions).reshape(num_samples, -1) != np.asarray(expected_actions).reshape(num_samples, -1)
+    return int(mismatches.any(axis=1).sum())
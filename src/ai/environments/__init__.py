@@ -1,2 +1,10 @@
 from .env_types import EnvType
-from .env_manager import EnvManager
+
+
+def __getattr__(name):
+    # EnvManager is imported on first use, as the environments pull in gymnasium, Stable Baselines3 & torch, which take
+    # seconds to import and aren't needed just to play the game (EnvType is imported by the config & controllers)
+    if name == 'EnvManager':
+        from .env_manager import EnvManager
+        return EnvManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -19,8 +19,10 @@ class AdvancedFlappyEnv(BaseEnv):
 
     Key features:
     - nothing bruh
+    - Episodes can start mid-game, from states harvested from real games (Config.start_states).
     """
     REQUIRES_ACTION_MASKING = True
+    USES_START_STATES = True
 
     def __init__(self):
         super().__init__()
@@ -37,6 +39,10 @@ class AdvancedFlappyEnv(BaseEnv):
 
     def reset_env(self):
         super().reset_env()
+        self.restore_start_state()
+        self.fill_observation_manager()
+
+    def on_snapshot_restored(self) -> None:
         self.fill_observation_manager()
 
     def fill_observation_manager(self):
@@ -271,8 +277,7 @@ class AdvancedFlappyEnv(BaseEnv):
 
         self.game_tick()
 
-        pygame.display.update()
-        self.config.tick()
+        self.update_display()
 
         return (
             self.get_observation(),  # observation
@@ -17,7 +17,9 @@ class AdvancedFlappyStep1Env(AdvancedFlappyEnv):
     Key features:
     - Items are spawned more frequently and at more random Y positions, to prepare the agent for item drops from killed enemies.
     - The Totem of Undying is not used on death, as that might cause the agent to think it didn't make a fatal mistake.
+    - Always starts a new game (no start states), the pipes & enemies are set up by the environment itself.
     """
+    USES_START_STATES = False
 
     def __init__(self):
         super().__init__()
@@ -131,8 +133,7 @@ class AdvancedFlappyStep1Env(AdvancedFlappyEnv):
         self.inventory.tick()
         self.score.tick()
 
-        pygame.display.update()
-        self.config.tick()
+        self.update_display()
 
         return (
             self.get_observation(),  # observation
@@ -142,8 +142,7 @@ class AdvancedFlappyStep2Env(AdvancedFlappyStep1Env):
 
         self.game_tick()
 
-        pygame.display.update()
-        self.config.tick()
+        self.update_display()
 
         # We update logging variables in `calculate_reward()` method
         enemy_hit_rate_this_episode = self.enemy_hits_this_episode / max(1, self.shots_fired_this_episode)
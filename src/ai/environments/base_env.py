@@ -1,14 +1,22 @@
+import random
+
 import numpy as np
 
 from src.ai.training_config import TrainingConfig
+from src.config import Config
 from src.entities import PlayerMode
 from src.flappybird import FlappyBird
+from src.replays import get_class_path
+from src.replays.start_states import load_start_state_library
 from src.utils import GameState
 
 
 class BaseEnv(FlappyBird):
+    USES_START_STATES: bool = False  # whether episodes can start from a state sampled from Config.start_states['library']
+
     def __init__(self):
         super().__init__()
+        self.config.render = not Config.options['sim']  # entities only update their state in sim mode, nothing is drawn
         self.init_env()
 
     def init_env(self) -> None:
@@ -16,7 +24,7 @@ class BaseEnv(FlappyBird):
         Initialize the game environment.
         :return: nothing
         """
-        self.reset()
+        self.reset(create_menus=False)
         self.gsm.set_state(GameState.PLAY)
         self.player.set_mode(PlayerMode.NORMAL)
 
@@ -25,10 +33,41 @@ class BaseEnv(FlappyBird):
         Reset the game environment.
         :return: nothing
         """
-        self.reset()
+        self.reset(create_menus=False)
         self.gsm.set_state(GameState.PLAY)
         self.player.set_mode(PlayerMode.NORMAL)
 
+    def restore_start_state(self, *required_tags: str) -> bool:
+        """
+        With probability Config.start_states['probability'], replaces the freshly reset game with a mid-game state
+        sampled from the start state library (harvested from real games with Mode.HARVEST_STATES).
+        Only states from Mode.PLAY and from this environment class are sampled.
+
+        :param required_tags: only sample states that have all of these tags, see START_STATE_TAGS
+        :return: True if a start state was restored, False if the episode starts as a new game
+        """
+        if not self.USES_START_STATES or Config.start_states['library'] is None:
+            return False
+        if random.random() >= Config.start_states['probability']:
+            return False
+        library = load_start_state_library(Config.start_states['library'])
+        snapshot = library.sample(required_tags, source=get_class_path(type(self)))
+        if snapshot is None:
+            return False
+        self.restore_snapshot(snapshot, restore_random_state=False)  # same state, but it plays out differently every time
+        return True
+
+    def restore_snapshot(self, snapshot: bytes | memoryview, restore_random_state: bool = True) -> None:
+        super().restore_snapshot(snapshot, restore_random_state)
+        self.on_snapshot_restored()
+
+    def on_snapshot_restored(self) -> None:
+        """
+        Called after a snapshot was restored. Snapshots don't include the environment's own state, so environments that
+        hold references to entities (observations, controlled enemy...) must update them here.
+        """
+        pass
+
     @staticmethod
     def get_training_config() -> TrainingConfig:
         """
@@ -36,6 +75,14 @@ class BaseEnv(FlappyBird):
         """
         return TrainingConfig()
 
+    @staticmethod
+    def get_batch_vec_env_class():
+        """
+        Get the batched (NumPy) VecEnv class that simulates many games of this environment in a single process.
+        :return: VecEnv class, or None if the environment doesn't have one
+        """
+        return None
+
     @staticmethod
     def get_action_and_observation_space():
         """
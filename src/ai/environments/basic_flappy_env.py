@@ -87,6 +87,11 @@ class BasicFlappyEnv(BaseEnv):
 
         return training_config
 
+    @staticmethod
+    def get_batch_vec_env_class():
+        from ..vec_envs import BasicFlappyBatchVecEnv  # imported here to avoid circular import
+        return BasicFlappyBatchVecEnv
+
     @staticmethod
     def get_action_and_observation_space():
         # 0: do nothing, 1: flap the wings
@@ -139,8 +144,7 @@ class BasicFlappyEnv(BaseEnv):
         # (must uncomment the pygame.draw.circle and pygame.draw.line lines in calculate_reward)
         # self.calculate_reward(action=action, passed_pipe=passed_pipe)
 
-        pygame.display.update()
-        self.config.tick()
+        self.update_display()
 
         return (self.get_observation(),
                 self.calculate_reward(action=action, passed_pipe=passed_pipe),
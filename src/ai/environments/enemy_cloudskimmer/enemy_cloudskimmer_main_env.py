@@ -30,8 +30,10 @@ class EnemyCloudSkimmerEnv(BaseEnv):
     Key features:
     - Randomly select one of the enemies to control.
     - Once that enemy dies, terminate the episode and select another one randomly.
+    - Episodes can start from harvested states with a full CloudSkimmer group (Config.start_states).
     """
     REQUIRES_ACTION_MASKING = True
+    USES_START_STATES = True
 
     def __init__(self):
         super().__init__()
@@ -56,11 +58,21 @@ class EnemyCloudSkimmerEnv(BaseEnv):
     def reset_env(self):
         super().reset_env()
         self.step = 0
-        self.pipes.spawn_initial_pipes_like_its_midgame()
-        self.spawn_enemies()
+        if not self.restore_start_state('cloudskimmers'):
+            self.pipes.spawn_initial_pipes_like_its_midgame()
+            self.spawn_enemies()
         self.pick_random_enemy()
         self.fill_observation_manager()
 
+    def on_snapshot_restored(self) -> None:
+        # the controlled enemy (if it's still alive) is a new object now, same goes for the bullets
+        members = self.enemy_manager.spawned_enemy_groups[0].members if self.enemy_manager.spawned_enemy_groups else []
+        self.controlled_enemy = next((enemy for enemy in members if enemy.id == self.controlled_enemy_id), None)
+        self.all_bullets_from_last_frame = set(self.controlled_enemy.gun.shot_bullets) if self.controlled_enemy else set()
+        self.bullets_bounced_off_pipes = WeakSet()
+        if self.controlled_enemy is not None:
+            self.fill_observation_manager()
+
     def spawn_enemies(self):
         self.enemy_manager.spawned_enemy_groups = []
         self.enemy_manager.spawn_cloudskimmer()
@@ -301,8 +313,7 @@ class EnemyCloudSkimmerEnv(BaseEnv):
         self.player.tick()
         self.enemy_manager.tick()
 
-        pygame.display.update()
-        self.config.tick()
+        self.update_display()
 
         return (
             self.get_observation(),  # observation
@@ -88,14 +88,14 @@ class EnemyCloudSkimmerStep1Env(EnemyCloudSkimmerEnv):
 
         EnemyCloudSkimmerModelController.perform_action(action, self.controlled_enemy)
 
-        self.background.draw()
+        if self.config.render:
+            self.background.draw()
         self.pipes.tick()
         self.floor.tick()
         self.player.tick()
         self.enemy_manager.tick()
 
-        pygame.display.update()
-        self.config.tick()
+        self.update_display()
 
         return (
             self.get_observation(),  # observation
@@ -103,14 +103,14 @@ class EnemyCloudSkimmerStep3Env(EnemyCloudSkimmerStep2Env):
         if self.remaining_mode_duration <= 0:
             self.switch_flappy_mode()
 
-        self.background.draw()
+        if self.config.render:
+            self.background.draw()
         self.pipes.tick()
         self.floor.tick()
         self.player.tick()
         self.enemy_manager.tick()
 
-        pygame.display.update()
-        self.config.tick()
+        self.update_display()
 
         for bullet in self.all_bullets_from_last_frame.union(self.controlled_enemy.gun.shot_bullets):
             if bullet.hit_entity == 'player':
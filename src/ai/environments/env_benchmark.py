@@ -0,0 +1,202 @@
+"""
+Env-step throughput benchmark (Mode.BENCHMARK_ENV).
+
+Every benchmark run (env type & variant, options, number of workers) is done in fresh processes, so options that are
+only read at startup (headless, mute, sim) can be changed between runs, and the peak memory usage isn't skewed by
+the previous runs. Each worker steps its own environment with random (masked) actions, just like test_env() does.
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Optional
+
+from src.utils import printc, get_git_commit
+from .env_types import EnvType, EnvVariant
+
+PHASES = ('perform_step', 'get_observation', 'get_action_masks', 'clip_observation')
+
+
+def get_env_combinations(env_types: Optional[list[EnvType]] = None) -> list[tuple[EnvType, EnvVariant]]:
+    """ Returns all (env type, env variant) combinations that EnvManager supports. """
+    from .env_manager import EnvManager
+
+    combinations = []
+    for env_type in env_types or list(EnvType):
+        for env_variant in EnvVariant:
+            try:
+                EnvManager(env_type, env_variant)
+            except ValueError:
+                continue  # variant not supported by this env type
+            combinations.append((env_type, env_variant))
+    return combinations
+
+
+def run_env_benchmark(num_steps: int = 5_000, num_resets: int = 50, worker_counts: tuple[int, ...] = (1,),
+                      option_sets: tuple[dict, ...] = ({'headless': True, 'mute': True, 'sim': True},),
+                      env_types: Optional[list[EnvType]] = None, seed: int = 42,
+                      directory: str = "data/benchmarks") -> dict:
+    """
+    Benchmarks every env type & variant combination, with every option set and worker count,
+    and saves the results to a JSON file (named after the current time and git commit), so commits can be compared.
+
+    :param num_steps: number of steps each worker takes
+    :param num_resets: number of resets each worker times (after stepping)
+    :param worker_counts: number of environments stepped in parallel (one process each)
+    :param option_sets: Config.options overrides to benchmark with (e.g. headless, mute, sim)
+    :param env_types: env types to benchmark, None for all of them
+    :param seed: base seed, each worker uses seed + worker index
+    :param directory: directory to save the results to
+    :return: the results
+    """
+    commit = get_git_commit()
+    results = {
+        'created': datetime.now().isoformat(),
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'num_steps': num_steps,
+        'num_resets': num_resets,
+        'runs': [],
+    }
+
+    for env_type, env_variant in get_env_combinations(env_types):
+        for options in option_sets:
+            for num_workers in worker_counts:
+                printc(f"[INFO] Benchmarking {env_type.name} {env_variant.name} with {options} "
+                       f"and {num_workers} worker(s)...", color="blue")
+                run = {'env_type': env_type.name, 'env_variant': env_variant.name, 'options': options,
+                       'num_workers': num_workers}
+                try:
+                    run.update(_run_workers(env_type, env_variant, options, num_workers, num_steps, num_resets, seed))
+                    _print_run(run)
+                except Exception as e:
+                    run['error'] = f"{type(e).__name__}: {e}"
+                    printc(f"[WARN] Benchmark failed: {run['error']}", color="yellow")
+                results['runs'].append(run)
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    path = Path(directory) / f"env_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'unknown'}.json"
+    with open(path, "w") as file:
+        json.dump(results, file, indent=4)
+    printc(f"[INFO] Benchmark results saved to {path}", color="blue")
+    return results
+
+
+def _run_workers(env_type: EnvType, env_variant: EnvVariant, options: dict, num_workers: int,
+                 num_steps: int, num_resets: int, seed: int) -> dict:
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=get_context('spawn')) as executor:
+        futures = [executor.submit(benchmark_worker, env_type.name, env_variant.name, options, num_steps, num_resets,
+                                   seed + worker_index)
+                   for worker_index in range(num_workers)]
+        workers = [future.result() for future in futures]
+
+    return {
+        # workers run in parallel, so their throughputs add up
+        'steps_per_sec': sum(worker['steps_per_sec'] for worker in workers),
+        'steps_per_sec_per_worker': sum(worker['steps_per_sec'] for worker in workers) / num_workers,
+        'reset_latency_ms': sum(worker['reset_latency_ms'] for worker in workers) / num_workers,
+        'peak_rss_mb': max((worker['peak_rss_mb'] for worker in workers if worker['peak_rss_mb'] is not None),
+                           default=None),
+        'phases_us_per_step': {
+            phase: sum(worker['phases_us_per_step'][phase] for worker in workers) / num_workers for phase in PHASES
+        },
+        'workers': workers,
+    }
+
+
+def benchmark_worker(env_type_name: str, env_variant_name: str, options: dict, num_steps: int, num_resets: int,
+                     seed: int) -> dict:
+    """
+    Benchmarks a single environment in this (fresh) process.
+    Must be a module-level function, so it can be pickled for the worker processes.
+    """
+    if options.get('headless') or options.get('sim'):
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+    if options.get('mute'):
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    from src.config import Config
+    Config.options.update(options)
+    Config.fps_cap = 0
+    Config.save_results = False
+
+    from .env_manager import EnvManager
+
+    env_manager = EnvManager(EnvType[env_type_name], EnvVariant[env_variant_name])
+    env = env_manager.get_env()
+    game_env = env.game_env
+
+    # time each phase by wrapping the methods of these instances (perform_step's time includes get_observation's)
+    phase_times = {phase: 0.0 for phase in PHASES}
+    _wrap_timed(game_env, 'perform_step', phase_times)
+    _wrap_timed(game_env, 'get_observation', phase_times)
+    _wrap_timed(game_env, 'get_action_masks', phase_times)
+    _wrap_timed(env, 'clip_observation', phase_times)
+
+    env.reset(seed=seed)
+    env.action_space.seed(seed)
+    use_action_masking: bool = getattr(env_manager.get_env_class(), 'REQUIRES_ACTION_MASKING', False)
+    for phase in PHASES:
+        phase_times[phase] = 0.0
+
+    start_time = time.perf_counter()
+    for _ in range(num_steps):
+        if use_action_masking:
+            action_masks = EnvManager.format_action_mask(env.action_masks(), env.action_space)
+            action = env.action_space.sample(action_masks)
+        else:
+            action = env.action_space.sample()
+        observation, reward, terminated, truncated, info = env.step(action)
+
+        if terminated or truncated:
+            env.reset()
+    duration = time.perf_counter() - start_time
+
+    reset_start_time = time.perf_counter()
+    for _ in range(num_resets):
+        env.reset()
+    reset_duration = time.perf_counter() - reset_start_time
+
+    return {
+        'steps_per_sec': num_steps / duration,
+        'reset_latency_ms': reset_duration / max(num_resets, 1) * 1000,
+        'peak_rss_mb': _get_peak_rss_mb(),
+        # get_observation is also called by reset(), which isn't a step, but it's cheap compared to the steps
+        'phases_us_per_step': {phase: phase_times[phase] / num_steps * 1e6 for phase in PHASES},
+    }
+
+
+def _wrap_timed(instance, method_name: str, phase_times: dict) -> None:
+    method = getattr(instance, method_name)
+
+    def timed(*args, **kwargs):
+        start_time = time.perf_counter()
+        result = method(*args, **kwargs)
+        phase_times[method_name] += time.perf_counter() - start_time
+        return result
+
+    setattr(instance, method_name, timed)
+
+
+def _get_peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None  # not available on Windows
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak_rss / (1024 * 1024) if sys.platform == 'darwin' else peak_rss / 1024
+
+
+def _print_run(run: dict) -> None:
+    phases = ", ".join(f"{phase} {time_us:.0f}us" for phase, time_us in run['phases_us_per_step'].items())
+    peak_rss = f"{run['peak_rss_mb']:.0f} MB" if run['peak_rss_mb'] is not None else "n/a"
+    printc(f"  {run['steps_per_sec']:.0f} steps/s ({run['steps_per_sec_per_worker']:.0f} per worker), "
+           f"reset {run['reset_latency_ms']:.2f} ms, peak RSS {peak_rss}", color="green")
+    printc(f"  per step: {phases}", color="gray")
@@ -1,4 +1,5 @@
-from typing import Literal
+import time
+from typing import Callable, Literal
 
 import numpy as np
 from gymnasium import Env as GymnasiumEnv, spaces
@@ -23,11 +24,28 @@ class GymEnv(GymnasiumEnv):
 
         self.observation_space_clip_modes = self.game_env.get_observation_space_clip_modes()
         self.is_observation_space_of_type_box = isinstance(self.observation_space, spaces.Box)
+        self.clip_plan = self._compile_clip_plan()
 
         self._first_reset_done = False  # flag to check if the first reset has been done
+        self.last_reset_latency_ms = 0.0  # how long the last game_env.reset_env() took, reported at the episode end
 
     def step(self, action):
+        replay_recorder = self.game_env.replay_recorder
+        if replay_recorder is not None:
+            replay_recorder.record_agent_action(action)
+
+        self.game_env.frame_profiler.begin_frame()
         observation, reward, terminated, truncated, info = self.game_env.perform_step(action)
+        self.game_env.frame_profiler.end_frame()
+
+        if replay_recorder is not None:
+            replay_recorder.next_frame()
+            if terminated or truncated:
+                replay_recorder.end_episode(self.game_env)
+
+        if terminated or truncated:
+            # logged as rollout_extra/ep_reset_latency_ms_mean by LogAllInfoCallback
+            info['reset_latency_ms'] = self.last_reset_latency_ms
 
         observation = self.clip_observation(observation)
 
@@ -39,11 +57,11 @@ class GymEnv(GymnasiumEnv):
 
         # If seed should be handled by us, use the Config seed.
         if Config.handle_seed:
-            set_random_seed(Config.seed)
+            seed = set_random_seed(Config.seed)
         # Otherwise, use the provided seed.
         elif seed is not None:
             # Set seed, so each environment instance can have its own seed.
-            set_random_seed(seed)
+            seed = set_random_seed(seed)
         # If no seed is provided (unlikely(?)), print a warning.
         else:
             # Seed is usually provided by Stable Baselines3, the first time reset() is called, but then not again.
@@ -51,9 +69,19 @@ class GymEnv(GymnasiumEnv):
             if not self._first_reset_done:
                 printc("[WARN] No seed provided; no global random seed will be set here.", color='orange')
 
+        replay_recorder = self.game_env.replay_recorder
+        if replay_recorder is not None:
+            replay_recorder.set_seed(seed)
+            replay_recorder.start_episode(self.game_env, env_class=type(self.game_env))
+
+        reset_start_time = time.perf_counter()
         self.game_env.reset_env()
+        self.last_reset_latency_ms = (time.perf_counter() - reset_start_time) * 1000
         self._first_reset_done = True
 
+        if replay_recorder is not None:
+            replay_recorder.start_play(self.game_env)
+
         observation = self.clip_observation(self.game_env.get_observation())
         info = {}
 
@@ -85,52 +113,101 @@ class GymEnv(GymnasiumEnv):
         0: print a warning if the observation is out of bounds, but do not raise an error
         1: clip the observation to the valid range of the observation space
 
+        With `Config.options['trusted_observations']`, modes -1 and 0 are skipped (only clipping is done).
+
         :param observation: the observation to process
         :return: the processed observation
         """
-
         # if self.observation_space is of type Box
         if self.is_observation_space_of_type_box:
-            mode = self.observation_space_clip_modes['box']
-            if mode == 1:
-                self.observation_space: spaces.Box
-                observation = np.clip(observation, self.observation_space.low, self.observation_space.high)
-            elif mode == -1 or mode == 0:
-                if not self.observation_space.contains(observation):
-                    if mode == 0:
-                        printc(f"[WARN] Observation {observation} is out of bounds.", color='yellow')
-                    else:
-                        raise ValueError(f"Observation {observation} is out of bounds.")
+            for _, mode, operation in self.clip_plan:
+                if mode == 1:
+                    observation = operation(observation)
+                elif not operation(observation):
+                    self._handle_out_of_bounds_observation(None, mode, observation)
             return observation
 
         # if self.observation_space is of type Dict
-        for key, obs in observation.items():
-            self.observation_space: spaces.Dict
-            space = self.observation_space[key]
-            mode: Literal[-1, 0, 1] = self.observation_space_clip_modes[key]
+        for key, mode, operation in self.clip_plan:
             if mode == 1:
-                if isinstance(space, spaces.Box):
-                    observation[key] = np.clip(obs, space.low, space.high)
-                elif isinstance(space, spaces.Discrete):
-                    # Discrete space may be np.ndarray for compatibility with VecFrameStack, which requires Box space
-                    if isinstance(obs, np.ndarray):
-                        obs = int(obs.item())  # turn [2.] -> 2
-                    observation[key] = np.clip(obs, space.start, space.n - 1)
-                elif isinstance(space, spaces.MultiDiscrete):  # TODO ########## not tested if correct yet ##########
-                    observation[key] = np.clip(obs, space.start, space.nvec - 1)
-                elif isinstance(space, spaces.MultiBinary):
-                    observation[key] = np.clip(obs, 0, 1)
-                else:
-                    raise NotImplementedError(f"Observation space of type '{type(space)}' not implemented yet.")
-            elif mode == -1 or mode == 0:
-                # Discrete space may be np.ndarray for compatibility with VecFrameStack, which requires Box space
-                if isinstance(space, spaces.Discrete) and isinstance(obs, np.ndarray):
-                    obs = int(obs.item())
+                observation[key] = operation(observation[key])
+            elif not operation(observation[key]):
+                self._handle_out_of_bounds_observation(key, mode, observation[key])
+        return observation
 
-                if not space.contains(obs):
-                    if mode == 0:
-                        printc(f"[WARN] Invalid '{type(space).__name__}' observation for key '{key}': {obs}", color='yellow')
-                    else:
-                        raise ValueError(f"Invalid '{type(space).__name__}' observation for key '{key}': {obs}")
+    def _handle_out_of_bounds_observation(self, key: str | None, mode: Literal[-1, 0], obs) -> None:
+        if key is None:
+            message = f"Observation {obs} is out of bounds."
+        else:
+            if isinstance(obs, np.ndarray) and isinstance(self.observation_space[key], spaces.Discrete):
+                obs = int(obs.item())
+            message = f"Invalid '{type(self.observation_space[key]).__name__}' observation for key '{key}': {obs}"
 
-        return observation
+        if mode == 0:
+            printc(f"[WARN] {message}", color='yellow')
+        else:
+            raise ValueError(message)
+
+    def _compile_clip_plan(self) -> list[tuple[str | None, int, Callable]]:
+        """
+        Prepares what clip_observation() does for each part of the observation space, so it doesn't have to look up
+        the clip modes, check the types of the spaces and convert their bounds on every step.
+
+        :return: list of (key, mode, operation) - key is None for a Box observation space;
+                 the operation returns the clipped observation (mode 1) or whether the observation is in bounds
+        """
+        if self.is_observation_space_of_type_box:
+            parts = [(None, self.observation_space, self.observation_space_clip_modes['box'])]
+        else:
+            parts = [(key, self.observation_space[key], self.observation_space_clip_modes[key])
+                     for key in self.observation_space.keys()]
+
+        trusted = Config.options.get('trusted_observations', False)
+        clip_plan = []
+        for key, space, mode in parts:
+            if mode == 1:
+                clip_plan.append((key, mode, self._get_clip_operation(space)))
+            elif (mode == -1 or mode == 0) and not trusted:
+                clip_plan.append((key, mode, self._get_check_operation(space)))
+        return clip_plan
+
+    @staticmethod
+    def _get_clip_operation(space: spaces.Space) -> Callable:
+        if isinstance(space, spaces.Box):
+            low, high = space.low, space.high
+            return lambda obs: np.minimum(np.maximum(obs, low), high)
+        elif isinstance(space, spaces.Discrete):
+            low, high = int(space.start), int(space.start + space.n - 1)
+
+            def clip_discrete(obs):
+                # Discrete space may be np.ndarray for compatibility with VecFrameStack, which requires Box space
+                if isinstance(obs, np.ndarray):
+                    obs = int(obs.item())  # turn [2.] -> 2
+                return np.clip(obs, low, high)
+            return clip_discrete
+        elif isinstance(space, spaces.MultiDiscrete):
+            low, high = space.start, space.start + space.nvec - 1
+            return lambda obs: np.minimum(np.maximum(obs, low), high)
+        elif isinstance(space, spaces.MultiBinary):
+            return lambda obs: np.minimum(np.maximum(obs, 0), 1)
+        raise NotImplementedError(f"Observation space of type '{type(space)}' not implemented yet.")
+
+    @staticmethod
+    def _get_check_operation(space: spaces.Space) -> Callable:
+        if isinstance(space, spaces.Box):
+            low, high, shape, dtype = space.low, space.high, space.shape, space.dtype
+
+            def check_box(obs) -> bool:
+                # same as Box.contains(), but without revalidating the space itself on every call
+                if type(obs) is not np.ndarray or obs.dtype != dtype:
+                    return space.contains(obs)
+                return obs.shape == shape and bool((obs >= low).all()) and bool((obs <= high).all())
+            return check_box
+        elif isinstance(space, spaces.Discrete):
+            def check_discrete(obs) -> bool:
+                # Discrete space may be np.ndarray for compatibility with VecFrameStack, which requires Box space
+                if isinstance(obs, np.ndarray):
+                    obs = int(obs.item())
+                return space.contains(obs)
+            return check_discrete
+        return space.contains
@@ -1,5 +1,7 @@
 import json
+import multiprocessing
 import os
+import sys
 import time
 from typing import Type, Union
 
@@ -13,14 +15,15 @@ from stable_baselines3.common.callbacks import BaseCallback, CallbackList
 from stable_baselines3.common.callbacks import CheckpointCallback
 from stable_baselines3.common.env_util import make_vec_env
 from stable_baselines3.common.evaluation import evaluate_policy as normal_evaluate_policy
-from stable_baselines3.common.vec_env import VecEnv, SubprocVecEnv, VecEnvWrapper, VecFrameStack
+from stable_baselines3.common.vec_env import VecEnv, VecEnvWrapper, VecFrameStack, VecMonitor
 
 from src.config import Config
-from src.utils import printc, set_random_seed
+from src.utils import printc, set_random_seed, preload_images
 from .environments import EnvManager, EnvType
 from .environments.base_env import BaseEnv
 from .environments.env_types import EnvVariant
 from .training_config import TrainingConfig
+from .vec_envs import SharedMemoryVecEnv
 
 
 class ModelPPO:
@@ -37,6 +40,7 @@ class ModelPPO:
 
         self.seed: int = Config.seed  # seed for the training (applied globally(?), so it affects the model and all environments)
         self.num_cores: int = Config.num_cores  # number of cores to use during training
+        self.num_batch_envs: int = Config.num_batch_envs  # number of games in a single batched env (0 = don't use it)
 
         # Prepare paths for various directories and files
         base_dir = os.path.join('ai-models', 'PPO', self.env_type.value)
@@ -184,11 +188,38 @@ class ModelPPO:
             printc("[WARN] n_envs > 1 but use_subproc_vec_env is False. "
                    "Setting use_subproc_vec_env to True is recommended.", color="yellow")
 
+        # Simulate all games in a single process with NumPy arrays, if the environment supports it
+        batch_vec_env_class = self.env_class.get_batch_vec_env_class()
+        if use_subproc_vec_env and self.num_batch_envs > 0:
+            if batch_vec_env_class is not None:
+                printc(f"[INFO] Using {batch_vec_env_class.__name__} with {self.num_batch_envs} games.", color="blue")
+                venv = batch_vec_env_class(num_envs=self.num_batch_envs, seed=self.seed)
+                if monitor:
+                    os.makedirs(self.monitor_dir, exist_ok=True)
+                    venv = VecMonitor(venv, filename=os.path.join(self.monitor_dir, 'batch'))
+                return venv
+            printc(f"[WARN] num_batch_envs is set, but {self.env_class.__name__} doesn't have a batched env. "
+                   f"Using SharedMemoryVecEnv instead.", color="yellow")
+
+        vec_env_kwargs = None
+        if use_subproc_vec_env and Config.options['fork_workers']:
+            # Opt-in: forking after torch & SB3 are imported isn't officially supported (SB3 defaults to forkserver for that reason),
+            # but the workers then share the parent's modules instead of re-importing them (~300 MB less per AdvancedFlappy worker)
+            if 'fork' in multiprocessing.get_all_start_methods() and sys.platform != 'darwin':
+                # Decode all images once, here in the parent - the forked workers share the pixels, but still convert their own copies
+                num_images = preload_images()
+                printc(f"[INFO] Preloaded {num_images} images before forking the workers.", color="blue")
+                vec_env_kwargs = {'start_method': 'fork'}
+            else:
+                printc("[WARN] fork_workers is set, but fork isn't available (or safe) on this platform, using the default start method.", color="yellow")
+
         return make_vec_env(
             lambda: EnvManager(self.env_type, self.env_variant).get_env(),
             n_envs=n_envs,
             # seed=self.seed,  # just found out you can pass seed here, but I'm not gonna do it just yet, cuz my current seed logic "works"-ish and I don't wanna break it
-            vec_env_cls=SubprocVecEnv if use_subproc_vec_env else None,
+            # same as SubprocVecEnv, but observations & action masks are passed through shared memory
+            vec_env_cls=SharedMemoryVecEnv if use_subproc_vec_env else None,
+            vec_env_kwargs=vec_env_kwargs,
             monitor_dir=self.monitor_dir if monitor else None,
         )
 
@@ -55,8 +55,32 @@ class AdvancedFlappyObservation(BaseObservation):
         ItemName.BULLET_SMALL: 3,
     }
 
-    def __init__(self, entity: Player, env):
+    # Default (placeholder) info for empty slots
+    DEFAULT_WEAPON_INFO = [50, 0, 0, 0, 0, 0, 0]
+    DEFAULT_SPAWNED_ITEM_INFO = [0, 0, -100, -900]
+    DEFAULT_ENEMY_INFO = [0, 530, 300, 0, 0, 0, 0]
+    NUM_BULLETS = 7  # max number of bullets in the observation
+
+    def __init__(self, entity: Player, env, zero_copy: bool = False):
+        """
+        :param zero_copy: if True, get_observation() returns the internal observation buffers instead of copies of them.
+                          Only use it when the observation is consumed before the next get_observation() call
+                          (e.g. predicting actions in FlappyBird), NOT with SB3 vec envs, which keep the last
+                          observation of an episode around after resetting the env.
+        """
         super().__init__(entity, env)
+        self.zero_copy = zero_copy
+        # Preallocated observation buffers, filled in place on every get_observation() call
+        self.buffers = {
+            'player': np.zeros(6, dtype=np.float32),
+            'weapon': np.zeros(7, dtype=np.float32),
+            'inventory': np.zeros((3, 3), dtype=np.float32),
+            'spawned_items': np.zeros((3, 4), dtype=np.float32),
+            'pipes_simple': np.zeros(3, dtype=np.float32),
+            'pipes': np.zeros((3, 2, 2, 2), dtype=np.float32),
+            'enemies': np.zeros((3, 7), dtype=np.float32),
+            'bullets': np.zeros((self.NUM_BULLETS, 7), dtype=np.float32),
+        }
         # Spawned items
         self.spawned_item_index_dict = WeakKeyDictionary()  # map spawned items to their initial index in the list
         self.ignored_spawned_items = WeakSet()  # "older" spawned items that will no longer be included in the observation
@@ -77,22 +101,22 @@ class AdvancedFlappyObservation(BaseObservation):
 
         # OBS: player
         player: Player = e.player
-        player_info = [
+        self.buffers['player'][:] = (
             player.cy,  # y position
             player.vel_y,  # y velocity
             player.rotation,  # rotation
             player.hp_bar.current_value,  # hp
             player.shield_bar.current_value,  # shield
             player.food_bar.current_value  # food
-        ]
+        )
 
         # OBS: weapon
         gun: Gun = e.inventory.inventory_slots[0].item
         if gun.item_type is ItemType.EMPTY:
-            weapon_info = [50, 0, 0, 0, 0, 0, 0]
+            self.buffers['weapon'][:] = self.DEFAULT_WEAPON_INFO
         else:
             initial_bullet_pos_x, initial_bullet_pos_y = gun.calculate_initial_bullet_position()
-            weapon_info = [
+            self.buffers['weapon'][:] = (
                 initial_bullet_pos_x - self.player_cx,  # relative x bullet spawn position to player
                 initial_bullet_pos_y - self.player_cy,  # relative y bullet spawn position to player
                 gun.remaining_shoot_cooldown,  # shoot cooldown
@@ -100,23 +124,24 @@ class AdvancedFlappyObservation(BaseObservation):
                 self.ITEM_IDS[gun.item_name],  # gun id (1 = deagle, 2 = ak47, 3 = uzi)
                 gun.quantity,  # remaining magazine bullets
                 gun.damage  # bullet damage
-            ]
+            )
 
         # OBS: inventory
         inventory_slots: list[InventorySlot] = e.inventory.inventory_slots
         # 3 slots, each with: item id, quantity, value
-        inventory_info = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]  # shape (3, 3)
+        inventory_info = self.buffers['inventory']  # shape (3, 3)
+        inventory_info.fill(0)
         for i, slot in enumerate(inventory_slots[2:5]):  # only food, potion & heal inventory slots
             spawned_item: (Item | Food | Potion | Heal) = slot.item
             if spawned_item.item_type is not ItemType.EMPTY:
-                inventory_info[i] = [
+                inventory_info[i] = (
                     self.ITEM_IDS[spawned_item.item_name],  # item id
                     spawned_item.quantity,  # quantity
                     spawned_item.fill_amount  # value
-                ]
+                )
 
         # OBS: spawned items
-        spawned_items = self.get_spawned_item_info(e)
+        self.fill_spawned_item_info(e)
 
         # OBS: pipes_simple
         next_pipe_pair = next_next_pipe_pair = None
@@ -134,48 +159,39 @@ class AdvancedFlappyObservation(BaseObservation):
         vertical_distance_to_next_pipe_center = e.player.cy - next_pipe_vertical_center
         vertical_distance_to_next_next_pipe_center = e.player.cy - next_next_pipe_vertical_center
 
-        pipes_simple = [
+        self.buffers['pipes_simple'][:] = (
             horizontal_distance_to_next_pipe,
             vertical_distance_to_next_pipe_center,
             vertical_distance_to_next_next_pipe_center
-        ]
+        )
 
         # OBS: pipes
-        pipe_corner_positions = []
+        pipe_corner_positions = self.buffers['pipes']
         # Only include the first three pipe pairs in the observation - last pipe pair is always off-screen.
-        for up_pipe, low_pipe in islice(zip(self.env.pipes.upper, self.env.pipes.lower), 3):
-            top_pipe_corners = [
-                [up_pipe.x - self.player_cx, up_pipe.y + up_pipe.h - self.player_cy],  # left-bottom of top pipe
-                [up_pipe.x + up_pipe.w - self.player_cx, up_pipe.y + up_pipe.h - self.player_cy]  # right-bottom of top pipe
-            ]
-            bottom_pipe_corners = [
-                [low_pipe.x - self.player_cx, low_pipe.y - self.player_cy],  # left-top of bottom pipe
-                [low_pipe.x + low_pipe.w - self.player_cx, low_pipe.y - self.player_cy]  # right-top of bottom pipe
-            ]
-            pipe_corner_positions.append([top_pipe_corners, bottom_pipe_corners])
+        num_pipe_pairs = 0
+        for i, (up_pipe, low_pipe) in enumerate(islice(zip(self.env.pipes.upper, self.env.pipes.lower), 3)):
+            num_pipe_pairs = i + 1
+            # top pipe corners
+            pipe_corner_positions[i, 0, 0] = (up_pipe.x - self.player_cx, up_pipe.y + up_pipe.h - self.player_cy)  # left-bottom of top pipe
+            pipe_corner_positions[i, 0, 1] = (up_pipe.x + up_pipe.w - self.player_cx, up_pipe.y + up_pipe.h - self.player_cy)  # right-bottom of top pipe
+            # bottom pipe corners
+            pipe_corner_positions[i, 1, 0] = (low_pipe.x - self.player_cx, low_pipe.y - self.player_cy)  # left-top of bottom pipe
+            pipe_corner_positions[i, 1, 1] = (low_pipe.x + low_pipe.w - self.player_cx, low_pipe.y - self.player_cy)  # right-top of bottom pipe
+        pipe_corner_positions[num_pipe_pairs:] = 0  # don't leave the previous observation's pipes in the slots of missing pipe pairs
 
         # OBS: enemies
-        enemy_info = self.get_enemy_info(e)
+        self.fill_enemy_info(e)
 
         # OBS: bullets
-        bullet_info = self.get_bullet_info(e)
-
-        game_state = {
-            'player': np.array(player_info, dtype=np.float32),
-            'weapon': np.array(weapon_info, dtype=np.float32),
-            'inventory': np.array(inventory_info, dtype=np.float32),
-            'spawned_items': np.array(spawned_items, dtype=np.float32),
-            'pipes_simple': np.array(pipes_simple, dtype=np.float32),
-            'pipes': np.array(pipe_corner_positions, dtype=np.float32),
-            'enemies': np.array(enemy_info, dtype=np.float32),
-            'bullets': np.array(bullet_info, dtype=np.float32),
-        }
+        self.fill_bullet_info(e)
 
-        return game_state
+        if self.zero_copy:
+            return dict(self.buffers)
+        return {key: buffer.copy() for key, buffer in self.buffers.items()}
 
-    def get_spawned_item_info(self, e: 'FlappyBird') -> list[list[int]]:  # noqa: F821
+    def fill_spawned_item_info(self, e: 'FlappyBird') -> None:  # noqa: F821
         """
-        Get spawned item info for the observation.
+        Fill the spawned item info buffer for the observation.
 
         It doesn't check for Euclidean distance to the player, which was my initial idea, so we would then pass the
         closest three spawned items, because the issue with that is the distances change every single frame, meaning
@@ -188,9 +204,10 @@ class AdvancedFlappyObservation(BaseObservation):
         Considering we'll very rarely have more than 3 items on screen at once, I think I have already complicated
         this far enough and should MOVE THE FUCK ON WHY AM I EVEN WRITING THIS LONG ASS USELESS DOCSTRING????????
         """
-        DEFAULT_INFO = [0, 0, -100, -900]
         # 3 items, each with: type id, item id, x & y position
-        spawned_items = [DEFAULT_INFO.copy() for _ in range(3)]  # shape (3, 4)
+        spawned_items = self.buffers['spawned_items']  # shape (3, 4)
+        spawned_items[:] = self.DEFAULT_SPAWNED_ITEM_INFO
+        slot_taken = [False] * 3
 
         # get the closest 3 spawned items to the player that are within the screen bounds
         new_items: list[SpawnedItem] = []
@@ -214,25 +231,27 @@ class AdvancedFlappyObservation(BaseObservation):
 
             # If we got this far, the item is good to go (was a part of observation before), so simply update its info!
             item_index = self.spawned_item_index_dict[spawned_item]
-            spawned_items[item_index] = [
+            slot_taken[item_index] = True
+            spawned_items[item_index] = (
                 self.TYPE_IDS[ITEM_NAME_TO_CLASS_MAP[spawned_item.item_name].item_type],  # type id
                 self.ITEM_IDS[spawned_item.item_name],  # item id
                 spawned_item.cx - self.player_cx,  # relative x position to player
                 spawned_item.cy - self.player_cy,  # relative y position to player
-            ]
+            )
 
         for new_item in new_items:
-            free_item_index = next((i for i, item in enumerate(spawned_items) if item == DEFAULT_INFO), -1)
+            free_item_index = next((i for i, taken in enumerate(slot_taken) if not taken), -1)
 
             if free_item_index != -1:
                 # assign the new item to the free slot
                 self.spawned_item_index_dict[new_item] = free_item_index
-                spawned_items[free_item_index] = [
+                slot_taken[free_item_index] = True
+                spawned_items[free_item_index] = (
                     self.TYPE_IDS[ITEM_NAME_TO_CLASS_MAP[new_item.item_name].item_type],  # type id
                     self.ITEM_IDS[new_item.item_name],  # item id
                     new_item.cx - self.player_cx,  # relative x position to player
                     new_item.cy - self.player_cy,  # relative y position to player
-                ]
+                )
             else:
                 # No free slots - we'll just ignore this and all remaining spawned items.
                 # We could check if it's closer than any of the current ones, but then they might
@@ -241,11 +260,9 @@ class AdvancedFlappyObservation(BaseObservation):
                 # just once every third full moon, so it's just not worth complicating the code for that.
                 break
 
-        return spawned_items
-
-    def get_enemy_info(self, e: 'FlappyBird') -> list[list[float]]:  # noqa: F821
+    def fill_enemy_info(self, e: 'FlappyBird') -> None:  # noqa: F821
         """
-        Get enemy info for the observation.
+        Fill the enemy info buffer for the observation.
 
         This works with at most 4 enemies. If you make a new SkyDart formation with over 4 SkyDarts or any other
         type of enemy that can have more than 4 members, you'll need to modify this method to handle that better.
@@ -254,9 +271,10 @@ class AdvancedFlappyObservation(BaseObservation):
         The current SkyDart formations have farther SkyDarts later in the formation list, meaning that
         the fourth SkyDart that is further away from the player will be ignored, until one slot gets freed up.
         """
-        DEFAULT_INFO = [0, 530, 300, 0, 0, 0, 0]
         # 3 enemies, each with: type id, x & y position, x & y velocity, rotation, hp
-        enemy_info = [DEFAULT_INFO.copy() for _ in range(3)]
+        enemy_info = self.buffers['enemies']
+        enemy_info[:] = self.DEFAULT_ENEMY_INFO
+        slot_taken = [False] * 3
 
         self.rightmost_visible_enemy_x = None  # reset this for every observation
 
@@ -278,7 +296,7 @@ class AdvancedFlappyObservation(BaseObservation):
                     self.rightmost_visible_enemy_x = enemy.x + enemy.w
 
                 # [WARN] This works with AT MOST 4 enemies! You add a fifth one, and you'll have problems.
-                # The solution we used for get_spawned_item_info() could work here, even with over 4 enemies,
+                # The solution we used for fill_spawned_item_info() could work here, even with over 4 enemies,
                 # but it's more complex. Because we know there is at most 1 more enemy than the observation can
                 # handle and that enemy is *usually* further away than others, I decided to keep it simple and
                 # do whatever this is... :thumbs_up:
@@ -286,7 +304,7 @@ class AdvancedFlappyObservation(BaseObservation):
                     index = self.enemy_index_dict[enemy]
                 else:
                     if enemy.id == 3:
-                        index = next((i for i, item in enumerate(enemy_info) if item == DEFAULT_INFO), -1)
+                        index = next((i for i, taken in enumerate(slot_taken) if not taken), -1)
                         if index == -1:
                             # No free slots - we'll just ignore this enemy and move to the next one.
                             continue
@@ -294,7 +312,8 @@ class AdvancedFlappyObservation(BaseObservation):
                         index = enemy.id
                     self.enemy_index_dict[enemy] = index
 
-                enemy_info[index] = [
+                slot_taken[index] = True
+                enemy_info[index] = (
                     enemy_type_id,  # type id (1: CloudSkimmer, 2: SkyDart)
                     enemy.cx - self.player_cx,  # relative x position to player
                     enemy.cy - self.player_cy,  # relative y position to player
@@ -302,22 +321,20 @@ class AdvancedFlappyObservation(BaseObservation):
                     enemy.vel_y,  # y velocity
                     enemy.gun_rotation if enemy_type_id == 1 else enemy.rotation,  # rotation (gun rotation for CloudSkimmer, rotation for SkyDart)
                     enemy.hp_bar.current_value  # hp
-                ]
-
-        return enemy_info
+                )
 
-    def get_bullet_info(self, e: 'FlappyBird') -> list[list[float]]:  # noqa: F821
+    def fill_bullet_info(self, e: 'FlappyBird') -> None:  # noqa: F821
         """
-        Collects and returns information about bullets currently present in the environment for the observation space.
+        Collects information about bullets currently present in the environment and fills the bullet info buffer.
 
         Handles both player and enemy bullets, prioritizes the most relevant bullets if there are too many,
         and encodes each bullet with type, ownership, bounce status, position, and velocity.
-        Returns a fixed-size list of bullet info arrays.
         """
-        NUM_BULLETS = 7  # max number of bullets in the observation
-        DEFAULT_INFO = [0, 0, 0, 0, 0, 0, 0]
+        NUM_BULLETS = self.NUM_BULLETS
         # `NUM_BULLETS` bullets, each with: type id, fired by player flag, bounced flag, x & y position, x & y velocity
-        bullet_info = [DEFAULT_INFO.copy() for _ in range(NUM_BULLETS)]
+        bullet_info = self.buffers['bullets']
+        bullet_info.fill(0)
+        slot_taken = [False] * NUM_BULLETS
 
         all_bullets = []  # list of tuples (bullet instance, fired by player flag)
 
@@ -371,7 +388,8 @@ class AdvancedFlappyObservation(BaseObservation):
                 continue
             index = prev_bullet_index_dict[bullet]
             self.bullet_index_dict[bullet] = index
-            bullet_info[index] = [
+            slot_taken[index] = True
+            bullet_info[index] = (
                 self.BULLET_IDS[bullet.item_name],  # type id
                 fired_by_player,  # fired by player flag
                 int(bullet.bounced),  # bounced flag
@@ -379,16 +397,17 @@ class AdvancedFlappyObservation(BaseObservation):
                 bullet.curr_front_pos.y - self.player_cy,  # relative y position to player
                 bullet.velocity.x,  # x velocity
                 bullet.velocity.y  # y velocity
-            ]
+            )
 
         # Place new bullets in remaining free slots
         last_checked_index = 0  # keep track of the last checked index
         for bullet_tuple in new_bullets:
-            for i in range(last_checked_index, len(bullet_info)):
-                if bullet_info[i] == DEFAULT_INFO:
+            for i in range(last_checked_index, NUM_BULLETS):
+                if not slot_taken[i]:
                     bullet, fired_by_player = bullet_tuple
                     self.bullet_index_dict[bullet] = i
-                    bullet_info[i] = [
+                    slot_taken[i] = True
+                    bullet_info[i] = (
                         self.BULLET_IDS[bullet.item_name],  # type id
                         fired_by_player,  # fired by player flag
                         int(bullet.bounced),  # bounced flag
@@ -396,12 +415,10 @@ class AdvancedFlappyObservation(BaseObservation):
                         bullet.curr_front_pos.y - self.player_cy,  # relative y position to player
                         bullet.velocity.x,  # x velocity
                         bullet.velocity.y  # y velocity
-                    ]
+                    )
                     last_checked_index = i + 1
                     break
 
-        return bullet_info
-
     def is_bullet_info_useful(self, bullet, player):
         """
         Checks if the bullet is useful for the observation space.
@@ -5,8 +5,8 @@ from .base_observation import BaseObservation
 
 
 class BasicFlappyObservation(BaseObservation):
-    def __init__(self, entity: Player, env):
-        super().__init__(entity, env)
+    def __init__(self, entity: Player, env, **kwargs):
+        super().__init__(entity, env, **kwargs)
 
     def get_observation(self) -> np.ndarray:
         e = self.env
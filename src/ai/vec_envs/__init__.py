@@ -0,0 +1,3 @@
+from .basic_flappy_batch_vec_env import BasicFlappyBatchVecEnv
+from .shared_memory_vec_env import SharedMemoryVecEnv
+from .spaces_only_vec_env import SpacesOnlyVecEnv
@@ -0,0 +1,263 @@
+from typing import Any, Iterable, Optional, Sequence, Type
+
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import VecEnvIndices, VecEnvObs, VecEnvStepReturn
+
+from src.config import Config
+
+
+class BasicFlappyBatchVecEnv(VecEnv):
+    """
+    Steps many BasicFlappyEnv games at once in a single process.
+    Instead of a full FlappyBird object graph per game, the state of every game is kept in NumPy arrays
+    (player y/velocity/food/hp/shield, pipe x/gap positions) and all games are advanced with array operations.
+
+    It mirrors BasicFlappyEnv.perform_step() (same order of operations, same constants, same observation and
+    reward), with one simplification: collisions use the entities' bounding boxes instead of pixel masks,
+    so it's slightly stricter than the real game. Agents trained here should be double-checked with Mode.RUN_MODEL.
+    """
+
+    # Window & entity dimensions (see Window, Player, Pipes, Floor and the sizes of their images)
+    VIEWPORT_HEIGHT = 800
+    WINDOW_WIDTH = 720
+    PLAYER_X = 144  # int(window.width * 0.2)
+    PLAYER_W, PLAYER_H = 85, 60
+    PLAYER_START_Y = 450  # int((window.height - PLAYER_H) / 2)
+    PLAYER_MIN_Y = -2 * PLAYER_H
+    PLAYER_MAX_Y = VIEWPORT_HEIGHT - PLAYER_H * 0.75
+    PIPE_W, PIPE_H = 130, 1000
+    PIPE_VEL_X = -7.5
+    PIPE_VERTICAL_GAP = 225
+    PIPE_HORIZONTAL_GAP = 390
+    NUM_PIPES = 4
+
+    # Player physics (see Player.reset_vals_normal())
+    START_VEL_Y = -16.875
+    MAX_VEL_Y = 19
+    ACC_Y = 1.875
+    FLAP_ACC = -16.875
+
+    # Damage (see Player.handle_bad_collisions())
+    FLOOR_DAMAGE = 3
+    PIPE_DAMAGE = 200
+
+    def __init__(self, num_envs: int, seed: Optional[int] = None):
+        from ..environments.basic_flappy_env import BasicFlappyEnv  # imported here to avoid circular import
+        action_space, observation_space = BasicFlappyEnv.get_action_and_observation_space()
+        super().__init__(num_envs, observation_space, action_space)
+
+        self.rng = np.random.default_rng(seed)
+        self.actions: Optional[np.ndarray] = None
+
+        n = num_envs
+        self.frame = np.zeros(n, dtype=np.int64)
+        self.player_y = np.zeros(n, dtype=np.float64)
+        self.player_vel_y = np.zeros(n, dtype=np.float64)
+        self.flapped = np.zeros(n, dtype=bool)
+        self.jump_power = np.ones(n, dtype=np.float64)
+        self.hp = np.zeros(n, dtype=np.int64)
+        self.shield = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.pipe_x = np.zeros((n, self.NUM_PIPES), dtype=np.float64)
+        self.pipe_gap_y = np.zeros((n, self.NUM_PIPES), dtype=np.float64)  # y of the upper pipe's bottom edge
+
+        self._reset_games(np.ones(n, dtype=bool))
+
+    def reset(self) -> VecEnvObs:
+        # Same seed logic as GymEnv.reset(), but with a single generator for all games
+        if Config.handle_seed:
+            self.rng = np.random.default_rng(Config.seed)
+        elif self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+
+        self._reset_games(np.ones(self.num_envs, dtype=bool))
+        self.reset_infos = [{} for _ in range(self.num_envs)]
+        return self.get_observations()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        flap = self.actions == 1
+
+        # perform action (Player.flap())
+        can_flap = flap & (self.player_y > self.PLAYER_MIN_Y)
+        self.player_vel_y[can_flap] = self.FLAP_ACC * self.jump_power[can_flap]
+        self.flapped |= can_flap
+
+        # crossed a pipe (Player.crossed())
+        player_cx = self.PLAYER_X + self.PLAYER_W / 2
+        pipe_cx = self.pipe_x + self.PIPE_W / 2
+        passed_pipe = np.any((pipe_cx <= player_cx) & (player_cx < pipe_cx - self.PIPE_VEL_X), axis=1)
+        self.score += passed_pipe
+
+        # collisions (Player.handle_bad_collisions())
+        self._deal_damage(self.FLOOR_DAMAGE, self.player_y + self.PLAYER_H > self.VIEWPORT_HEIGHT)
+        overlaps_x = (self.pipe_x < self.PLAYER_X + self.PLAYER_W) & (self.PLAYER_X < self.pipe_x + self.PIPE_W)
+        player_y = self.player_y[:, None]
+        hits_pipe = overlaps_x & ((player_y < self.pipe_gap_y) | (player_y + self.PLAYER_H > self.pipe_gap_y + self.PIPE_VERTICAL_GAP))
+        self._deal_damage(self.PIPE_DAMAGE, np.any(hits_pipe, axis=1))
+        terminated = self.hp <= 0
+
+        self._tick_pipes()
+        self._tick_player()
+
+        rewards = self._calculate_rewards(flap, passed_pipe).astype(np.float32)
+        observations = self.get_observations()
+
+        infos = [{} for _ in range(self.num_envs)]
+        if np.any(terminated):
+            for i in np.flatnonzero(terminated):
+                infos[i]['terminal_observation'] = observations[i].copy()
+                infos[i]['TimeLimit.truncated'] = False
+            self._reset_games(terminated)
+            observations[terminated] = self.get_observations()[terminated]
+
+        return observations, rewards, terminated.copy(), infos
+
+    def get_observations(self) -> np.ndarray:
+        """
+        Same observation as BasicFlappyObservation, clipped like GymEnv.clip_observation() does for BasicFlappyEnv.
+        """
+        rows = np.arange(self.num_envs)
+        next_pipe = np.argmax(self.pipe_x + self.PIPE_W >= self.PLAYER_X, axis=1)
+        next_next_pipe = np.minimum(next_pipe + 1, self.NUM_PIPES - 1)
+
+        player_cy = self.player_y + self.PLAYER_H / 2
+        gap_center_offset = self.PIPE_VERTICAL_GAP / 2
+
+        observations = np.empty((self.num_envs, 5), dtype=np.float32)
+        observations[:, 0] = player_cy
+        observations[:, 1] = self.player_vel_y
+        observations[:, 2] = self.pipe_x[rows, next_pipe] + self.PIPE_W - self.PLAYER_X
+        observations[:, 3] = player_cy - (self.pipe_gap_y[rows, next_pipe] + gap_center_offset)
+        observations[:, 4] = player_cy - (self.pipe_gap_y[rows, next_next_pipe] + gap_center_offset)
+
+        self.observation_space: gym.spaces.Box
+        return np.clip(observations, self.observation_space.low, self.observation_space.high)
+
+    def _calculate_rewards(self, flap: np.ndarray, passed_pipe: np.ndarray) -> np.ndarray:
+        """
+        Same rewards as BasicFlappyEnv.calculate_reward().
+        """
+        rewards = np.where(flap, -0.1, 0.0) + np.where(passed_pipe, 5.0, 0.0)
+
+        rows = np.arange(self.num_envs)
+        next_pipe = np.argmax(self.pipe_x + self.PIPE_W >= self.PLAYER_X, axis=1)
+        pipe_center_y = self.pipe_gap_y[rows, next_pipe] + self.PIPE_VERTICAL_GAP / 2
+        distance = np.abs(self.player_y + self.PLAYER_H / 2 - pipe_center_y)
+        rewards += np.where(distance < 200, 0.1 * (1 - distance / 200), 0.0)
+
+        return rewards
+
+    def _tick_pipes(self) -> None:
+        """
+        Pipes.tick() - remove the first pipe pair once it's far enough off-screen, spawn a new one at the end, move all.
+        """
+        extra = self.PIPE_HORIZONTAL_GAP * 0.5
+        remove = self.pipe_x[:, 0] < -self.PIPE_W - extra
+        if np.any(remove):
+            count = int(np.count_nonzero(remove))
+            self.pipe_x[remove] = np.roll(self.pipe_x[remove], -1, axis=1)
+            self.pipe_gap_y[remove] = np.roll(self.pipe_gap_y[remove], -1, axis=1)
+            self.pipe_x[remove, -1] = self.pipe_x[remove, -2] + self.PIPE_HORIZONTAL_GAP
+            self.pipe_gap_y[remove, -1] = self._random_gap_y(count)
+
+        self.pipe_x += self.PIPE_VEL_X
+
+    def _tick_player(self) -> None:
+        """
+        Player.tick() in PlayerMode.NORMAL - tick_normal() and tick_food().
+        """
+        self.frame += 1
+
+        accelerate = (self.player_vel_y < self.MAX_VEL_Y) & ~self.flapped
+        self.player_vel_y[accelerate] += self.ACC_Y
+        self.flapped[:] = False
+        self.player_y = np.clip(self.player_y + self.player_vel_y, self.PLAYER_MIN_Y, self.PLAYER_MAX_Y)
+
+        # Player.tick_food()
+        drain_interval = np.full(self.num_envs, 30)
+
+        healing = (self.food >= 80) & (self.hp < 100)
+        self.hp[healing & (self.frame % 9 == 0)] += 1
+        drain_interval[healing] = 15
+
+        starving = ~healing & (self.food <= 20)
+        drain_interval[starving] = 45
+        self.jump_power[starving] = 0.75 + 0.25 * (self.food[starving] / 20)
+        self.jump_power[(self.jump_power < 1.0) & (self.food > 20)] = 1.0
+
+        self.hp[(self.food <= 0) & (self.frame % 15 == 0)] -= 1
+        self.food[self.frame % drain_interval == 0] -= 1
+
+        np.clip(self.hp, 0, 100, out=self.hp)
+        np.clip(self.food, 0, 100, out=self.food)
+
+    def _deal_damage(self, amount: int, mask: np.ndarray) -> None:
+        """
+        Player.deal_damage() - shield takes the damage first, the rest goes to HP.
+        """
+        absorbed = np.minimum(self.shield, amount)
+        self.hp[mask] -= amount - absorbed[mask]
+        self.shield[mask] -= absorbed[mask]
+        np.clip(self.hp, 0, 100, out=self.hp)
+
+    def _reset_games(self, mask: np.ndarray) -> None:
+        """
+        FlappyBird.reset() + BaseEnv.reset_env() for the games selected by the mask.
+        """
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return
+
+        self.frame[mask] = 0
+        self.player_y[mask] = self.PLAYER_START_Y
+        self.player_vel_y[mask] = self.START_VEL_Y
+        self.flapped[mask] = False
+        self.jump_power[mask] = 1.0
+        self.hp[mask] = 100
+        self.shield[mask] = 100
+        self.food[mask] = 100
+        self.score[mask] = 0
+
+        first_pipe_x = self.WINDOW_WIDTH + self.PIPE_HORIZONTAL_GAP
+        self.pipe_x[mask] = first_pipe_x + np.arange(self.NUM_PIPES) * self.PIPE_HORIZONTAL_GAP
+        self.pipe_gap_y[mask] = self._random_gap_y((count, self.NUM_PIPES))
+
+    def _random_gap_y(self, size) -> np.ndarray:
+        # same as Pipes.make_random_pipes(): random.randrange(0, int(base_y * 0.6 - vertical_gap)) + int(base_y * 0.2)
+        high = int(self.VIEWPORT_HEIGHT * 0.6 - self.PIPE_VERTICAL_GAP)
+        return self.rng.integers(0, high, size=size) + int(self.VIEWPORT_HEIGHT * 0.2)
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        if attr_name == 'render_mode':
+            return [None for _ in self._get_indices(indices)]
+        value = getattr(self, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> list[Any]:
+        raise NotImplementedError(f"'{method_name}' can't be called on a single game of {type(self).__name__}.")
+
+    def env_is_wrapped(self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None) -> list[bool]:
+        return [False for _ in self._get_indices(indices)]
+
+    def _get_indices(self, indices: VecEnvIndices) -> Iterable[int]:
+        if indices is None:
+            return range(self.num_envs)
+        elif isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        return [None for _ in range(self.num_envs)]
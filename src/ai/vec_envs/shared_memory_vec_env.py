@@ -0,0 +1,269 @@
+import multiprocessing as mp
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Optional
+
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.vec_env import SubprocVecEnv
+from stable_baselines3.common.vec_env.base_vec_env import CloudpickleWrapper, VecEnv, VecEnvIndices, VecEnvObs, \
+    VecEnvStepReturn
+from stable_baselines3.common.vec_env.patch_gym import _patch_env
+
+ACTION_MASKS_METHOD = 'action_masks'  # name MaskablePPO calls through env_method()
+
+
+class SharedMemoryVecEnv(SubprocVecEnv):
+    """
+    Drop-in replacement for SubprocVecEnv, where the workers write observations, rewards, dones and action masks
+    straight into shared memory (NumPy arrays laid out from the observation & action space), instead of pickling them
+    through the pipes. Actions are passed the same way, so the pipes only carry the commands and the (usually empty)
+    infos. Action masks are computed by the workers during step() & reset(), so MaskablePPO's env_method('action_masks')
+    just reads them from the shared memory, instead of needing a second round trip to every worker.
+
+    Only observation spaces with a fixed shape & dtype (Box, Discrete, MultiDiscrete, MultiBinary) are supported,
+    or a Dict of them.
+
+    :param env_fns: environments to run in subprocesses
+    :param start_method: same as SubprocVecEnv's - 'forkserver' (or 'spawn') by default
+    """
+    def __init__(self, env_fns: list[Callable[[], gym.Env]], start_method: Optional[str] = None):
+        self.waiting = False
+        self.closed = False
+        n_envs = len(env_fns)
+
+        if start_method is None:
+            start_method = 'forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'
+        ctx = mp.get_context(start_method)
+        # SharedMemory registers the segment with the resource tracker in every process that attaches to it, and a
+        # tracker unlinks its segments once its processes exit. Starting the tracker before the workers makes them all
+        # share ours (forked workers would start their own otherwise and unlink the segment when they exit).
+        resource_tracker.ensure_running()
+
+        self.remotes, self.work_remotes = zip(*[ctx.Pipe() for _ in range(n_envs)])
+        self.processes = []
+        for work_remote, remote, env_fn in zip(self.work_remotes, self.remotes, env_fns):
+            args = (work_remote, remote, CloudpickleWrapper(env_fn))
+            # daemon=True: if the main process crashes, we should not cause things to hang
+            process = ctx.Process(target=_worker, args=args, daemon=True)
+            process.start()
+            self.processes.append(process)
+            work_remote.close()
+
+        self.remotes[0].send(('get_spaces', None))
+        observation_space, action_space, action_mask_spec = self.remotes[0].recv()
+        VecEnv.__init__(self, n_envs, observation_space, action_space)
+
+        self.layout = get_buffer_layout(n_envs, observation_space, action_space, action_mask_spec)
+        self.shared_memory = SharedMemory(create=True, size=get_buffer_size(self.layout))
+        self.buffers = create_buffers(self.shared_memory, self.layout)
+        self.observation_buffers = {key[1]: buffer for key, buffer in self.buffers.items() if key[0] == 'observation'}
+        self.action_masks_buffer: Optional[np.ndarray] = self.buffers.get(('action_masks', None))
+
+        for env_index, remote in enumerate(self.remotes):
+            remote.send(('attach', (self.shared_memory.name, self.layout, env_index)))
+        for remote in self.remotes:
+            remote.recv()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self.buffers[('actions', None)][:] = np.asarray(actions).reshape(self.buffers[('actions', None)].shape)
+        for remote in self.remotes:
+            remote.send(('step', None))
+        self.waiting = True
+
+    def step_wait(self) -> VecEnvStepReturn:
+        results = [remote.recv() for remote in self.remotes]
+        self.waiting = False
+        infos = [info if info is not None else {"TimeLimit.truncated": False} for info, _ in results]
+        self.reset_infos = [reset_info if reset_info is not None else {} for _, reset_info in results]
+        return (self._get_observations(), self.buffers[('rewards', None)].copy(),
+                self.buffers[('dones', None)].copy(), infos)
+
+    def reset(self) -> VecEnvObs:
+        for env_index, remote in enumerate(self.remotes):
+            remote.send(('reset', (self._seeds[env_index], self._options[env_index])))
+        self.reset_infos = [remote.recv() for remote in self.remotes]
+        # Seeds and options are only used once
+        self._reset_seeds()
+        self._reset_options()
+        return self._get_observations()
+
+    def _get_observations(self) -> VecEnvObs:
+        # copies, as the buffers are overwritten in the next step, while SB3 might still hold on to the observations
+        if isinstance(self.observation_space, gym.spaces.Dict):
+            return {key: buffer.copy() for key, buffer in self.observation_buffers.items()}
+        return self.observation_buffers[None].copy()
+
+    def has_attr(self, attr_name: str) -> bool:
+        if attr_name == ACTION_MASKS_METHOD:
+            return self.action_masks_buffer is not None
+        return super().has_attr(attr_name)
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> list[Any]:
+        if method_name == ACTION_MASKS_METHOD and self.action_masks_buffer is not None:
+            # already computed by the workers at the end of the last step/reset
+            return [self.action_masks_buffer[index].copy() for index in self._get_indices(indices)]
+        return super().env_method(method_name, *method_args, indices=indices, **method_kwargs)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        super().close()
+        self.buffers = {}
+        self.observation_buffers = {}
+        self.action_masks_buffer = None
+        self.shared_memory.close()
+        try:
+            self.shared_memory.unlink()
+        except FileNotFoundError:
+            pass  # already unlinked by a resource tracker, e.g. if the workers were started with a different one
+
+
+def get_buffer_layout(num_envs: int, observation_space: gym.spaces.Space, action_space: gym.spaces.Space,
+                      action_mask_spec: Optional[tuple[tuple, str]]) -> list[tuple[tuple[str, Optional[str]], tuple, str]]:
+    """
+    :param action_mask_spec: (shape, dtype) of the environment's action masks, None if it doesn't have any
+    :return: list of ((buffer type, observation key), shape, dtype) - one buffer for each part of the observation,
+             actions, rewards, dones and action masks (if the environment has them)
+    """
+    if isinstance(observation_space, gym.spaces.Dict):
+        observation_spaces = list(observation_space.spaces.items())
+    else:
+        observation_spaces = [(None, observation_space)]
+
+    layout = []
+    for key, space in observation_spaces:
+        if space.shape is None or space.dtype is None:
+            raise NotImplementedError(f"Observation space of type '{type(space)}' is not supported by SharedMemoryVecEnv.")
+        layout.append((('observation', key), (num_envs, *space.shape), np.dtype(space.dtype).str))
+
+    layout.append((('actions', None), (num_envs, *action_space.shape), np.dtype(action_space.dtype).str))
+    layout.append((('rewards', None), (num_envs,), np.dtype(np.float64).str))
+    layout.append((('dones', None), (num_envs,), np.dtype(bool).str))
+    if action_mask_spec is not None:
+        mask_shape, mask_dtype = action_mask_spec
+        layout.append((('action_masks', None), (num_envs, *mask_shape), mask_dtype))
+    return layout
+
+
+def _get_offsets(layout) -> list[int]:
+    offsets = []
+    offset = 0
+    for _, shape, dtype in layout:
+        offsets.append(offset)
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        offset += (size + 63) // 64 * 64  # align each buffer to a cache line
+    offsets.append(offset)
+    return offsets
+
+
+def get_buffer_size(layout) -> int:
+    return max(_get_offsets(layout)[-1], 1)
+
+
+def create_buffers(shared_memory: SharedMemory, layout) -> dict[tuple[str, Optional[str]], np.ndarray]:
+    """ Creates NumPy arrays backed by the shared memory, following the layout. """
+    offsets = _get_offsets(layout)
+    return {
+        key: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shared_memory.buf, offset=offset)
+        for (key, shape, dtype), offset in zip(layout, offsets)
+    }
+
+
+def _get_action_mask_spec(env: gym.Env) -> Optional[tuple[tuple, str]]:
+    """ :return: (shape, dtype) of the action masks, so env_method('action_masks') returns them exactly as the env does """
+    try:
+        action_masks = env.get_wrapper_attr(ACTION_MASKS_METHOD)
+    except AttributeError:
+        return None
+    mask = np.asarray(action_masks())
+    return mask.shape, mask.dtype.str
+
+
+def _worker(remote, parent_remote, env_fn_wrapper: CloudpickleWrapper) -> None:
+    # Import here to avoid a circular import
+    from stable_baselines3.common.env_util import is_wrapped
+
+    parent_remote.close()
+    env = _patch_env(env_fn_wrapper.var())
+    shared_memory = None
+    buffers = {}
+    env_index = 0
+    action_masks = None
+
+    def write(observation, reward=0.0, done=False) -> None:
+        if isinstance(observation, dict):
+            for key, value in observation.items():
+                buffers[('observation', key)][env_index] = value
+        else:
+            buffers[('observation', None)][env_index] = observation
+        buffers[('rewards', None)][env_index] = reward
+        buffers[('dones', None)][env_index] = done
+        if action_masks is not None:
+            buffers[('action_masks', None)][env_index] = action_masks()
+
+    try:
+        while True:
+            try:
+                cmd, data = remote.recv()
+                if cmd == 'step':
+                    action = buffers[('actions', None)][env_index].copy()
+                    observation, reward, terminated, truncated, info = env.step(action)
+                    # convert to SB3 VecEnv api
+                    done = terminated or truncated
+                    info["TimeLimit.truncated"] = truncated and not terminated
+                    reset_info = None
+                    if done:
+                        # save final observation where user can get it, then reset
+                        info["terminal_observation"] = observation
+                        observation, reset_info = env.reset()
+                    write(observation, reward, done)
+                    # only send the info if there's something in it (besides the default TimeLimit.truncated=False)
+                    if len(info) == 1 and not info["TimeLimit.truncated"]:
+                        info = None
+                    remote.send((info, reset_info or None))
+                elif cmd == 'reset':
+                    maybe_options = {"options": data[1]} if data[1] else {}
+                    observation, reset_info = env.reset(seed=data[0], **maybe_options)
+                    write(observation)
+                    remote.send(reset_info)
+                elif cmd == 'attach':
+                    name, layout, env_index = data
+                    shared_memory = SharedMemory(name=name)
+                    buffers = create_buffers(shared_memory, layout)
+                    if ('action_masks', None) in buffers:
+                        action_masks = env.get_wrapper_attr(ACTION_MASKS_METHOD)
+                    remote.send(None)
+                elif cmd == 'get_spaces':
+                    remote.send((env.observation_space, env.action_space, _get_action_mask_spec(env)))
+                elif cmd == 'render':
+                    remote.send(env.render())
+                elif cmd == 'close':
+                    env.close()
+                    remote.close()
+                    break
+                elif cmd == 'env_method':
+                    method = env.get_wrapper_attr(data[0])
+                    remote.send(method(*data[1], **data[2]))
+                elif cmd == 'get_attr':
+                    remote.send(env.get_wrapper_attr(data))
+                elif cmd == 'has_attr':
+                    try:
+                        env.get_wrapper_attr(data)
+                        remote.send(True)
+                    except AttributeError:
+                        remote.send(False)
+                elif cmd == 'set_attr':
+                    remote.send(setattr(env, data[0], data[1]))
+                elif cmd == 'is_wrapped':
+                    remote.send(is_wrapped(env, data))
+                else:
+                    raise NotImplementedError(f"`{cmd}` is not implemented in the worker")
+            except EOFError:
+                break
+            except KeyboardInterrupt:
+                break
+    finally:
+        buffers.clear()
+        if shared_memory is not None:
+            shared_memory.close()
@@ -0,0 +1,45 @@
+from typing import Any, Optional, Sequence, Type
+
+import gymnasium as gym
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import VecEnvIndices, VecEnvObs, VecEnvStepReturn
+
+
+class SpacesOnlyVecEnv(VecEnv):
+    """
+    A VecEnv that only carries the observation and action space, without an actual environment behind it.
+    It's enough to wrap VecNormalize for normalizing observations (e.g. for inference in model controllers),
+    without having to construct a whole game environment just to get its spaces.
+    """
+    def __init__(self, observation_space: gym.spaces.Space, action_space: gym.spaces.Space, num_envs: int = 1):
+        super().__init__(num_envs, observation_space, action_space)
+
+    def reset(self) -> VecEnvObs:
+        raise NotImplementedError(f"{type(self).__name__} has no environment to reset.")
+
+    def step_async(self, actions: np.ndarray) -> None:
+        raise NotImplementedError(f"{type(self).__name__} has no environment to step.")
+
+    def step_wait(self) -> VecEnvStepReturn:
+        raise NotImplementedError(f"{type(self).__name__} has no environment to step.")
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        if attr_name == 'render_mode':
+            return [None for _ in range(self.num_envs)]
+        raise AttributeError(f"{type(self).__name__} has no environment attribute '{attr_name}'.")
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        raise AttributeError(f"{type(self).__name__} has no environment attribute '{attr_name}'.")
+
+    def env_method(self, method_name: str, *method_args, indices: VecEnvIndices = None, **method_kwargs) -> list[Any]:
+        raise NotImplementedError(f"{type(self).__name__} has no environment method '{method_name}'.")
+
+    def env_is_wrapped(self, wrapper_class: Type[gym.Wrapper], indices: VecEnvIndices = None) -> list[bool]:
+        return [False for _ in range(self.num_envs)]
+
+    def get_images(self) -> Sequence[Optional[np.ndarray]]:
+        return [None for _ in range(self.num_envs)]
@@ -9,6 +9,7 @@ class Config:
     settings_manager = SettingsManager()  # load settings
     fps_cap: int = 30  # <-- change the FPS cap here; default = 30; no cap = 0 or a negative value
     num_cores: int = 8  # <-- change the number of cores to use during training (more != faster training)
+    num_batch_envs: int = 0  # <-- number of games to step at once in a single batched process, if the env supports it (0 = use num_cores processes instead)
     debug: bool = settings_manager.get_setting('debug')  # <-- toggle debug mode
     mode: Mode = Mode.CONTINUE_TRAINING  # <-- change the mode here
     algorithm: Literal['PPO', 'DQN'] = 'PPO'  # <-- change the algorithm here (PPO is the only one fully supported)
@@ -25,6 +26,31 @@ class Config:
         'headless': False,  # run pygame in headless mode to increase performance
         'mute': False,  # mute the audio (slight performance boost)
         'profile': False,  # profile the code execution
+        'frame_profiler': False,  # time each subsystem per frame (toggle the overlay with F3), exported to data/profiles
+        'sim': False,  # pure simulation in environments, skip all drawing (much faster training; not used in Mode.PLAY)
+        'record_replays': False,  # record every episode to data/replays, so it can be re-simulated with Mode.REPLAY
+        'trusted_observations': False,  # skip the observation bounds checks (clip modes -1 & 0), once an env is known to stay in bounds
+        'numpy_inference': True,  # controllers predict with a NumPy copy of the model (no torch needed), converted on first use
+        'fake_database': False,  # use an in-memory fake database instead of Supabase (test the leaderboard offline; scores are lost on exit)
+        'fork_workers': False,  # start training workers with fork instead of forkserver (Linux only; much less memory & faster startup, but forking after torch is imported isn't officially supported)
+    }
+    benchmark = {  # used by Mode.BENCHMARK_ENV, which benchmarks all env types & variants (env_type & env_variant are ignored)
+        'num_steps': 5_000,  # steps per worker
+        'num_resets': 50,  # timed resets per worker
+        'worker_counts': (1, 4),  # numbers of envs stepped in parallel (one process each)
+        'option_sets': (  # options overrides to benchmark with
+            {'headless': True, 'mute': True, 'sim': True},
+            {'headless': True, 'mute': True, 'sim': False},
+            {'headless': True, 'mute': False, 'sim': False},
+        ),
+    }
+    replay_file: Optional[str] = None  # <-- replay to re-simulate with Mode.REPLAY (file name in data/replays); None = the latest one
+    start_states = {  # mid-game start states for the environments, harvested from the replays in data/replays with Mode.HARVEST_STATES
+        'library': None,  # <-- library to sample start states from (file name in data/start_states); None = always start a new game
+        'probability': 0.5,  # chance that an episode starts from a sampled state instead of a new game
+        'every_n_frames': 30,  # harvest a state every n frames (if it's interesting, e.g. enemies are alive)...
+        'skip_last_frames': 15,  # ...but not in the last frames before the episode ended
+        'max_per_replay': 50,  # maximum number of states harvested from a single replay
     }
 
     @classmethod
@@ -38,6 +64,11 @@ class Config:
                 cls.printcw("Headless mode is enabled but FPS is capped. Use 0 for no FPS cap.")
             if cls.mode == Mode.RUN_MODEL:
                 cls.printcw("Headless mode is enabled but mode is set to Mode.RUN_MODEL.")
+        if cls.options['sim']:
+            if cls.mode == Mode.PLAY:
+                cls.printcw("Sim mode is enabled but mode is set to Mode.PLAY. Sim mode only applies to environments, so it will be ignored.")
+            elif cls.mode == Mode.RUN_MODEL:
+                cls.printcw("Sim mode is enabled but mode is set to Mode.RUN_MODEL. Nothing will be drawn on the screen.")
         # TODO: Mode.PLAY will not use env_type either, maybe add a warning for that as well? Or remove a warning for env_variant?
         if cls.env_variant != EnvVariant.MAIN and cls.mode == Mode.PLAY:
             cls.printcw("Mode.PLAY will NOT take the env_variant into account. EnvVariant.MAIN will be used instead.")
@@ -100,5 +131,3 @@ class Config:
         printc("[CONFIG WARN]", color=color, styles=['bold'], end=' ')
         printc(message, color=color)
 
-
-Config.verify_config()
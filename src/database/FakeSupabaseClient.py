@@ -1,24 +1,171 @@
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
 from src.utils import printc
 
 
 class FakeSupabaseClient:
+    """
+    Stand-in for the Supabase client, so errors aren't thrown when calling supabase's methods without a connection.
+
+    By default, it doesn't store anything and every select returns a '---' placeholder row (just like when there's no
+    internet connection). With `in_memory=True`, it behaves like a tiny local database instead: inserts are stored and
+    selects are ordered, filtered (eq, lt, gt & or_) and limited, so the score service can be tested/benchmarked offline.
+    """
+    def __init__(self, in_memory: bool = False, latency: float = 0, verbose: bool = None):
+        """
+        :param in_memory: store inserted rows and serve selects from them
+        :param latency: seconds each executed query takes, to simulate a network round trip
+        :param verbose: print every query; defaults to True, unless in_memory is used
+        """
+        self.in_memory = in_memory
+        self.latency = latency
+        self.verbose = not in_memory if verbose is None else verbose
+        self.tables: dict[str, list[dict]] = {}
+        self.num_queries: int = 0
+        self.lock = threading.Lock()
+
     def table(self, name):
-        return self
+        return FakeQuery(self, name)
+
+
+class FakeQuery:
+    PLACEHOLDER_DATA = [{'score': '---', 'timestamp': '---'}]
+
+    def __init__(self, client: FakeSupabaseClient, table_name: str):
+        self.client = client
+        self.table_name = table_name
+        self.rows_to_insert = None
+        self.selecting = False
+        self.filters = []  # functions that take a row and return whether it passes
+        self.ordering = []  # (column, desc)
+        self.max_rows = None
+
+    def log(self, message: str):
+        if self.client.verbose:
+            printc(f"[FakeSupabase] {message}", color="gray")
 
     def insert(self, data):
-        printc(f"[FakeSupabase] Would insert: {data}", color="gray")
+        self.log(f"Would insert: {data}")
+        self.rows_to_insert = data if isinstance(data, list) else [data]
         return self
 
     def select(self, *args, **kwargs):
-        printc(f"[FakeSupabase] Would select: {args}", color="gray")
+        self.log(f"Would select: {args}")
+        self.selecting = True
+        return self
+
+    def order(self, column, desc: bool = False, **kwargs):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count, **kwargs):
+        self.max_rows = count
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: _compare(row.get(column), 'eq', value))
         return self
 
-    def order(self, *args, **kwargs):
+    def lt(self, column, value):
+        self.filters.append(lambda row: _compare(row.get(column), 'lt', value))
         return self
 
-    def limit(self, *args, **kwargs):
+    def gt(self, column, value):
+        self.filters.append(lambda row: _compare(row.get(column), 'gt', value))
+        return self
+
+    def or_(self, filters: str, **kwargs):
+        condition = _parse_condition(f"or({filters})")
+        self.filters.append(condition)
         return self
 
     def execute(self):
-        printc("[FakeSupabase] Would execute query", color="gray")
-        return type('FakeResponse', (), {'data': [{'score': '---', 'timestamp': '---'}]})()
+        self.log("Would execute query")
+        client = self.client
+        if client.latency:
+            time.sleep(client.latency)
+
+        with client.lock:
+            client.num_queries += 1
+            if not client.in_memory:
+                return FakeResponse(self.PLACEHOLDER_DATA)
+
+            table = client.tables.setdefault(self.table_name, [])
+            if self.rows_to_insert is not None:
+                inserted = []
+                for row in self.rows_to_insert:
+                    row = dict(row)
+                    row.setdefault('id', len(table) + 1)
+                    row.setdefault('timestamp', datetime.now(timezone.utc).isoformat())
+                    table.append(row)
+                    inserted.append(dict(row))
+                return FakeResponse(inserted)
+
+            rows = [row for row in table if all(f(row) for f in self.filters)]
+            # sort by the least significant column first, so the most significant one wins (sorting is stable)
+            for column, desc in reversed(self.ordering):
+                rows.sort(key=lambda row: row[column], reverse=desc)
+            if self.max_rows is not None:
+                rows = rows[:self.max_rows]
+            return FakeResponse([dict(row) for row in rows])
+
+
+class FakeResponse:
+    def __init__(self, data: list[dict]):
+        self.data = data
+
+
+def _compare(value, operator: str, other) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, (int, float)) and not isinstance(other, (int, float)):
+        other = float(other)
+    match operator:
+        case 'eq':
+            return value == other
+        case 'lt':
+            return value < other
+        case 'gt':
+            return value > other
+        case _:
+            raise ValueError(f"FakeSupabaseClient doesn't support the '{operator}' operator.")
+
+
+def _parse_condition(text: str):
+    """
+    Parses a (small subset of a) PostgREST logical filter, e.g. 'or(score.lt.5,and(score.eq.5,timestamp.lt."...")')
+    into a function that takes a row and returns whether it passes the filter.
+    """
+    text = text.strip()
+    match = re.fullmatch(r'(and|or)\((.*)\)', text, re.DOTALL)
+    if match:
+        combine = all if match.group(1) == 'and' else any
+        conditions = [_parse_condition(part) for part in _split_top_level(match.group(2))]
+        return lambda row: combine(condition(row) for condition in conditions)
+
+    column, operator, value = text.split('.', 2)
+    if value.startswith('"') and value.endswith('"'):
+        value = value[1:-1]
+    return lambda row: _compare(row.get(column), operator, value)
+
+
+def _split_top_level(text: str) -> list[str]:
+    """ Splits the text by commas that aren't inside parentheses or quotes. """
+    parts, depth, in_quotes, current = [], 0, False, ''
+    for char in text:
+        if char == '"':
+            in_quotes = not in_quotes
+        elif not in_quotes and char == '(':
+            depth += 1
+        elif not in_quotes and char == ')':
+            depth -= 1
+        elif not in_quotes and depth == 0 and char == ',':
+            parts.append(current)
+            current = ''
+            continue
+        current += char
+    parts.append(current)
+    return parts
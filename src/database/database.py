@@ -1,22 +1,45 @@
 import os
+import threading
 
-from dotenv import load_dotenv
-from supabase import create_client, Client
-
-from src.database.FakeSupabaseClient import FakeSupabaseClient
 from src.utils import printc
 
-# Load environment variables from .env file
-load_dotenv()
+supabase = None  # created on first use by get_supabase()
+supabase_lock = threading.Lock()  # scores are fetched & submitted from background threads
+
+
+def get_supabase():
+    """
+    Returns the Supabase client, creating it on first use - loading the .env file and importing supabase (and its
+    dependencies) takes a while, and isn't needed until scores are fetched or submitted.
+    """
+    global supabase
+    with supabase_lock:
+        if supabase is None:
+            supabase = create_supabase_client()
+        return supabase
+
+
+def create_supabase_client():
+    from src.config import Config  # imported here to avoid circular import
+    from src.database.FakeSupabaseClient import FakeSupabaseClient
+
+    if Config.options['fake_database']:
+        printc("[INFO] Using an in-memory fake database, scores are lost when the game is closed.", color="blue")
+        return FakeSupabaseClient(in_memory=True)
+
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv()
+
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_KEY")
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+    if not supabase_url or not supabase_key:
+        printc("[WARN] Supabase URL or key not found in .env file. Database connection has not been established!", color="orange")
+        # Use a fake client class, so errors aren't thrown when calling supabase's methods
+        return FakeSupabaseClient()
 
-supabase: Client
-if not SUPABASE_URL or not SUPABASE_KEY:
-    printc("[WARN] Supabase URL or key not found in .env file. Database connection has not been established!", color="orange")
-    # Use a fake client class, so errors aren't thrown when calling supabase's methods
-    supabase = FakeSupabaseClient()  # type: ignore
-else:
     # Initialize real Supabase client
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    from supabase import create_client
+    return create_client(supabase_url, supabase_key)
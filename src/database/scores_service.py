@@ -1,41 +1,240 @@
-import requests
+import os
+import threading
+import time
+from typing import Optional
 
-from .database import supabase
+from src.utils import printc
+from src.utils.persistance.file_manager import FileManager, file_lock
+from .database import get_supabase
+
+NO_SCORES = [{'score': '---', 'timestamp': '---'}]  # returned when scores can't be fetched
+
+PAGE_CACHE_TTL = 60  # seconds a fetched leaderboard page stays valid
+# (limit, after) -> (time fetched, rows)
+cached_pages: dict[tuple, tuple[float, list[dict]]] = {}
+cached_pages_lock = threading.Lock()
 
 
 def submit_score(username: str, score: int):
-    try:
-        response = (
-            supabase.table('Scores')
-            .insert({
-                'username': username,
-                'score': score,
-            })
-            .execute()
-        )
-    except requests.ConnectionError:
-        print("No internet connection. Score not submitted.")
-        return
+    """
+    Queues the score for submission. Scores are inserted in batches by a background thread,
+    and saved locally until they're sent, so they aren't lost if there's no internet connection.
+    """
+    score_submitter.submit(username, score)
+
 
-    if not response or not response.data:
-        print(f"Error adding score {score} for '{username}'.")
+def flush_scores(timeout: float = 3) -> bool:
+    """
+    Sends the queued scores right away (call it before quitting, the background thread would just get killed).
+    Scores that can't be sent in time stay saved locally and are retried the next time the game is started.
+    :return: True if all scores were sent
+    """
+    return score_submitter.flush(timeout)
 
 
 def get_scores(count: int = 100):
+    """
+    Get the top `count` scores.
+    """
+    return get_scores_page(limit=count)
+
+
+def get_scores_page(limit: int = 100, after: Optional[dict] = None, use_cache: bool = True) -> list[dict]:
+    """
+    Get a page of scores, sorted by score (highest first), then by timestamp (newest first).
+    Uses keyset pagination, so getting later pages is just as cheap as getting the first one.
+
+    :param limit: max number of scores on the page
+    :param after: last score (row) of the previous page, None for the first page
+    :param use_cache: whether a recently fetched page can be returned instead of fetching it again
+    :return: the page of scores (empty if there are no more scores), or NO_SCORES if they couldn't be fetched
+    """
+    key = (limit, None if after is None else (after['score'], after['timestamp']))
+    if use_cache:
+        with cached_pages_lock:
+            cached = cached_pages.get(key)
+        if cached is not None and time.monotonic() - cached[0] < PAGE_CACHE_TTL:
+            return [dict(row) for row in cached[1]]
+
+    import requests  # imported on first use, as it takes a while (just like the Supabase client)
+
     try:
-        response = (
-            supabase.table('Scores')
+        query = (
+            get_supabase().table('Scores')
             .select('username, score, timestamp')
+        )
+        if after is not None:
+            query = query.or_(f'score.lt.{after["score"]},'
+                              f'and(score.eq.{after["score"]},timestamp.lt."{after["timestamp"]}")')
+        response = (
+            query
             .order('score', desc=True)
-            .limit(count)
+            .order('timestamp', desc=True)
+            .limit(limit)
             .execute()
         )
     except requests.ConnectionError:
         print("No internet connection. Scores not fetched.")
-        return [{'score': '---', 'timestamp': '---'}]
+        return [dict(row) for row in NO_SCORES]
 
-    if response and response.data:
-        return response.data
-    else:
+    if not response or response.data is None or response.data == NO_SCORES:
         print("Error fetching scores.")
-        return [{'score': '---', 'timestamp': '---'}]
+        return [dict(row) for row in NO_SCORES]
+
+    with cached_pages_lock:
+        cached_pages[key] = (time.monotonic(), response.data)
+    return [dict(row) for row in response.data]
+
+
+def clear_cached_pages():
+    with cached_pages_lock:
+        cached_pages.clear()
+
+
+class ScoreSubmitter(FileManager):
+    """
+    Batches score inserts in a background thread.
+    Submitted scores are moved to the unsent scores file, so they can be retried later (even after restarting the game).
+    The file is shared by all game processes (e.g. headless AI workers): each batch is claimed from it under a file lock
+    before it's sent, and put back if sending fails, so every score is sent by exactly one process. A batch that's being
+    sent when its process gets killed is lost - better than inserting it twice.
+    """
+    BATCH_SIZE = 100  # max number of scores inserted with a single request
+    FLUSH_INTERVAL = 2  # seconds to wait for more scores, before sending a batch
+    MAX_RETRY_DELAY = 300  # max seconds to wait before retrying, if sending fails
+
+    def __init__(self, unsent_scores_file: str = "unsent_scores.json"):
+        super().__init__()
+        self.unsent_scores_file = unsent_scores_file
+        self.pending: list[dict] = []  # submitted scores that aren't in the unsent scores file yet
+        self.condition = threading.Condition()  # guards self.pending
+        self.send_lock = threading.Lock()  # only one batch is sent at a time
+        self.thread: Optional[threading.Thread] = None
+        self.retry_delay = 0
+        self.num_sent = 0
+        self.num_requests = 0
+
+    @property
+    def lock_file(self):
+        return self.directory / f"{self.unsent_scores_file}.lock"
+
+    def start(self) -> None:
+        """
+        Starts the background thread (if it's not running yet), which also sends scores that weren't sent last time.
+        """
+        with self.condition:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def submit(self, username: str, score: int) -> None:
+        with self.condition:
+            self.pending.append({'username': username, 'score': score})
+            if len(self.pending) >= self.BATCH_SIZE:
+                self.condition.notify()
+        self.start()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Sends all unsent scores right away and waits until they're sent.
+        :return: True if all scores were sent, False otherwise (they stay saved for a later retry)
+        """
+        if self.thread is None:
+            return True  # nothing was submitted (unsent scores from last time are only sent once a score is submitted)
+        end_time = None if timeout is None else time.monotonic() + timeout
+        with self.send_lock:
+            self._save_pending()
+            return self._send_unsent(end_time)
+
+    def _run(self) -> None:
+        while True:
+            # wait for more scores to batch them together (or before retrying, if sending failed)
+            with self.condition:
+                self.condition.wait(timeout=max(self.FLUSH_INTERVAL, self.retry_delay))
+
+            with self.send_lock:
+                self._save_pending()  # in case the game gets closed before they're sent
+                if self._send_unsent():
+                    self.retry_delay = 0
+                else:
+                    self.retry_delay = min(max(self.retry_delay * 2, self.FLUSH_INTERVAL * 2), self.MAX_RETRY_DELAY)
+
+    def _send_unsent(self, end_time: float = None) -> bool:
+        """
+        Sends batches from the unsent scores file, until it's empty, sending fails or end_time is reached.
+        Must be called while holding self.send_lock.
+        :return: True if there are no unsent scores left
+        """
+        while True:
+            batch = self._claim_batch()
+            if not batch:
+                return True
+            if not self._send_batch(batch):
+                self._unclaim_batch(batch)
+                return False
+            if end_time is not None and time.monotonic() > end_time:
+                return not self.file_exists(self.unsent_scores_file)
+
+    def _send_batch(self, batch: list[dict]) -> bool:
+        import requests
+
+        self.num_requests += 1
+        try:
+            response = get_supabase().table('Scores').insert(batch).execute()
+        except requests.ConnectionError:
+            printc(f"[WARN] No internet connection. {len(batch)} score(s) not submitted yet.", color="yellow")
+            return False
+        except Exception as e:
+            printc(f"[WARN] Failed to submit {len(batch)} score(s): {e}", color="yellow")
+            return False
+
+        if not response or not response.data:
+            printc(f"[WARN] Error adding {len(batch)} score(s).", color="yellow")
+            return False
+
+        self.num_sent += len(batch)
+        clear_cached_pages()  # leaderboard pages might have changed
+        return True
+
+    def _claim_batch(self) -> list[dict]:
+        """ Removes the oldest scores from the unsent scores file, so no other process sends them as well. """
+        with file_lock(self.lock_file):
+            unsent = self._load_unsent()
+            if unsent:
+                self._save_unsent(unsent[self.BATCH_SIZE:])
+        return unsent[:self.BATCH_SIZE]
+
+    def _unclaim_batch(self, batch: list[dict]) -> None:
+        """ Puts a batch that couldn't be sent back to the start of the unsent scores file. """
+        with file_lock(self.lock_file):
+            self._save_unsent(batch + self._load_unsent())
+
+    def _save_pending(self) -> None:
+        """ Moves the submitted scores to the unsent scores file. """
+        with self.condition:
+            pending, self.pending = self.pending, []
+        if pending:
+            with file_lock(self.lock_file):
+                self._save_unsent(self._load_unsent() + pending)
+
+    def _load_unsent(self) -> list[dict]:
+        """ Must be called while holding the file lock. """
+        try:
+            return self.load_file(self.unsent_scores_file, default=[])
+        except ValueError as e:  # not valid JSON (or UTF-8)
+            printc(f"[WARN] Unsent scores file is corrupted, ignoring it: {e}", color="orange")
+            return []
+
+    def _save_unsent(self, unsent: list[dict]) -> None:
+        """ Must be called while holding the file lock. """
+        if not unsent:
+            self.delete_file(self.unsent_scores_file)
+            return
+        # write to a temporary file first, so a process killed while saving doesn't leave a truncated file behind
+        tmp_file = f"{self.unsent_scores_file}.tmp"
+        self.save_file(tmp_file, unsent)
+        os.replace(self.directory / tmp_file, self.directory / self.unsent_scores_file)
+
+
+score_submitter = ScoreSubmitter()
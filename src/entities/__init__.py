@@ -3,7 +3,7 @@ from .entity import Entity
 from .floor import Floor
 from .game_over import GameOver
 from .inventory import Inventory
-from .items import ItemName, SpawnedItem, ItemManager, ItemInitializer
+from .items import ItemName, SpawnedItem, ItemManager, ItemInitializer, BulletBroadPhase
 from .menus import MenuManager, MainMenu
 from .pipe import Pipes
 from .player import Player, PlayerMode
@@ -34,7 +34,16 @@ class AttributeBar(Entity):
         if self.color[3] != self.bg_color[3]:
             printc("The alpha channel of bg_color will be ignored. "
                    "Current implementation uses the alpha channel of 'color' for the entire bar.", color="yellow")
-        self.update_bar_surface()
+        # the surface is created once and redrawn (lazily, in draw()) only when the value has changed since the last
+        # draw, so nothing is allocated or drawn when the value changes, and nothing at all in sim mode (no drawing)
+        self.needs_redraw = True
+
+    def __getstate__(self) -> dict:
+        # the surface is redrawn from the current value anyway, so it's left out of snapshots (see replays/snapshot.py)
+        state = self.__dict__.copy()
+        state['image'] = None
+        state['needs_redraw'] = True
+        return state
 
     def change_value_by(self, amount: int) -> None:
         """
@@ -49,7 +58,7 @@ class AttributeBar(Entity):
         self.current_value = pygame.math.clamp(self.current_value, 0, self.max_value)
 
         if previous_value != self.current_value:
-            self.update_bar_surface()
+            self.needs_redraw = True
 
     def set_value(self, value) -> None:
         if value == self.current_value:
@@ -58,7 +67,7 @@ class AttributeBar(Entity):
         self.current_value = pygame.math.clamp(value, 0, self.max_value)
 
         if previous_value != self.current_value:
-            self.update_bar_surface()
+            self.needs_redraw = True
 
     def is_empty(self) -> bool:
         return self.current_value <= 0
@@ -67,14 +76,20 @@ class AttributeBar(Entity):
         if self.gsm.get_state() == GameState.START:
             return
 
+        if self.needs_redraw:
+            self.update_bar_surface()
         super().draw()
 
     def update_bar_surface(self) -> None:
         value_ratio = self.current_value / self.max_value
         current_width = int(self.w * value_ratio)
 
-        self.image = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
-        self.image.set_alpha(self.color[3])
+        if self.image is None:
+            self.image = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
+            self.image.set_alpha(self.color[3])
 
-        pygame.draw.rect(self.image, self.bg_color, (0, 0, self.w, self.h))
-        pygame.draw.rect(self.image, self.color, (0, 0, current_width, self.h))
+        self.image.fill(self.bg_color)
+        if current_width > 0:
+            self.image.fill(self.color, (0, 0, current_width, self.h))
+        self.needs_redraw = False
+        self.config.render_queue.mark_dirty(self.rect)
@@ -111,9 +111,11 @@ class CloudSkimmer(Enemy):
         Draws the ghost's eyes on the screen.
         The vertical offset is interpolated based on gun rotation.
         """
+        if not self.config.render:
+            return
         max_offset = 5
         vertical_offset = (self.gun_rotation / 60) * max_offset
-        self.config.screen.blit(self.eyes, (self.x, self.y + vertical_offset))
+        self.config.render_queue.blit(self.eyes, (self.x, self.y + vertical_offset))
 
 
 class CloudSkimmerGroup(EnemyGroup):
@@ -9,6 +9,9 @@ class EnemyManager:
     def __init__(self, config: GameConfig, env):
         self.config = config
         self.env = env
+        self.reset()
+
+    def reset(self) -> None:
         self.spawned_enemy_groups = []  # [WARN]: Most parts of the codebase expect this list to contain max one group at a time.
         self.wait = random.randint(240, 420)
         self.group_to_spawn = self.spawn_skydart
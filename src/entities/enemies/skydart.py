@@ -6,7 +6,7 @@ import numpy as np
 import pygame
 
 from src.entities import Player, ItemName
-from src.utils import GameConfig, Animation
+from src.utils import GameConfig, Animation, rotation_cache
 from .enemy import Enemy, EnemyGroup
 
 
@@ -72,7 +72,7 @@ class SkyDart(Enemy):
         super().tick()
 
     def draw(self) -> None:
-        self.config.screen.blit(pygame.transform.rotate(self.image, self.rotation), self.rect)
+        self.config.render_queue.blit(rotation_cache.rotate(self.image, self.rotation), self.rect)
 
     def stop_advancing(self) -> None:
         self.vel_x = 0
@@ -50,17 +50,20 @@ class Entity:
         return pixel_collision(self.rect, other.rect, self.hit_mask, other.hit_mask)
 
     def tick(self) -> None:
+        if not self.config.render:
+            return
         self.draw()
         if self.config.debug:
             self.debug_draw()
 
     def draw(self) -> None:
         if self.image:
-            self.config.screen.blit(self.image, self.rect)
+            self.config.render_queue.blit(self.image, self.rect)
 
     def debug_draw(self) -> None:
         rect = self.rect
-        pygame.draw.rect(self.config.screen, (255, 0, 0), rect, 1)
+        screen = self.config.render_queue.draw_directly()
+        pygame.draw.rect(screen, (255, 0, 0), rect, 1)
         # write x and y at top of rect
         font = pygame.font.SysFont("Arial", 14, True)
         text = font.render(
@@ -68,7 +71,7 @@ class Entity:
             True,
             (255, 255, 255),
         )
-        self.config.screen.blit(
+        screen.blit(
             text,
             (
                 rect.x + rect.w / 2 - text.get_width() / 2,
@@ -5,8 +5,12 @@ from .entity import Entity
 class Floor(Entity):
     def __init__(self, config: GameConfig) -> None:
         super().__init__(config, config.images.floor, 0, config.window.viewport_height)
-        self.vel_x = 7.5
         self.x_extra = self.w - config.window.width
+        self.reset()
+
+    def reset(self) -> None:
+        self.x = 0
+        self.vel_x = 7.5
 
     def stop(self) -> None:
         self.vel_x = 0
@@ -29,7 +29,7 @@ class InventorySlot(Entity):
             cooldown_overlay, cd_height = self.create_cooldown_overlay()
             blit_list.insert(2, (cooldown_overlay, (self.rect.x + 5, self.rect.y + self.rect.height - cd_height - 10)))
 
-        self.config.screen.blits(blit_list)
+        self.config.render_queue.blits(blit_list)
 
         if self.item.item_name != ItemName.EMPTY:
             text_surface = flappy_text(text=str(self.item.quantity), font=self.font, outline_width=4, outline_algorithm=4)
@@ -39,7 +39,7 @@ class InventorySlot(Entity):
             text_rect.x = self.x - text_width / 1.6 + 92
             text_rect.y = self.y + 66
 
-            self.config.screen.blit(text_surface, text_rect)
+            self.config.render_queue.blit(text_surface, text_rect)
 
     def create_cooldown_overlay(self) -> tuple[pygame.Surface, int]:
         height = int((self.rect.height - 15) * (self.item.remaining_cooldown / self.item.total_cooldown))
@@ -49,36 +49,45 @@ class InventorySlot(Entity):
 
 
 class Inventory(Entity):
+    DEFAULT_ITEM_TYPES = [
+        ItemType.EMPTY_WEAPON,
+        ItemType.EMPTY_AMMO,
+        ItemType.EMPTY_FOOD,
+        ItemType.EMPTY_POTION,
+        ItemType.EMPTY_HEAL,
+        ItemType.EMPTY_SPECIAL
+    ]
+
     def __init__(self, config: GameConfig, player, env) -> None:
         super().__init__(config)
         self.inventory_slots: List[InventorySlot] = []
         self.item_initializer = ItemInitializer(config=config, env=env, entity=player)
+        self.empty_item = self.item_initializer.init_item(ItemName.EMPTY)  # shared by all empty slots, it has no state
         self.create_inventory_slots()
-        self.empty_item = self.item_initializer.init_item(ItemName.EMPTY)
+        self.reset(player)
         # self.inventory_slots[0].item = self.item_initializer.init_item(ItemName.WEAPON_AK47)
         # self.inventory_slots[0].item.quantity = 1000
 
     def create_inventory_slots(self) -> None:
-        num_slots = 6
+        num_slots = len(self.DEFAULT_ITEM_TYPES)
         slot_width = (self.config.window.width - 21) / num_slots
         slot_height = self.config.window.viewport_height + 50
 
-        default_item_types = [
-            ItemType.EMPTY_WEAPON,
-            ItemType.EMPTY_AMMO,
-            ItemType.EMPTY_FOOD,
-            ItemType.EMPTY_POTION,
-            ItemType.EMPTY_HEAL,
-            ItemType.EMPTY_SPECIAL
-        ]
-
         for i in range(num_slots):
             x = 24 + i * slot_width
             slot = InventorySlot(self.config, self.config.images.user_interface['inventory-slot'], x=x, y=slot_height)
-            slot.item = self.item_initializer.init_item(ItemName.EMPTY)
-            slot.type = default_item_types[i]  # set the item type for the slot
             self.inventory_slots.append(slot)
 
+    def reset(self, player) -> None:
+        """
+        Empties the inventory for a new game, the slots are reused.
+        :param player: player of the new game, the items will belong to it
+        """
+        self.item_initializer.entity = player
+        for slot, item_type in zip(self.inventory_slots, self.DEFAULT_ITEM_TYPES):
+            slot.item = self.empty_item
+            slot.type = item_type  # set the item type for the slot
+
     def tick(self) -> None:
         for slot in self.inventory_slots:
             slot.tick()
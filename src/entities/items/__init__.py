@@ -2,4 +2,4 @@ from .item_enums import ItemType, ItemName
 from .item import Item, SpawnedItem
 from .item_manager import ItemManager
 from .item_initializer import ItemInitializer
-from .weapons import Gun
+from .weapons import Gun, BulletBroadPhase
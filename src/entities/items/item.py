@@ -1,10 +1,8 @@
 import math
 import random
 
-import pygame
-
 from src.entities.entity import Entity
-from src.utils import GameConfig
+from src.utils import GameConfig, rotation_cache
 from .item_enums import ItemName, ItemType
 
 
@@ -21,11 +19,7 @@ class SpawnedItem(Entity):
         self.frequency = random.uniform(0.005, 0.009)  # oscillation frequency
         self.sin_y = random.uniform(-self.amplitude, self.amplitude)  # initial relative vertical position
 
-        if f"{self.item_name.value}_small" in self.config.images.items:
-            self.item_image = self.config.images.items[f"{self.item_name.value}_small"]
-        else:
-            item_img = self.config.images.items[self.item_name.value]
-            self.item_image = pygame.transform.scale(item_img, (56, 56))
+        self.item_image = self.config.images.items[f"{self.item_name.value}_small"]
 
         self.item_img_x: int = (self.h - 56) // 2
         self.item_img_y: int = (self.w - 56) // 2
@@ -40,10 +34,10 @@ class SpawnedItem(Entity):
         # draw the item image
         item_x = self.rect.x + self.item_img_x
         item_y = self.rect.y + self.item_img_y
-        self.config.screen.blit(self.item_image, (item_x, item_y))
+        self.config.render_queue.blit(self.item_image, (item_x, item_y))
 
         # draw the bubble
-        self.config.screen.blit(self.image, self.rect)
+        self.config.render_queue.blit(self.image, self.rect)
 
     def stop(self) -> None:
         self.vel_x = 0
@@ -110,7 +104,7 @@ class Item(Entity):
 
     def flip(self) -> None:
         self.flipped = not self.flipped
-        self.image = pygame.transform.flip(self.image, True, False)
+        self.image = rotation_cache.flip(self.image)
 
     def stop(self) -> None:
         raise NotImplementedError("stop() method must be implemented in the subclass")
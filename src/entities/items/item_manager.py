@@ -14,6 +14,9 @@ class ItemManager:
         self.config = config
         self.inventory = inventory
         self.pipes = pipes
+        self.reset()
+
+    def reset(self) -> None:
         self.spawned_items: List[SpawnedItem] = []
         self.spawn_cooldown: int = 150  # self.config.fps * 5 <-- we don't want it tied to the fps
         self.stopped = False
@@ -3,4 +3,4 @@ from .AK47 import AK47
 from .Deagle import Deagle
 from .Uzi import Uzi
 
-from .ammo import AmmoBox, BigBullet, MediumBullet, SmallBullet
+from .ammo import AmmoBox, BigBullet, MediumBullet, SmallBullet, BulletBroadPhase
@@ -2,3 +2,4 @@ from .ammo_box import AmmoBox
 from .big_bullet import BigBullet
 from .medium_bullet import MediumBullet
 from .small_bullet import SmallBullet
+from .bullet_broad_phase import BulletBroadPhase
@@ -4,6 +4,7 @@ from typing import Callable, Union, Optional
 import pygame
 
 from src.entities.items import Item, ItemType
+from src.utils import rotation_cache
 
 # TODO Simple collision animation/explosion when colliding with objects.
 
@@ -114,13 +115,14 @@ class Bullet(Item):
         self.original_image = self.image
         self.original_image_dimensions = pygame.Vector2(self.image.get_width(), self.image.get_height())
         self.velocity = self.calculate_velocity()
-        self.update_image(pygame.transform.rotate(self.image, angle))
+        self.update_image(self.get_rotated_image())
 
         self.bounced: bool = False
         self.stopped: bool = False
         self.pipes = []
         self.enemies = []
         self.player = None
+        self.broad_phase = env.bullet_broad_phase if env else None
         self.item_manager = env.item_manager if env else None
         self.hit_entity: Optional[str] = None  # the entity the bullet hit
         self.frame: int = 0
@@ -151,10 +153,9 @@ class Bullet(Item):
         self.curr_front_pos: pygame.Vector2 = self.prev_front_pos
 
     def flip(self):
-        self.update_image(self.original_image)
-        super().flip()
-        self.original_image = self.image
-        self.update_image(pygame.transform.rotate(self.original_image, self.angle))
+        self.flipped = not self.flipped
+        self.original_image = rotation_cache.flip(self.original_image)
+        self.update_image(self.get_rotated_image())
         self.speed = -self.speed
         self.velocity = self.calculate_velocity()
         self.spawn_pos_offset.x = -self.spawn_pos_offset.x
@@ -162,11 +163,10 @@ class Bullet(Item):
     def set_entities(self):
         # yeah uhm... spaghetti at its finest having this here aha... ha ha but like IT WORKS OKAY??
         # AND THERE IS NO 1 FRAME DELAY LIKE BEFORE, MKEY??
-        spawned_enemies = []
-        for enemy_group in self.env.enemy_manager.spawned_enemy_groups:
-            spawned_enemies.extend(enemy_group.members)
-        self.pipes = self.env.pipes.upper + self.env.pipes.lower
-        self.enemies = spawned_enemies
+        # The pipe & enemy lists are shared by all bullets and only rebuilt when the game state changes.
+        self.broad_phase.update()
+        self.pipes = self.broad_phase.pipes
+        self.enemies = self.broad_phase.enemies
         self.player = self.env.player
 
     def tick(self) -> None:
@@ -189,11 +189,11 @@ class Bullet(Item):
         super().tick()
 
     def draw(self) -> None:
-        self.config.screen.blit(self.image, self.rect)
+        self.config.render_queue.blit(self.image, self.rect)
 
     def debug_draw(self) -> None:
         # rename big-bullet_debug.png to big-bullet.png to see the debug drawing
-        screen = self.config.screen
+        screen = self.config.render_queue.draw_directly()
         for pipe in self.pipes:
             pygame.draw.circle(screen, (255, 211, 0), (pipe.x, pipe.y), 10, width=4)
             pygame.draw.circle(screen, (255, 211, 0), (pipe.x + pipe.w, pipe.y), 10, width=4)
@@ -290,7 +290,7 @@ class Bullet(Item):
         #  Nah, that would let enemies fire through pipes which would be too difficult to dodge and
         #  trickshotting would be ruined — let's not implement gambling mechanics just yet...
         # bounce the bullet if it hits a pipe for the first time
-        for pipe in self.pipes if not self.bounced else []:
+        for pipe in self.broad_phase.get_nearby_pipes(self) if not self.bounced else []:
             if not self.collide(pipe):
                 continue
 
@@ -299,7 +299,10 @@ class Bullet(Item):
                 return
 
         # handle hitting enemies
+        left, right = self.x - self.broad_phase.PADDING, self.x + self.w + self.broad_phase.PADDING
         for enemy in self.enemies:
+            if enemy.x > right or enemy.x + enemy.w < left:  # quick check, so we don't do a pixel collision for far away enemies
+                continue
             if not self.collide(enemy):
                 continue
             if enemy == self.entity and not self.bounced:  # the enemy can't hit itself unless the bullet bounces
@@ -418,7 +421,11 @@ class Bullet(Item):
             self.velocity.y = -self.velocity.y
             self.velocity.y *= 0.9  # apply restitution factor to reduce speed after bouncing
 
-        self.update_image(pygame.transform.rotate(self.original_image, self.angle))
+        self.update_image(self.get_rotated_image())
+
+    def get_rotated_image(self) -> pygame.Surface:
+        # exact angle, as the rotated image's size affects the bullet's position & collisions
+        return rotation_cache.rotate(self.original_image, self.angle, angle_step=None)
 
     def is_pipe_corner_hit(self, pipe, tolerance=3.0) -> bool:
         # figure out which corner of the pipe was possibly hit
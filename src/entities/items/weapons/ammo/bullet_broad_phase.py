@@ -0,0 +1,114 @@
+from bisect import bisect_left, bisect_right
+
+
+class BulletBroadPhase:
+    """
+    Per-frame broad-phase for bullet collisions, shared by all bullets in the game environment.
+
+    Instead of every bullet collecting all pipes & enemies and testing against each of them every frame,
+    the pipes are sorted by their x position once per frame, so each bullet only has to (precisely) test
+    the pipes that overlap its own bounding box.
+    The index rebuilds itself whenever the pipes move or change (once per frame, or never while they're stopped),
+    so it doesn't matter which entity ticks first or whether a frame has any bullets at all.
+
+    Enemies aren't put into the index, as there are at most a few of them and they move in the middle of
+    the frame (while other bullets are ticking), so bullets check them using their live positions instead.
+    """
+    PADDING = 2  # extra pixels around bounding boxes, so float -> int rect rounding can't make us miss a collision
+
+    def __init__(self, env):
+        self.env = env
+        self.pipes = []  # upper + lower pipes, same order as before (upper pipes first)
+        self.enemies = []  # members of all spawned enemy groups
+
+        # pipe index, sorted by pipes' left x
+        self._left_xs: list[float] = []
+        self._boxes: list[tuple[float, float, float, int]] = []  # (right x, top y, bottom y, index in self.pipes)
+        self._max_pipe_w: float = 0
+
+        # what the index was built from, so we know when it has to be rebuilt
+        self._pipes_obj = None
+        self._upper = None
+        self._lower = None
+        self._num_pipes: int = 0
+        self._first_pipe = None
+        self._first_pipe_x: float = 0
+        self._enemy_groups: list[tuple] = []  # (group, number of members)
+
+    def update(self) -> None:
+        """
+        Rebuilds the pipe index and/or the enemy list, if the game state changed since they were last built.
+        Cheap to call multiple times per frame - every bullet calls it when it ticks.
+        """
+        if self._pipes_changed():
+            self._build_pipe_index()
+        if self._enemies_changed():
+            self._build_enemy_list()
+
+    def get_nearby_pipes(self, bullet) -> list:
+        """
+        Returns the pipes whose bounding box overlaps with the bullet's bounding box,
+        in the same order as they appear in self.pipes.
+        """
+        pad = self.PADDING
+        left, right = bullet.x - pad, bullet.x + bullet.w + pad
+        top, bottom = bullet.y - pad, bullet.y + bullet.h + pad
+
+        # only pipes with left x in [left - widest pipe, right] can overlap the bullet horizontally
+        start = bisect_left(self._left_xs, left - self._max_pipe_w)
+        end = bisect_right(self._left_xs, right)
+        indices = [
+            index for right_x, top_y, bottom_y, index in self._boxes[start:end]
+            if right_x >= left and top_y <= bottom and bottom_y >= top
+        ]
+        if len(indices) > 1:
+            indices.sort()
+        return [self.pipes[i] for i in indices]
+
+    def _pipes_changed(self) -> bool:
+        pipes = self.env.pipes
+        if pipes is not self._pipes_obj or pipes.upper is not self._upper or pipes.lower is not self._lower:
+            return True
+        if len(pipes.upper) + len(pipes.lower) != self._num_pipes:
+            return True
+        if not pipes.upper:
+            return False
+        # all pipes move together, so checking the first one is enough
+        first_pipe = pipes.upper[0]
+        return first_pipe is not self._first_pipe or first_pipe.x != self._first_pipe_x
+
+    def _build_pipe_index(self) -> None:
+        pipes = self.env.pipes
+        self._pipes_obj = pipes
+        self._upper = pipes.upper
+        self._lower = pipes.lower
+        # new list every time (instead of clearing the old one), as bullets keep a reference to it
+        self.pipes = pipes.upper + pipes.lower
+        self._num_pipes = len(self.pipes)
+        self._first_pipe = pipes.upper[0] if pipes.upper else None
+        self._first_pipe_x = self._first_pipe.x if self._first_pipe else 0
+
+        pad = self.PADDING
+        order = sorted(range(len(self.pipes)), key=lambda i: self.pipes[i].x)
+        self._left_xs = [self.pipes[i].x - pad for i in order]
+        self._boxes = [
+            (self.pipes[i].x + self.pipes[i].w + pad, self.pipes[i].y - pad, self.pipes[i].y + self.pipes[i].h + pad, i)
+            for i in order
+        ]
+        self._max_pipe_w = max((pipe.w + 2 * pad for pipe in self.pipes), default=0)
+
+    def _enemies_changed(self) -> bool:
+        groups = self.env.enemy_manager.spawned_enemy_groups
+        if len(groups) != len(self._enemy_groups):
+            return True
+        # enemies only get removed from groups (never added after spawning), so the member count tells us everything
+        for group, (prev_group, num_members) in zip(groups, self._enemy_groups):
+            if group is not prev_group or len(group.members) != num_members:
+                return True
+        return False
+
+    def _build_enemy_list(self) -> None:
+        groups = self.env.enemy_manager.spawned_enemy_groups
+        self._enemy_groups = [(group, len(group.members)) for group in groups]
+        # new list every time (instead of clearing the old one), as bullets keep a reference to it
+        self.enemies = [enemy for group in groups for enemy in group.members]
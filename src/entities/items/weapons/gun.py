@@ -99,11 +99,11 @@ class Gun(Item):
     def draw(self) -> None:
         pivot_point = pygame.Vector2(self.x + self.pivot.x, self.y + self.pivot.y)
         rotated_image, rotated_rect = rotate_on_pivot(self.image, self.rotation, pivot_point, self.rect.center)
-        self.config.screen.blit(rotated_image, rotated_rect)
+        self.config.render_queue.blit(rotated_image, rotated_rect)
 
     def debug_draw(self) -> None:
         RED = (255, 0, 0); GREEN = (0, 255, 0); BLUE = (0, 0, 255); BLACK = (0, 0, 0)
-        screen = self.config.screen
+        screen = self.config.render_queue.draw_directly()
         pygame.draw.circle(screen, RED, self.calculate_initial_bullet_position(), 8, width=4)
         pygame.draw.circle(screen, BLACK, (self.x + self.barrel_end_pos.x, self.y + self.barrel_end_pos.y), 6, width=3)
         pygame.draw.circle(screen, GREEN, (self.x + self.pivot.x, self.y + self.pivot.y), 4)
@@ -256,10 +256,11 @@ class Gun(Item):
             entity=self.entity
         )
         self.shot_bullets.add(bullet)
-        bullet.draw()  # don't tick() the bullet yet, it will be ticked in the next frame, just draw it for now
+        if self.config.render:
+            bullet.draw()  # don't tick() the bullet yet, it will be ticked in the next frame, just draw it for now
         bullet.handle_collision()  # handle collision immediately (to set pipe_to_ignore if bullet spawns above a pipe)
         bullet.frame += 1  # increment the frame cuz frame 0 has been processed, bullet drawn and collision handled 👍
-        if self.config.debug:
+        if self.config.debug and self.config.render:
             bullet.debug_draw()
 
     def set_recoil(self, distance: int, duration: int, rotation: int) -> None:
@@ -39,7 +39,7 @@ class Button(Entity):
         text_surface = flappy_text(text=self.label, font=self.font, text_color=text_color,
                                    outline_color=(0, 0, 0), outline_width=self.outline_width, shadow_distance=self.shadow_distance)
         text_rect = text_surface.get_rect(center=(self.x  + self.w // 2, self.y + self.h // 2))
-        self.config.screen.blit(text_surface, text_rect)
+        self.config.render_queue.blit(text_surface, text_rect)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and self.hovered:
@@ -57,3 +57,4 @@ class Button(Entity):
 
     def change_background_color(self, color):
         self.image.fill(color)
+        self.config.render_queue.mark_dirty(self.rect)
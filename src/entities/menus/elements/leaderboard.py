@@ -1,16 +1,35 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
 import pygame
 
-from src.utils import GameConfig, Fonts, get_font
+from src.utils import GameConfig, Fonts, get_font, render_text
 from src.entities.entity import Entity
 
 
 class Leaderboard(Entity):
+    """
+    Only the visible rows get drawn, and each row is rendered to its own Surface once and then reused (until the data
+    changes), so scrolling costs the same no matter how many rows are loaded.
+
+    The data is usually fetched in a background thread, so set_data() only hands it over - it's applied on the main
+    thread at the start of the next draw(), and the row cache is only ever touched by the main thread.
+    """
+    ROW_RENDER_MARGIN = 3  # number of rows above & below the visible ones that get rendered ahead of time
+    ROW_CACHE_SIZE = 100  # max number of cached row surfaces
+    LOAD_MORE_MARGIN = 30  # number of rows before the end of the data, at which on_near_end gets called
+
     def __init__(self, config: GameConfig, x=0, y=0, width=300, height=300, data: list[dict] = None, column_info: dict = None):
         super().__init__(config=config, x=x, y=y, w=width, h=height)
         column_info = column_info or {}
         data = data or []
         self.data = data
         self.column_info = column_info
+        self.rows = self.get_rows()
+        self.pending_data: tuple[list[dict], dict] = None  # (data, column info) set by set_data(), applied in draw()
+        self.pending_data_lock = threading.Lock()
+        self.on_near_end: Optional[Callable[[], None]] = None  # called when scrolled near the end, to load more data
 
         self.font = get_font(Fonts.FONT_FLAPPY, 24)
         self.header_height = 38
@@ -38,6 +57,8 @@ class Leaderboard(Entity):
 
         # Leaderboard surface
         self.surface = pygame.Surface((width, height))
+        self.header_surface: pygame.Surface = None
+        self.row_surfaces: OrderedDict[int, pygame.Surface] = OrderedDict()  # row index -> rendered row
 
     def tick(self):
         self.update_smooth_scroll()
@@ -45,36 +66,71 @@ class Leaderboard(Entity):
 
     def draw(self):
         super().draw()
+        self.apply_pending_data()
         self.surface.fill(self.bg_color)
 
         # Draw the header
-        current_x = 0
-        for column, info in self.column_info.items():
-            header_text = self.font.render(info['label'], True, self.text_color)
-            self.surface.blit(header_text, (current_x + 10, ((self.header_height - header_text.get_height()) // 2) + 1))
-            current_x += self.column_widths[column]
+        if self.header_surface is None:
+            self.header_surface = self.render_header()
+        self.surface.blit(self.header_surface, (0, 0))
 
-        # Draw the rows
+        # Draw the visible rows
+        rows = self.rows
         start_y = self.header_height - self.scroll_offset
-        extra_entry = [{column: "\\" for column in self.column_info.keys()}] if len(self.data) == 0 else []
-        for index, entry in enumerate(self.data + extra_entry):
+        first_visible = max(0, self.scroll_offset // self.row_height)
+        num_visible = (self.h - self.header_height) // self.row_height + 1
+        for index in range(first_visible, min(first_visible + num_visible + 1, len(rows))):
             row_y = start_y + index * self.row_height
             if not (self.header_height <= row_y < self.h):
                 continue
+            self.surface.blit(self.get_row_surface(index, rows[index]), (0, row_y))
 
-            row_color = self.highlight_color if index % 2 == 0 else self.row_color
-            pygame.draw.rect(self.surface, row_color, (0, row_y, self.w, self.row_height))
+        if self.on_near_end is not None and first_visible + num_visible + self.LOAD_MORE_MARGIN >= len(self.data):
+            self.on_near_end()
 
-            # Draw each column
-            current_x = 0
-            for column in self.column_info.keys():
-                column_width = self.column_widths[column]
-                text = self.font.render(str(entry[column]), True, self.text_color)
-                text_x = current_x + 10
-                self.surface.blit(text, (text_x, row_y + 4))
-                current_x += column_width
+        # Render the rows just outside the view, so they're ready when scrolling
+        for index in (*range(max(0, first_visible - self.ROW_RENDER_MARGIN), min(first_visible, len(rows))),
+                      *range(first_visible + num_visible, min(first_visible + num_visible + self.ROW_RENDER_MARGIN, len(rows)))):
+            self.get_row_surface(index, rows[index])
 
-        self.config.screen.blit(self.surface, (self.x, self.y))
+        # the same surface is redrawn every frame, so the render queue can't tell whether it changed
+        self.config.render_queue.mark_dirty((self.x, self.y, self.w, self.h))
+        self.config.render_queue.blit(self.surface, (self.x, self.y))
+
+    def render_header(self) -> pygame.Surface:
+        surface = pygame.Surface((self.w, self.header_height))
+        surface.fill(self.bg_color)
+        current_x = 0
+        for column, info in self.column_info.items():
+            header_text = render_text(info['label'], self.font, self.text_color)
+            surface.blit(header_text, (current_x + 10, ((self.header_height - header_text.get_height()) // 2) + 1))
+            current_x += self.column_widths[column]
+        return surface
+
+    def get_row_surface(self, index: int, entry: dict) -> pygame.Surface:
+        """ Returns the rendered row, rendering it only if it isn't cached yet. """
+        row_surface = self.row_surfaces.get(index)
+        if row_surface is not None:
+            self.row_surfaces.move_to_end(index)
+            return row_surface
+
+        row_surface = self.render_row(index, entry)
+        self.row_surfaces[index] = row_surface
+        if len(self.row_surfaces) > self.ROW_CACHE_SIZE:
+            self.row_surfaces.popitem(last=False)
+        return row_surface
+
+    def render_row(self, index: int, entry: dict) -> pygame.Surface:
+        row_surface = pygame.Surface((self.w, self.row_height))
+        row_surface.fill(self.highlight_color if index % 2 == 0 else self.row_color)
+
+        # Draw each column
+        current_x = 0
+        for column in self.column_info.keys():
+            text = render_text(str(entry[column]), self.font, self.text_color)
+            row_surface.blit(text, (current_x + 10, 4))
+            current_x += self.column_widths[column]
+        return row_surface
 
     def handle_event(self, event):
         """ Handles scrolling and click&drag events for the leaderboard. """
@@ -123,14 +179,30 @@ class Leaderboard(Entity):
         self.scroll_velocity = 0
 
     def set_data(self, data, column_info=None):
-        """ Updates the leaderboard data and column info. """
-        self.data = data
+        """ Updates the leaderboard data and column info. Can be called from any thread, see the class docstring. """
+        with self.pending_data_lock:
+            self.pending_data = (data, column_info)
+
+    def apply_pending_data(self):
+        with self.pending_data_lock:
+            pending_data, self.pending_data = self.pending_data, None
+        if pending_data is None:
+            return
+
+        self.data, column_info = pending_data
         if column_info is not None:
             self.column_info = column_info
             self.column_widths = self.compute_column_widths()
+            self.header_surface = None
+        self.rows = self.get_rows()
+        self.row_surfaces.clear()
         # Update the maximum scroll offset based on the new data
         self.max_scroll_offset = max(0, ((len(self.data) - (self.h - self.header_height) // self.row_height) * self.row_height))
 
+    def get_rows(self) -> list[dict]:
+        """ Rows to draw - the data, or a placeholder row if there's no data (cached like any other row). """
+        return self.data if len(self.data) > 0 else [{column: "\\" for column in self.column_info.keys()}]
+
     def compute_column_widths(self):
         """ Computes the width of each column based on the column weights. """
         total_weight = sum(info["weight"] for info in self.column_info.values())
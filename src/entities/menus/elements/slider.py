@@ -33,7 +33,7 @@ class Slider(Entity):
         bar_surface = pygame.Surface((self.w, self.bar_height), pygame.SRCALPHA)
         bar_surface.fill(self.bar_color)
         combined_surface = apply_outline_and_shadow(bar_surface, outline_width=3, shadow_distance=(3, 3))
-        self.config.screen.blit(combined_surface, (self.x, self.y))
+        self.config.render_queue.blit(combined_surface, (self.x, self.y))
 
         # Draw the handle
         handle_x = self.x + int((self.value - self.min_value) / (self.max_value - self.min_value) * self.w)
@@ -41,13 +41,13 @@ class Slider(Entity):
         handle_surface = pygame.Surface((self.handle_width, self.handle_height), pygame.SRCALPHA)
         handle_surface.fill(self.handle_color)
         combined_handle_surface = apply_outline_and_shadow(handle_surface, outline_algorithm=0, outline_width=3, shadow_distance=(3, 3))
-        self.config.screen.blit(combined_handle_surface, (handle_x - self.handle_width // 2, handle_y))
+        self.config.render_queue.blit(combined_handle_surface, (handle_x - self.handle_width // 2, handle_y))
 
         # Draw the label
         text_surface = flappy_text(text=f"{self.label}: {self.value}", font=self.font, text_color=(255, 255, 255),
                                    outline_color=(0, 0, 0), outline_width=3, shadow_distance=(3, 3))
         text_rect = text_surface.get_rect(topleft=(self.x, self.y - 47))
-        self.config.screen.blit(text_surface, text_rect)
+        self.config.render_queue.blit(text_surface, text_rect)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -49,7 +49,7 @@ class Tabs(Entity):
         # Draw the bottom line
         line = pygame.Surface((self.w, 10))
         line.fill((83, 56, 71))
-        self.config.screen.blit(line, (self.x, self.y + self.h - 100))  # -100 is hardcoded and not always correct
+        self.config.render_queue.blit(line, (self.x, self.y + self.h - 100))  # -100 is hardcoded and not always correct
 
     def switch_tab(self, tab_name: str):
         if self.current_tab == tab_name:
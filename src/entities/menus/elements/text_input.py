@@ -44,25 +44,25 @@ class TextInput(Entity):
         # Draw the background
         bg_surface = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
         bg_surface.fill(self.background_color_focused if self.focused else self.background_color_unfocused)
-        self.config.screen.blit(apply_outline_and_shadow(bg_surface, outline_width=OUTLINE_WIDTH, shadow_distance=(3, 3)), (self.x, self.y))
+        self.config.render_queue.blit(apply_outline_and_shadow(bg_surface, outline_width=OUTLINE_WIDTH, shadow_distance=(3, 3)), (self.x, self.y))
 
         # Draw the text
         input_surface = self.font.render(self.text, True, self.text_color)
         text_rect = input_surface.get_rect(midleft=(self.x + 10, self.y + self.h // 2 + OUTLINE_WIDTH))
-        self.config.screen.blit(input_surface, text_rect)
+        self.config.render_queue.blit(input_surface, text_rect)
 
         # Draw blinking cursor if focused
         if self.focused and self.cursor_visible:
             cursor_x = text_rect.right
             cursor_y = text_rect.bottom - 10
             cursor_width = int(self.font_size * 0.5)
-            pygame.draw.line(self.config.screen, self.text_color, (cursor_x, cursor_y), (cursor_x + cursor_width, cursor_y), int(self.font_size * 0.2) or 1)
+            pygame.draw.line(self.config.render_queue.draw_directly(), self.text_color, (cursor_x, cursor_y), (cursor_x + cursor_width, cursor_y), int(self.font_size * 0.2) or 1)
 
         # Draw the label
         text_surface = flappy_text(text=self.label, font=self.label_font, text_color=(255, 255, 255),
                                    outline_color=(0, 0, 0), outline_width=3, shadow_distance=(3, 3))
         text_rect = text_surface.get_rect(topleft=(self.x, self.y - 47))
-        self.config.screen.blit(text_surface, text_rect)
+        self.config.render_queue.blit(text_surface, text_rect)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
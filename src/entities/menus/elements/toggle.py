@@ -33,13 +33,14 @@ class Toggle(Entity):
         super().tick()
 
     def draw(self):
-        super().draw()
-
-        # Draw the toggle background
+        # Draw the toggle background (fill it before it's queued, as it's only blitted at the end of the frame)
         bg_color = (200, 210, 180) if self.state else (220, 190, 180)
         self.image.fill(bg_color)
+        self.config.render_queue.mark_dirty(self.rect)
+        super().draw()
+
         combined_surface = apply_outline_and_shadow(self.image, outline_width=3, shadow_distance=(3, 3))
-        self.config.screen.blit(combined_surface, (self.x, self.y))
+        self.config.render_queue.blit(combined_surface, (self.x, self.y))
 
         # Draw the toggle switch
         switch_color = (156, 230, 89) if self.state else (251, 56, 3)
@@ -49,13 +50,13 @@ class Toggle(Entity):
         switch_surface = pygame.Surface((switch_width, switch_height), pygame.SRCALPHA)
         switch_surface.fill(switch_color)
         combined_switch_surface = apply_outline_and_shadow(switch_surface, outline_width=3, shadow_distance=(1, 1))
-        self.config.screen.blit(combined_switch_surface, (switch_x + (self.h - switch_width) // 2, self.y + (self.h - switch_height) // 2))
+        self.config.render_queue.blit(combined_switch_surface, (switch_x + (self.h - switch_width) // 2, self.y + (self.h - switch_height) // 2))
 
         # Draw the label
         text_surface = flappy_text(text=self.label, font=self.font, text_color=(255, 255, 255),
                                    outline_color=(0, 0, 0), outline_width=3, shadow_distance=(3, 3))
         text_rect = text_surface.get_rect(topleft=(self.x, self.y - 47))
-        self.config.screen.blit(text_surface, text_rect)
+        self.config.render_queue.blit(text_surface, text_rect)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and self.hovered:
@@ -15,6 +15,10 @@ class LeaderboardType(Enum):
 
 
 class LeaderboardMenu(Menu):
+    PERSONAL_PAGE_SIZE = 200  # number of personal results loaded at once, the next page is loaded when scrolled near the end
+    GLOBAL_PAGE_SIZE = 100  # number of global scores fetched per request
+    GLOBAL_MAX_SCORES = 1000  # max number of global scores shown
+
     def __init__(self, config: GameConfig, menu_manager: MenuManager):
         super().__init__(config, menu_manager, name="Leaderboard")
         self.leaderboard: Leaderboard = None
@@ -64,11 +68,23 @@ class LeaderboardMenu(Menu):
 
         if leaderboard is not None:
             def fetch_and_set_data():
-                new_data = scores_service.get_scores(1000)  # TODO: implement pagination
-                for index, entry in enumerate(new_data, start=1):
-                    entry['rank'] = index
-                if new_data[0]['score'] != '---':
-                    leaderboard.set_data(self.format_data(new_data, '%d/%m/%y'), column_info)
+                # fetch the scores page by page, so the first ones show up right away
+                new_data = []
+                last_score = None
+                while len(new_data) < self.GLOBAL_MAX_SCORES:
+                    page_size = min(self.GLOBAL_PAGE_SIZE, self.GLOBAL_MAX_SCORES - len(new_data))
+                    page = scores_service.get_scores_page(limit=page_size, after=last_score)
+                    if not page or page[0]['score'] == '---':  # no more scores, or they couldn't be fetched
+                        break
+                    last_score = dict(page[-1])  # unformatted, it's the cursor for the next page
+
+                    for index, entry in enumerate(page, start=len(new_data) + 1):
+                        entry['rank'] = index
+                    new_data += self.format_data(page, '%d/%m/%y')
+                    leaderboard.set_data(list(new_data), column_info)
+
+                    if len(page) < page_size:
+                        break
 
             threading.Thread(target=fetch_and_set_data, daemon=True).start()
 
@@ -83,16 +99,29 @@ class LeaderboardMenu(Menu):
         data = [{column: '...' for column in column_info.keys()}]
 
         if leaderboard is not None:
-            def fetch_and_set_data():
-                if self.results_manager is None:
-                    self.results_manager = ResultsManager()
-
-                new_data = self.format_data(self.results_manager.get_results())
-                for index, entry in enumerate(new_data, start=1):
-                    entry['rank'] = index
-                leaderboard.set_data(new_data, column_info)
-
-            threading.Thread(target=fetch_and_set_data, daemon=True).start()
+            # load the results page by page - there can be tens of thousands of them, if you let the AI play for a while
+            new_data = []
+            loading = threading.Lock()  # only one page is loaded at a time
+
+            def fetch_and_set_next_page():
+                with loading:
+                    if self.results_manager is None:
+                        self.results_manager = ResultsManager()
+
+                    page = self.format_data(self.results_manager.get_results(offset=len(new_data), limit=self.PERSONAL_PAGE_SIZE))
+                    for index, entry in enumerate(page, start=len(new_data) + 1):
+                        entry['rank'] = index
+                    new_data.extend(page)
+                    if len(page) < self.PERSONAL_PAGE_SIZE:
+                        leaderboard.on_near_end = None  # all results are loaded
+                    leaderboard.set_data(list(new_data), column_info)
+
+            def load_next_page():
+                if not loading.locked():
+                    threading.Thread(target=fetch_and_set_next_page, daemon=True).start()
+
+            leaderboard.on_near_end = load_next_page
+            load_next_page()
 
         return data, column_info
 
@@ -51,11 +51,11 @@ class Menu(Entity):
             text_surface = flappy_text(text=self.name, font=self.font, text_color=(255, 255, 255),
                                        outline_color=(0, 0, 0), outline_width=4, shadow_distance=(4, 4))
             text_rect = text_surface.get_rect(center=(self.x + self.w // 2, self.y + text_surface.get_height() // 2 + 20))
-            self.config.screen.blit(text_surface, text_rect)
+            self.config.render_queue.blit(text_surface, text_rect)
             # Draw the bottom line
             line = pygame.Surface((self.w, 10))
             line.fill((83, 56, 71))
-            self.config.screen.blit(line, (self.x, self.y + self.TITLEBAR_HEIGHT - 10))
+            self.config.render_queue.blit(line, (self.x, self.y + self.TITLEBAR_HEIGHT - 10))
 
     def add_element(self, element, x, y, align="center"):
         match align:
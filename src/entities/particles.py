@@ -1,73 +1,106 @@
-import math
 import random
+from collections import OrderedDict
 
+import numpy as np
 import pygame
 
-from .entity import Entity
 from src.utils import GameConfig, get_random_value
 
+PARTICLE_PIXEL_SIZE = 5  # size of each 'pixel' (block) of a particle
+PARTICLE_STAMP_CACHE_SIZE = 1024
+# Pre-rendered pixelated circles, keyed by (radius, color)
+particle_stamps: OrderedDict[tuple[int, tuple], pygame.Surface] = OrderedDict()
 
-class Particle(Entity):
-    def __init__(self, config: GameConfig, x, y, lifespan: int, gravity: float = 0.05, initial_velocity: pygame.Vector2 = None,
-                 radius: int = 20, color: tuple = (255, 255, 255), **kwargs):
-        super().__init__(config=config, x=x, y=y, **kwargs)
-        self.lifespan = lifespan
-        self.age: int = 0
-        self.color = color
-        self.initial_radius = radius
-        self.radius = radius
-        self.gravity = gravity
-        self.velocity: pygame.Vector2 = initial_velocity or pygame.Vector2(random.uniform(-1, 1), random.uniform(-5, -2))
 
-    def tick(self):
-        self.age += 1
-        self.x += self.velocity.x
-        self.y += self.velocity.y
-        self.velocity.y += self.gravity
-
-        # TODO: improve the particle decay formula - currently the end is a bit sudden
-        # Exponential decay for the radius
-        decay_factor = math.exp(-self.age / self.lifespan)  # Exponential decay based on age/lifespan
-        self.radius = max(1, int(self.initial_radius * decay_factor))  # Keeps radius from reaching 0 too early
+def get_particle_stamp(radius: int, color: tuple) -> pygame.Surface:
+    key = (radius, color)
+    stamp = particle_stamps.get(key)
+    if stamp is not None:
+        particle_stamps.move_to_end(key)
+        return stamp
 
-        super().tick()
+    stamp = _render_particle_stamp(radius, color)
+    particle_stamps[key] = stamp
+    if len(particle_stamps) > PARTICLE_STAMP_CACHE_SIZE:
+        particle_stamps.popitem(last=False)
+    return stamp
 
-    def draw(self):
-        """Draw the particle as a pixelated circle."""
-        pixel_size = 5  # size of each 'pixel' (block)
-        radius = self.radius
-        x, y = int(self.x), int(self.y)
 
-        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        surface = surface.convert_alpha()
+def _render_particle_stamp(radius: int, color: tuple) -> pygame.Surface:
+    """Render a particle as a pixelated circle."""
+    pixel_size = PARTICLE_PIXEL_SIZE
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    surface = surface.convert_alpha()
 
-        # Loop through the area that the circle occupies
-        for dx in range(-radius, radius + 1, pixel_size):
-            for dy in range(-radius, radius + 1, pixel_size):
-                # Check if the (dx, dy) position is inside the circle's area
-                if dx**2 + dy**2 <= radius**2:
-                    pygame.draw.rect(surface, self.color, pygame.Rect(dx + radius - pixel_size // 2, dy + radius - pixel_size // 2, pixel_size, pixel_size))
+    # Loop through the area that the circle occupies
+    for dx in range(-radius, radius + 1, pixel_size):
+        for dy in range(-radius, radius + 1, pixel_size):
+            # Check if the (dx, dy) position is inside the circle's area
+            if dx**2 + dy**2 <= radius**2:
+                pygame.draw.rect(surface, color, pygame.Rect(dx + radius - pixel_size // 2, dy + radius - pixel_size // 2, pixel_size, pixel_size))
 
-        self.config.screen.blit(surface, (x - radius, y - radius))
-
-
-    def is_alive(self):
-        return self.age < self.lifespan
+    return surface
 
 
 class ParticleManager:
+    """
+    Keeps all particles in NumPy arrays (one element per particle), so they're all updated in a single vectorized step
+    and drawn with one Surface.blits() call, using pre-rendered stamps instead of drawing each particle from scratch.
+    """
+    FIELDS = ('x', 'y', 'vel_x', 'vel_y', 'gravity', 'age', 'lifespan', 'initial_radius', 'radius', 'color_id')
+
     def __init__(self, config: GameConfig):
         self.config = config
-        self.particles = set()
+
+        self.x = np.zeros(0, dtype=np.float64)
+        self.y = np.zeros(0, dtype=np.float64)
+        self.vel_x = np.zeros(0, dtype=np.float64)
+        self.vel_y = np.zeros(0, dtype=np.float64)
+        self.gravity = np.zeros(0, dtype=np.float64)
+        self.age = np.zeros(0, dtype=np.int32)
+        self.lifespan = np.zeros(0, dtype=np.int32)
+        self.initial_radius = np.zeros(0, dtype=np.float64)
+        self.radius = np.zeros(0, dtype=np.int32)
+        self.color_id = np.zeros(0, dtype=np.int32)  # index into self.colors
+
+        self.colors: list[tuple] = []
+        self.color_ids: dict[tuple, int] = {}
+
+    @property
+    def num_particles(self) -> int:
+        return len(self.age)
 
     def tick(self):
-        if not self.particles:
+        if not self.num_particles:
             return
 
-        for particle in set(self.particles):
-            particle.tick()
-            if not particle.is_alive():
-                self.particles.remove(particle)
+        self.age += 1
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.vel_y += self.gravity
+
+        # TODO: improve the particle decay formula - currently the end is a bit sudden
+        # Exponential decay for the radius
+        decay_factor = np.exp(-self.age / self.lifespan)  # Exponential decay based on age/lifespan
+        self.radius = np.maximum(1, (self.initial_radius * decay_factor).astype(np.int32))  # Keeps radius from reaching 0 too early
+
+        if self.config.render:
+            self.draw()
+
+        alive = self.age < self.lifespan
+        if not alive.all():
+            for field in self.FIELDS:
+                setattr(self, field, getattr(self, field)[alive])
+
+    def draw(self):
+        radii = self.radius.tolist()
+        xs = self.x.astype(np.int64).tolist()  # truncates towards zero, same as int()
+        ys = self.y.astype(np.int64).tolist()
+        colors = self.colors
+        self.config.render_queue.blits([
+            (get_particle_stamp(radius, colors[color_id]), (x - radius, y - radius))
+            for radius, x, y, color_id in zip(radii, xs, ys, self.color_id.tolist())
+        ])
 
     # Nghhmmmmm, what other types should the parameters support? 🥰
     def spawn_particles(self, x, y,
@@ -82,18 +115,33 @@ class ParticleManager:
                         color: tuple | tuple[tuple] = (255, 255, 255, 255)
                         ):
         """Spawn multiple particles around the given position with random properties."""
+        new_particles = {field: [] for field in self.FIELDS}
         for _ in range(get_random_value(count, random_type="range", as_int=True)):
-            particle = Particle(
-                config=self.config,
-                x=x + get_random_value(position_offset_x, random_type="auto", as_int=True),
-                y=y + get_random_value(position_offset_y, random_type="auto", as_int=True),
-                lifespan=get_random_value(lifespan, random_type="auto", as_int=True),
-                radius=get_random_value(radius, random_type="auto", as_int=False),
-                gravity=get_random_value(gravity, random_type="auto", as_int=False),
-                initial_velocity=pygame.Vector2(
-                    get_random_value(initial_velocity_x, random_type="auto", as_int=False),
-                    get_random_value(initial_velocity_y, random_type="auto", as_int=False),
-                ),
-                color=tuple([get_random_value(c) for c in color]),
-            )
-            self.particles.add(particle)
+            new_particles['x'].append(x + get_random_value(position_offset_x, random_type="auto", as_int=True))
+            new_particles['y'].append(y + get_random_value(position_offset_y, random_type="auto", as_int=True))
+            new_particles['lifespan'].append(get_random_value(lifespan, random_type="auto", as_int=True))
+            particle_radius = get_random_value(radius, random_type="auto", as_int=False)
+            new_particles['initial_radius'].append(particle_radius)
+            new_particles['radius'].append(particle_radius)
+            new_particles['gravity'].append(get_random_value(gravity, random_type="auto", as_int=False))
+            vel_x = get_random_value(initial_velocity_x, random_type="auto", as_int=False)
+            vel_y = get_random_value(initial_velocity_y, random_type="auto", as_int=False)
+            new_particles['color_id'].append(self.get_color_id(tuple([get_random_value(c) for c in color])))
+            if vel_x == vel_y == 0:  # no initial velocity - give it a random one
+                vel_x, vel_y = random.uniform(-1, 1), random.uniform(-5, -2)
+            new_particles['vel_x'].append(vel_x)
+            new_particles['vel_y'].append(vel_y)
+            new_particles['age'].append(0)
+
+        if not new_particles['age']:
+            return
+        for field in self.FIELDS:
+            array = getattr(self, field)
+            setattr(self, field, np.concatenate((array, np.array(new_particles[field], dtype=array.dtype))))
+
+    def get_color_id(self, color: tuple) -> int:
+        color_id = self.color_ids.get(color)
+        if color_id is None:
+            color_id = self.color_ids[color] = len(self.colors)
+            self.colors.append(color)
+        return color_id
@@ -21,7 +21,7 @@ class Pipes(Entity):
         self.horizontal_gap: int = 390
         self.upper: list[Pipe] = []
         self.lower: list[Pipe] = []
-        self.spawn_initial_pipes()
+        self.reset()
 
     def tick(self) -> None:
         self.manage_pipes()
@@ -44,6 +44,10 @@ class Pipes(Entity):
         for pipe in self.upper + self.lower:
             pipe.vel_x = 0
 
+    def reset(self) -> None:
+        self.clear()
+        self.spawn_initial_pipes()
+
     def clear(self) -> None:
         """
         Removes all pipes from the environment.
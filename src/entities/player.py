@@ -4,7 +4,7 @@ from typing import List, Optional
 
 import pygame
 
-from src.utils import GameConfig, GameStateManager, Animation
+from src.utils import GameConfig, GameStateManager, Animation, rotation_cache
 from .attribute_bar import AttributeBar
 from .entity import Entity
 from .floor import Floor
@@ -221,9 +221,9 @@ class Player(Entity):
         self.image = self.animation.update()
         # self.update_image(self.animation.update())
 
-        rotated_image = pygame.transform.rotate(self.image, self.rotation)
+        rotated_image = rotation_cache.rotate(self.image, self.rotation)
         rotated_rect = rotated_image.get_rect(center=self.rect.center)
-        self.config.screen.blit(rotated_image, rotated_rect)
+        self.config.render_queue.blit(rotated_image, rotated_rect)
 
     def flap(self) -> None:
         if self.y > self.min_y:
@@ -4,16 +4,7 @@ from .entity import Entity
 from ..utils import GameConfig, Fonts, flappy_text, get_font
 
 
-# Just noticed a flaw in this cache implementation...
-# Each time the player dies we call reset() which re-initializes the Score object, meaning the cache is cleared.
-# So the cache is created, but never used for previous scores. It uses it only for the current score.
-# Meaning we could 'cache'/store only the last used score instead of 100 or however many, and we'd get the same benefits
-# for way less overhead.
-
 class Score(Entity):
-    text_cache = {}
-    max_cache_size = 100
-
     def __init__(self, config: GameConfig) -> None:
         super().__init__(config)
         self.y = self.config.window.height * 0.04
@@ -28,33 +19,23 @@ class Score(Entity):
         self.score += 1
         self.config.sounds.play_random(self.config.sounds.point)
 
+    def get_text_surface(self) -> pygame.Surface:
+        # flappy_text() caches rendered texts globally, so it's rendered only once per score, even across games
+        return flappy_text(text=str(self.score), font=self.font, text_color=(255, 255, 255),
+                           outline_color=(0, 0, 0), outline_width=5, shadow_distance=(5, 5))
+
     @property
     def rect(self) -> pygame.Rect:
-        text_surface = flappy_text(text=str(self.score), font=self.font, text_color=(255, 255, 255),
-                                   outline_color=(0, 0, 0), outline_width=5, shadow_distance=(5, 5))
-        text_rect = text_surface.get_rect()
+        text_rect = self.get_text_surface().get_rect()
         text_rect.centerx = self.config.window.width // 2
         text_rect.y = self.y
         return text_rect
 
     def draw(self) -> None:
-        if self.score not in Score.text_cache:
-            text_surface = flappy_text(text=str(self.score), font=self.font, text_color=(255, 255, 255),
-                                       outline_color=(0, 0, 0), outline_width=5, shadow_distance=(5, 5))
+        text_surface = self.get_text_surface()
 
-            Score.text_cache[self.score] = text_surface
-
-            # check the cache size and remove the second-newest entry if necessary
-            if len(Score.text_cache) > Score.max_cache_size:
-                scores = list(Score.text_cache.keys())
-                second_newest_score = scores[-2]
-                del Score.text_cache[second_newest_score]
-
-        # use the pre-rendered text from the cache
-        combined_surface = Score.text_cache[self.score]
-
-        text_rect = combined_surface.get_rect()
+        text_rect = text_surface.get_rect()
         text_rect.centerx = self.config.window.width // 2
         text_rect.y = self.y
 
-        self.config.screen.blit(combined_surface, text_rect)
+        self.config.render_queue.blit(text_surface, text_rect)
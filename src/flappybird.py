@@ -7,9 +7,11 @@ import pygame
 
 from .ai import ObservationManager
 from .database import scores_service
+from .replays import ReplayRecorder, take_snapshot, restore_snapshot
 from .entities import MenuManager, MainMenu, Background, Floor, Player, PlayerMode, Pipes, Score, \
-    WelcomeMessage, GameOver, Inventory, ItemManager, EnemyManager, CloudSkimmer
-from .utils import GameConfig, GameState, GameStateManager, Window, Images, Sounds, DummySounds, ResultsManager
+    WelcomeMessage, GameOver, Inventory, ItemManager, EnemyManager, CloudSkimmer, BulletBroadPhase
+from .utils import GameConfig, GameState, GameStateManager, Window, Images, Sounds, DummySounds, ResultsManager, \
+    FrameProfiler
 
 
 # from .config import Config <-- imported later to avoid circular import
@@ -62,8 +64,14 @@ class FlappyBird:
         self.flappy_controller = None
         self.enemy_cloudskimmer_controller = None
 
+        # Replays
+        self.replay_recorder = ReplayRecorder() if Config.options['record_replays'] else None
+        self.replay_player = None  # set when re-simulating a replay, feeds the recorded actions instead of the controllers
+
         # Miscellaneous
+        self.frame_profiler = FrameProfiler(enabled=Config.options['frame_profiler'], fps=Config.fps_cap)
         self.next_closest_pipe_pair = None
+        self.bullet_broad_phase = BulletBroadPhase(self)  # shared by all bullets for collision checks
 
     def init_model_controllers(self, human_player: bool = True):
         """
@@ -82,27 +90,63 @@ class FlappyBird:
 
     async def start(self):
         while True:
+            if self.replay_recorder is not None:
+                self.replay_recorder.start_episode(self)
             self.reset()
             self.start_screen()
             self.play()
             self.game_over()
 
-    def reset(self):
+    def reset(self, create_menus: bool = True):
+        """
+        Resets the game for a new episode.
+        The entities are only created the first time, after that they're reset in place (in the same order, so the
+        same random numbers are used). The player is the exception - observations and items are tied to it, so it's
+        always created anew.
+
+        :param create_menus: whether to create the menus, they're only used by the start screen (Mode.PLAY)
+        """
         self.config.images.randomize()
-        self.menu_manager = MenuManager()
-        self.menu_manager.push_menu(MainMenu(self.config, self.menu_manager))
-        self.background = Background(self.config)
-        self.floor = Floor(self.config)
-        self.player = Player(self.config, self.gsm)
-        self.welcome_message = WelcomeMessage(self.config)
-        self.game_over_message = GameOver(self.config)
-        self.pipes = Pipes(self.config)
-        self.score = Score(self.config)
-        self.inventory = Inventory(self.config, self.player, env=self)
-        self.item_manager = ItemManager(self.config, self.inventory, self.pipes)
-        self.enemy_manager = EnemyManager(self.config, self)
+        if create_menus:
+            self.menu_manager = MenuManager()
+            self.menu_manager.push_menu(MainMenu(self.config, self.menu_manager))
+
+        if self.background is None:
+            self.background = Background(self.config)
+            self.floor = Floor(self.config)
+            self.player = Player(self.config, self.gsm)
+            self.welcome_message = WelcomeMessage(self.config)
+            self.game_over_message = GameOver(self.config)
+            self.pipes = Pipes(self.config)
+            self.score = Score(self.config)
+            self.inventory = Inventory(self.config, self.player, env=self)
+            self.item_manager = ItemManager(self.config, self.inventory, self.pipes)
+            self.enemy_manager = EnemyManager(self.config, self)
+        else:
+            # background, welcome & game over messages have no state
+            self.floor.reset()
+            self.player = Player(self.config, self.gsm)
+            self.pipes.reset()
+            self.score.reset()
+            self.inventory.reset(self.player)
+            self.item_manager.reset()
+            self.enemy_manager.reset()
         self.next_closest_pipe_pair = (self.pipes.upper[0], self.pipes.lower[0])
 
+    def get_snapshot(self) -> bytes:
+        """
+        Returns the simulation state (entities & random generators) packed into bytes, see replays/snapshot.py.
+        """
+        return take_snapshot(self)
+
+    def restore_snapshot(self, snapshot: bytes | memoryview, restore_random_state: bool = True) -> None:
+        """
+        Restores the simulation state from a snapshot created by get_snapshot() (of this or any other game).
+        :param snapshot: the snapshot
+        :param restore_random_state: whether to restore the random generators as well
+        """
+        restore_snapshot(self, snapshot, restore_random_state)
+
     def start_screen(self):
         self.gsm.set_state(GameState.START)
         self.player.set_mode(PlayerMode.SHM)
@@ -119,8 +163,7 @@ class FlappyBird:
             self.floor.tick()
             self.menu_manager.tick()
 
-            pygame.display.update()
-            self.config.tick()
+            self.update_display(use_dirty_rects=True)
 
     def play(self):
         """
@@ -140,39 +183,65 @@ class FlappyBird:
         have a 1 frame advantage over the player, as they would know what the player did in the current frame,
         even though the screen hasn't been updated yet.
         """
-        self.gsm.set_state(GameState.PLAY)
-        self.player.set_mode(PlayerMode.NORMAL)
-        self.score.reset()
+        self.start_play()
 
         while True:
             # print("START")
             self.monitor_fps_drops()
 
+            self.frame_profiler.begin_frame()
+            game_ended = self.play_frame(pygame.event.get(), pygame.mouse.get_pressed()[0])
+            self.frame_profiler.end_frame()
+            if self.replay_recorder is not None:
+                self.replay_recorder.next_frame()
+            if game_ended:
+                if self.replay_recorder is not None:
+                    self.replay_recorder.end_episode(self)
+                return
+
+            # print("END")
+            # print()
+
+    def start_play(self):
+        self.gsm.set_state(GameState.PLAY)
+        self.player.set_mode(PlayerMode.NORMAL)
+        self.score.reset()
+        if self.replay_recorder is not None:
+            self.replay_recorder.start_play(self)
+
+    def play_frame(self, events, mouse_left: bool) -> bool:
+        """
+        Plays a single frame of the game.
+        :param events: pygame events of this frame (including player input)
+        :param mouse_left: whether the left mouse button is held
+        :return: True if the game ended (player died), False otherwise
+        """
+        profiler = self.frame_profiler
+        with profiler.measure('entity_actions'):
             self.perform_entity_actions()
-            # handle events including player input
-            for event in pygame.event.get():
+        # handle events including player input
+        with profiler.measure('events'):
+            for event in events:
                 if self.handle_event(event):
-                    return
-            self.handle_mouse_buttons()
+                    return True
+            self.handle_mouse_buttons(mouse_left)
 
+        with profiler.measure('collisions'):
             if self.player.crossed(self.next_closest_pipe_pair[0]):
                 self.next_closest_pipe_pair = self.get_next_pipe_pair()
                 self.score.add()
 
             self.player.handle_bad_collisions(self.pipes, self.floor)
             if self.is_player_dead():
-                return
+                return True
 
             collided_items = self.player.collided_items(self.item_manager.spawned_items)
             self.item_manager.collect_items(collided_items)
 
-            self.game_tick()
+        self.game_tick()
 
-            pygame.display.update()
-            self.config.tick()
-
-            # print("END")
-            # print()
+        self.update_display()
+        return False
 
     def perform_entity_actions(self):
         # CloudSkimmer's action is influenced by (advanced) flappy bird's action (position) and advanced flappy
@@ -196,26 +265,44 @@ class FlappyBird:
                     isinstance(self.enemy_manager.spawned_enemy_groups[0].members[0], CloudSkimmer):
                 controlled_entities.extend(self.enemy_manager.spawned_enemy_groups[0].members)
 
-        # get actions for all entities
-        actions = []
+        # get observations for all entities and group them by controller, so each controller predicts actions for all
+        # of its entities in a single batch (e.g. all CloudSkimmers in a group share the same controller)
+        if self.replay_player is not None:
+            # re-simulating a replay, so the actions were already decided (no need for observations & predictions)
+            for entity in controlled_entities:
+                controller = self.get_corresponding_controller(entity)
+                controller.perform_action(action=self.replay_player.get_entity_action(entity), entity=entity, env=self)
+            return
+
+        batches = {}  # (controller, use_action_masks) -> entities
+        observations = {}
         for entity in controlled_entities:
             if entity not in self.observation_manager.observation_instances:
                 if isinstance(entity, CloudSkimmer):
                     self.observation_manager.create_observation_instance(entity, env=self, controlled_enemy_id=entity.id, use_bullet_info=False)
                 else:
-                    self.observation_manager.create_observation_instance(entity, env=self)
+                    # observations are stacked into a batch right away, so there's no need to copy them
+                    self.observation_manager.create_observation_instance(entity, env=self, zero_copy=True)
 
             controller = self.get_corresponding_controller(entity)
-            observation = self.observation_manager.get_observation(entity)
+            observations[entity] = self.observation_manager.get_observation(entity)
             # TODO this if statement will later need to be modified, as advanced flappy bird will use action masks
             use_action_masks = False if isinstance(entity, Player) else True
-            action = controller.predict_action(observation, use_action_masks=use_action_masks, entity=entity, env=self)
-            actions.append(action)
+            batches.setdefault((controller, use_action_masks), []).append(entity)
+
+        # get actions for all entities
+        actions = {}
+        for (controller, use_action_masks), entities in batches.items():
+            batch_actions = controller.predict_actions([observations[entity] for entity in entities],
+                                                       use_action_masks=use_action_masks, entities=entities, env=self)
+            actions.update(zip(entities, batch_actions))
 
         # perform actions for all entities
-        for i, entity in enumerate(controlled_entities):
+        for entity in controlled_entities:
             controller = self.get_corresponding_controller(entity)
-            controller.perform_action(action=actions[i], entity=entity, env=self)
+            if self.replay_recorder is not None:
+                self.replay_recorder.record_entity_action(entity, actions[entity])
+            controller.perform_action(action=actions[entity], entity=entity, env=self)
 
     def get_corresponding_controller(self, entity):
         if isinstance(entity, Player):
@@ -237,6 +324,7 @@ class FlappyBird:
 
         if self.score.score > 0 and self.config.save_results:
             threading.Thread(target=self.submit_result_async, daemon=True).start()
+        self.frame_profiler.export_if_needed()
 
         while True:
             for event in pygame.event.get():
@@ -246,18 +334,52 @@ class FlappyBird:
             self.game_tick()
             self.game_over_message.tick()
 
-            pygame.display.update()
+            self.update_display(use_dirty_rects=True)
+
+    def update_display(self, use_dirty_rects: bool = False):
+        """
+        Draws everything the entities queued, pushes the current frame to the display and ticks the clock.
+        If rendering is disabled (sim mode), the display update is skipped, as nothing was drawn anyway.
+        :param use_dirty_rects: only update the regions of the display that changed since the previous frame
+                                (worth it on screens where most things stand still, e.g. start & game over screens)
+        """
+        profiler = self.frame_profiler
+        render_queue = self.config.render_queue
+        if self.config.render:
+            with profiler.measure('display'):
+                render_queue.flush()
+                if profiler.show_overlay:
+                    profiler.draw_overlay(render_queue.draw_directly())
+
+                dirty_rects = render_queue.get_dirty_rects() if use_dirty_rects else None
+                if dirty_rects is None:
+                    pygame.display.update()
+                elif dirty_rects:
+                    pygame.display.update(dirty_rects)
+                render_queue.end_frame()
+        else:
+            render_queue.discard()
+        with profiler.measure('clock'):
             self.config.tick()
 
     def game_tick(self):
-        self.background.tick()
-        self.pipes.tick()
-        self.floor.tick()
-        self.item_manager.tick()
-        self.player.tick()
-        self.enemy_manager.tick()
-        self.inventory.tick()
-        self.score.tick()
+        profiler = self.frame_profiler
+        with profiler.measure('background'):
+            self.background.tick()
+        with profiler.measure('pipes'):
+            self.pipes.tick()
+        with profiler.measure('floor'):
+            self.floor.tick()
+        with profiler.measure('item_manager'):
+            self.item_manager.tick()
+        with profiler.measure('player'):
+            self.player.tick()
+        with profiler.measure('enemy_manager'):
+            self.enemy_manager.tick()
+        with profiler.measure('inventory'):
+            self.inventory.tick()
+        with profiler.measure('score'):
+            self.score.tick()
 
     @staticmethod
     def get_pipe_pair_center(pipe_pair) -> (float, float):
@@ -292,6 +414,8 @@ class FlappyBird:
 
         if self.player.mode == PlayerMode.NORMAL and self.human_player:
             if event.type == pygame.KEYDOWN:
+                if self.replay_recorder is not None:
+                    self.replay_recorder.record_key(event.key)
                 match event.key:
                     case pygame.K_SPACE:
                         self.player.flap()
@@ -315,16 +439,23 @@ class FlappyBird:
                     return True
         return False
 
-    def handle_mouse_buttons(self):
+    def handle_mouse_buttons(self, mouse_left: bool = None):
+        """
+        :param mouse_left: whether the left mouse button is held; if None, it's read from pygame
+        """
         if not self.human_player:
             return
-        m_left, _, _ = pygame.mouse.get_pressed()
-        if m_left:
+        if mouse_left is None:
+            mouse_left = pygame.mouse.get_pressed()[0]
+        if mouse_left:
+            if self.replay_recorder is not None:
+                self.replay_recorder.record_mouse_left()
             self.inventory.use_item(inventory_slot_index=0)  # gun slot
 
     def handle_quit(self, event):
         if event.type == pygame.QUIT:
             print("Quitting...")
+            scores_service.flush_scores()  # the background thread that sends them gets killed on exit
             pygame.quit()
             sys.exit()
         # So ummm, this clearly doesn't belong in handle_quit(), but because [MY_EXCUSE_GOES_HERE],
@@ -332,6 +463,8 @@ class FlappyBird:
         # all environments/modes/game loops, meaning this is the only place I had to modify.
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
             self.take_screenshot()
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.frame_profiler.toggle_overlay()
 
     @staticmethod
     def take_screenshot():
@@ -2,10 +2,10 @@ import asyncio
 import cProfile
 import os
 
-from .ai.environments import EnvManager
 from .config import Config
 from .flappybird import FlappyBird
 from .modes import Mode
+from .replays import get_replay_path
 from .utils import printc
 
 """  # noqa: E265
@@ -20,7 +20,7 @@ Loading a trained model with Stable Baselines3 sets the seed to the one used dur
 If we want to override it, we must do so **after** loading the model!
 This is currently handled in the following files (at the time of writing...):
  - modelPPO.py, in the ModelPPO class in _load_model() method, after loading the model
- - base_controller.py, in the BaseModelController class in __init__() method, after loading the model
+ - base_controller.py, in the BaseModelController class, after loading the model (or its NumPy policy)
  - gym_env.py, in the GymEnv class in reset() method
 
 For Mode.PLAY, the seed is not set directly in the FlappyBird() class, but is set when
@@ -40,8 +40,31 @@ class ModeExecutor:
 
     @staticmethod
     def test_env():
+        from .ai.environments import EnvManager
         EnvManager(env_type=Config.env_type, env_variant=Config.env_variant).test_env()
 
+    @staticmethod
+    def benchmark_env():
+        from .ai.environments.env_benchmark import run_env_benchmark
+        run_env_benchmark(**Config.benchmark, seed=Config.seed if Config.seed is not None else 42)
+
+    @staticmethod
+    def benchmark_startup():
+        from .utils.startup_benchmark import run_startup_benchmark
+        run_startup_benchmark()
+
+    @staticmethod
+    def replay():
+        from .replays.resimulator import resimulate
+        resimulate(get_replay_path("data/replays", Config.replay_file))
+
+    @staticmethod
+    def harvest_states():
+        from .replays.start_states import harvest_start_states
+        harvest_start_states(every_n_frames=Config.start_states['every_n_frames'],
+                             skip_last_frames=Config.start_states['skip_last_frames'],
+                             max_per_replay=Config.start_states['max_per_replay'])
+
     @staticmethod
     def train():
         model = ModeExecutor.init_model()
@@ -81,6 +104,10 @@ class ModeExecutor:
 MODES = {
     Mode.PLAY: ModeExecutor.play,
     Mode.TEST_ENV: ModeExecutor.test_env,
+    Mode.BENCHMARK_ENV: ModeExecutor.benchmark_env,
+    Mode.BENCHMARK_STARTUP: ModeExecutor.benchmark_startup,
+    Mode.REPLAY: ModeExecutor.replay,
+    Mode.HARVEST_STATES: ModeExecutor.harvest_states,
     Mode.TRAIN: ModeExecutor.train,
     Mode.CONTINUE_TRAINING: ModeExecutor.continue_training,
     Mode.RUN_MODEL: ModeExecutor.run_model,
@@ -100,7 +127,7 @@ def print_option_value_pair(option, value, comment=None, color='default'):
 def print_config():
     print()
     print_option_value_pair("Mode:", Config.mode.name, color='green')
-    if Config.mode == Mode.PLAY:
+    if Config.mode in [Mode.PLAY, Mode.REPLAY, Mode.HARVEST_STATES, Mode.BENCHMARK_ENV, Mode.BENCHMARK_STARTUP]:
         print_option_value_pair("Environment type:", Config.env_type.name, comment="(not used)", color='gray')
         print_option_value_pair("Environment variant:", Config.env_variant.name, comment="(not used)", color='gray')
     else:
@@ -124,6 +151,8 @@ def print_config():
 
 
 def validate_mode():
+    # not done when the config is imported, so worker processes (which import it as well) don't repeat the warnings
+    Config.verify_config()
     if Config.mode not in Mode.__members__.values():
         raise ValueError(f"Invalid mode: {Config.mode}")
 
@@ -131,7 +160,7 @@ def validate_mode():
 
 
 def execute_mode():
-    if Config.options['headless']:
+    if Config.options['headless'] or (Config.options['sim'] and Config.mode != Mode.PLAY) or Config.mode in (Mode.REPLAY, Mode.HARVEST_STATES):
         os.environ["SDL_VIDEODRIVER"] = "dummy"
 
     if not Config.options['profile']:
@@ -4,6 +4,10 @@ from enum import Enum
 class Mode(Enum):
     PLAY = 'play'
     TEST_ENV = 'test-env'
+    BENCHMARK_ENV = 'benchmark-env'
+    BENCHMARK_STARTUP = 'benchmark-startup'
+    REPLAY = 'replay'
+    HARVEST_STATES = 'harvest-states'
     TRAIN = 'train'
     CONTINUE_TRAINING = 'continue-training'
     RUN_MODEL = 'run-model'
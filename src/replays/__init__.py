@@ -0,0 +1,5 @@
+from .replay import Replay, ReplayPlayer, ReplayDesyncError, get_replay_path, get_random_state, set_random_state, \
+    get_class_path
+from .replay_recorder import ReplayRecorder
+from .snapshot import take_snapshot, restore_snapshot
+from .state_hash import get_state_hash
@@ -0,0 +1,218 @@
+"""
+Replay file format (all numbers are little-endian):
+- magic bytes b'FBRP' and the format version (uint8)
+- length of the JSON metadata (uint32) and the metadata itself (what was recorded, seed, number of frames, state hash...)
+- zlib compressed body:
+    - random state at the start of the episode (before the game is reset) and at the start of the play loop,
+      each as the Python random state followed by the NumPy random state
+    - the action stream: for every frame, its events followed by FRAME_END
+      each event: code (uint8), number of values (uint8), values (int16 each)
+"""
+
+import json
+import random
+import struct
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.entities import CloudSkimmer, Player
+
+MAGIC = b'FBRP'
+VERSION = 1
+
+# Event codes
+FRAME_END = 0
+AGENT_ACTION = 1  # action given to the environment's step() (array of ints)
+AGENT_ACTION_SCALAR = 2  # action given to the environment's step() (single int, e.g. Discrete action space)
+PLAYER_ACTION = 3  # action performed by the AI player's controller
+CLOUDSKIMMER_ACTION = 4  # action performed by the CloudSkimmer's controller, first value is the CloudSkimmer's id
+KEY_DOWN = 5  # key pressed by the human player, value is the key code
+MOUSE_LEFT = 6  # left mouse button held by the human player
+
+PYTHON_RANDOM_STATE_LEN = 625
+NUMPY_RANDOM_STATE_LEN = 624
+
+
+def get_random_state() -> bytes:
+    """
+    Returns the state of Python's and NumPy's global random generators, packed into bytes.
+    The game itself only uses those two, so restoring them (see set_random_state()) fully restores the game's randomness.
+    """
+    version, internal_state, gauss_next = random.getstate()
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return b''.join((
+        struct.pack('<B?d', version, gauss_next is not None, gauss_next or 0.0),
+        np.asarray(internal_state, dtype='<u4').tobytes(),
+        struct.pack('<iid', pos, has_gauss, cached_gaussian),
+        np.asarray(keys, dtype='<u4').tobytes(),
+    ))
+
+
+def set_random_state(state: bytes) -> int:
+    """
+    Restores the state of Python's and NumPy's global random generators from bytes created by get_random_state().
+    :return: number of bytes read
+    """
+    offset = 0
+    version, has_gauss_next, gauss_next = struct.unpack_from('<B?d', state, offset)
+    offset += struct.calcsize('<B?d')
+    internal_state = np.frombuffer(state, dtype='<u4', count=PYTHON_RANDOM_STATE_LEN, offset=offset)
+    offset += internal_state.nbytes
+    pos, has_gauss, cached_gaussian = struct.unpack_from('<iid', state, offset)
+    offset += struct.calcsize('<iid')
+    keys = np.frombuffer(state, dtype='<u4', count=NUMPY_RANDOM_STATE_LEN, offset=offset)
+    offset += keys.nbytes
+
+    random.setstate((version, tuple(internal_state.tolist()), gauss_next if has_gauss_next else None))
+    np.random.set_state(('MT19937', keys.astype(np.uint32), pos, has_gauss, cached_gaussian))
+    return offset
+
+
+RANDOM_STATE_SIZE = len(get_random_state())
+
+
+class Replay:
+    """
+    A recorded episode: the random state it started with and every action performed during it, frame by frame.
+    That's all we need to simulate the exact same episode again, without the policies or the human player.
+
+    :param metadata: info about the recording, e.g. which environment was used and the final state hash
+    :param reset_random_state: random state before the game was reset
+    :param play_random_state: random state at the start of the play loop (after the start screen, in Mode.PLAY)
+    :param frames: for each frame, a list of (event code, values) tuples
+    """
+    def __init__(self, metadata: dict, reset_random_state: bytes, play_random_state: bytes,
+                 frames: list[list[tuple[int, tuple[int, ...]]]]):
+        self.metadata = metadata
+        self.reset_random_state = reset_random_state
+        self.play_random_state = play_random_state
+        self.frames = frames
+
+    @property
+    def num_frames(self) -> int:
+        return len(self.frames)
+
+    @property
+    def may_desync(self) -> bool:
+        """
+        Whether the re-simulation might not match the recording. Environments can keep some state of their own between
+        episodes (step counters, how the player is moved...), which isn't recorded, while the re-simulation always
+        starts from a new environment - so only the first episode recorded in an environment is guaranteed to match.
+        Episodes recorded in Mode.PLAY always match, as the game is fully reset between them.
+        """
+        return self.metadata['env_class'] is not None and self.metadata.get('episode', 0) > 0
+
+    def save(self, path: str | Path) -> None:
+        body = bytearray(self.reset_random_state + self.play_random_state)
+        for events in self.frames:
+            for code, values in events:
+                body += struct.pack(f'<BB{len(values)}h', code, len(values), *values)
+            body.append(FRAME_END)
+
+        metadata = json.dumps(self.metadata).encode('utf-8')
+        with open(path, 'wb') as file:
+            file.write(MAGIC + struct.pack('<BI', VERSION, len(metadata)) + metadata)
+            file.write(zlib.compress(bytes(body), level=9))
+
+    @staticmethod
+    def load(path: str | Path) -> 'Replay':
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' is not a replay file.")
+        version, metadata_len = struct.unpack_from('<BI', data, len(MAGIC))
+        if version != VERSION:
+            raise ValueError(f"Replay '{path}' has version {version}, but only version {VERSION} is supported.")
+        offset = len(MAGIC) + struct.calcsize('<BI')
+        metadata = json.loads(data[offset:offset + metadata_len].decode('utf-8'))
+        body = zlib.decompress(data[offset + metadata_len:])
+
+        reset_random_state = body[:RANDOM_STATE_SIZE]
+        play_random_state = body[RANDOM_STATE_SIZE:2 * RANDOM_STATE_SIZE]
+        frames = []
+        events = []
+        offset = 2 * RANDOM_STATE_SIZE
+        while offset < len(body):
+            code = body[offset]
+            offset += 1
+            if code == FRAME_END:
+                frames.append(events)
+                events = []
+                continue
+            num_values = body[offset]
+            values = struct.unpack_from(f'<{num_values}h', body, offset + 1)
+            offset += 1 + 2 * num_values
+            events.append((code, values))
+
+        return Replay(metadata, reset_random_state, play_random_state, frames)
+
+
+class ReplayDesyncError(RuntimeError):
+    """ Raised when the re-simulated game asks for an action that wasn't recorded, meaning the simulation diverged. """
+
+
+class ReplayPlayer:
+    """
+    Feeds the recorded actions back into the game, one frame at a time, instead of the policies and the human player.
+    """
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.frame_index = -1
+        self.events: list[tuple[int, tuple[int, ...]]] = []
+
+    def next_frame(self) -> bool:
+        """
+        Moves on to the next recorded frame.
+        :return: False if there are no frames left, True otherwise
+        """
+        self.frame_index += 1
+        if self.frame_index >= self.replay.num_frames:
+            self.events = []
+            return False
+        self.events = self.replay.frames[self.frame_index]
+        return True
+
+    def get_agent_action(self):
+        for code, values in self.events:
+            if code == AGENT_ACTION:
+                return np.array(values, dtype=np.int64)
+            elif code == AGENT_ACTION_SCALAR:
+                return values[0]
+        raise ReplayDesyncError(f"No agent action was recorded in frame {self.frame_index}.")
+
+    def get_entity_action(self, entity) -> np.ndarray:
+        """
+        Returns the recorded action for the given controlled entity (the AI player or a CloudSkimmer).
+        """
+        for code, values in self.events:
+            if code == PLAYER_ACTION and isinstance(entity, Player):
+                return np.array(values, dtype=np.int64)
+            elif code == CLOUDSKIMMER_ACTION and isinstance(entity, CloudSkimmer) and values[0] == entity.id:
+                return np.array(values[1:], dtype=np.int64)
+        raise ReplayDesyncError(f"No action was recorded for {type(entity).__name__} in frame {self.frame_index}.")
+
+    def get_pressed_keys(self) -> list[int]:
+        return [values[0] for code, values in self.events if code == KEY_DOWN]
+
+    def is_mouse_left_pressed(self) -> bool:
+        return any(code == MOUSE_LEFT for code, _ in self.events)
+
+
+def get_replay_path(directory: str | Path, name: Optional[str] = None) -> Path:
+    """ Returns the path of a replay, or of the latest replay in the directory if name is None. """
+    directory = Path(directory)
+    if name is not None:
+        return directory / name
+    replays = sorted(directory.glob('*.fbr'))
+    if not replays:
+        raise FileNotFoundError(f"No replays found in '{directory}'.")
+    return replays[-1]
+
+
+def get_class_path(cls: type) -> str:
+    """ Returns the full import path of a class (e.g. of an environment), as stored in the replay metadata. """
+    return f"{cls.__module__}.{cls.__qualname__}"
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pygame
+
+from src.entities import CloudSkimmer
+from src.utils import printc
+from .replay import Replay, get_random_state, get_class_path, AGENT_ACTION, AGENT_ACTION_SCALAR, PLAYER_ACTION, \
+    CLOUDSKIMMER_ACTION, KEY_DOWN, MOUSE_LEFT
+from .state_hash import get_state_hash
+
+# keys that affect the game - others (like taking a screenshot) don't need to be replayed
+RECORDED_KEYS = (pygame.K_SPACE, pygame.K_a, pygame.K_s, pygame.K_d, pygame.K_r)
+
+
+class ReplayRecorder:
+    """
+    Records episodes, so they can be re-simulated later (see resimulator.py) without the policies or the human player.
+
+    Instead of the seed, the full state of the random generators is saved at the start of each episode, so it doesn't
+    matter how (or whether) the seed was set. Then every action is logged, frame by frame: the human player's input,
+    the AI player's actions, the CloudSkimmers' actions and the actions given to the environment's step().
+
+    Usage (this is already done by FlappyBird and GymEnv, when `Config.options['record_replays']` is enabled):
+    - start_episode(game) right before the game is reset
+    - start_play(game) once the game (play loop) starts
+    - record_*() for every action, next_frame() at the end of every frame
+    - end_episode(game) when the episode ends, which saves the replay
+    """
+    MAX_REPLAYS = 100  # only the latest replays are kept
+
+    def __init__(self, directory: str = "data/replays", max_replays: int = MAX_REPLAYS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_replays = max_replays
+
+        self.recording = False
+        self.num_episodes = 0  # number of episodes started in this game/environment
+        self.seed: Optional[int] = None
+        self.metadata: dict = {}
+        self.reset_random_state: bytes = b''
+        self.play_random_state: bytes = b''
+        self.frames: list[list[tuple[int, tuple[int, ...]]]] = []
+        self.events: list[tuple[int, tuple[int, ...]]] = []  # events of the current frame
+
+    def set_seed(self, seed: Optional[int]) -> None:
+        """ Stores the seed that was used for the next episode, just for reference. """
+        self.seed = seed
+
+    def start_episode(self, game, env_class: type = None) -> None:
+        """
+        Call right before the game gets reset.
+        :param game: FlappyBird instance (or an environment)
+        :param env_class: environment class, if the episode is played in an environment (and not in Mode.PLAY)
+        """
+        self.reset_random_state = get_random_state()
+        self.metadata = {
+            'env_class': get_class_path(env_class) if env_class is not None else None,
+            'seed': self.seed,
+            'human_player': game.human_player,
+            'episode': self.num_episodes,  # environments carry some state over between episodes, see Replay.may_desync
+            'created': datetime.now(timezone.utc).isoformat(),
+        }
+        self.num_episodes += 1
+        self.seed = None
+        self.recording = False
+
+    def start_play(self, game) -> None:
+        """ Call once the episode actually starts (in Mode.PLAY, after the start screen). """
+        self.play_random_state = get_random_state()
+        self.metadata['human_player'] = game.human_player
+        self.frames = []
+        self.events = []
+        self.recording = True
+
+    def record_agent_action(self, action) -> None:
+        if np.ndim(action) == 0:
+            self._record(AGENT_ACTION_SCALAR, (int(action),))
+        else:
+            self._record(AGENT_ACTION, tuple(int(value) for value in np.ravel(action)))
+
+    def record_entity_action(self, entity, action) -> None:
+        values = tuple(int(value) for value in np.ravel(action))
+        if isinstance(entity, CloudSkimmer):
+            self._record(CLOUDSKIMMER_ACTION, (entity.id, *values))
+        else:
+            self._record(PLAYER_ACTION, values)
+
+    def record_key(self, key: int) -> None:
+        if key in RECORDED_KEYS:
+            self._record(KEY_DOWN, (key,))
+
+    def record_mouse_left(self) -> None:
+        self._record(MOUSE_LEFT, ())
+
+    def _record(self, code: int, values: tuple[int, ...]) -> None:
+        if self.recording:
+            self.events.append((code, values))
+
+    def next_frame(self) -> None:
+        if self.recording:
+            self.frames.append(self.events)
+            self.events = []
+
+    def end_episode(self, game) -> Optional[Path]:
+        """
+        Saves the recorded episode, together with the hash of the final game state.
+        :return: path of the saved replay, or None if nothing was being recorded
+        """
+        if not self.recording:
+            return None
+        self.recording = False
+
+        self.metadata['num_frames'] = len(self.frames)
+        self.metadata['score'] = game.score.score
+        self.metadata['state_hash'] = get_state_hash(game)
+        replay = Replay(self.metadata, self.reset_random_state, self.play_random_state, self.frames)
+
+        path = self.directory / f"replay_{datetime.now().strftime('%Y%m%d_%H%M%S%f')}.fbr"
+        replay.save(path)
+        printc(f"[INFO] Replay saved to {path} ({len(self.frames)} frames, score {game.score.score})", color="blue")
+
+        self.frames = []
+        self.delete_old_replays()
+        return path
+
+    def delete_old_replays(self) -> None:
+        replays = sorted(self.directory.glob('*.fbr'))
+        for path in replays[:max(0, len(replays) - self.max_replays)]:
+            path.unlink(missing_ok=True)  # might have been deleted by another process already
@@ -0,0 +1,112 @@
+import importlib
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import pygame
+
+from src.flappybird import FlappyBird
+from src.utils import DummySounds, printc
+from .replay import Replay, ReplayPlayer, set_random_state
+from .state_hash import get_state_hash
+
+
+def resimulate(path: str | Path, verbose: bool = True,
+               on_frame: Optional[Callable[[FlappyBird, int], None]] = None) -> bool:
+    """
+    Re-simulates a recorded episode as fast as possible (no FPS cap, nothing is drawn, no sounds), feeding it the
+    recorded actions instead of the policies/human player, then checks that the final state hash matches the recorded one.
+
+    :param path: path of the replay file
+    :param verbose: print the result
+    :param on_frame: called with the game (or environment) and the frame index after every re-simulated frame
+    :return: True if the final state matches the recorded one, False otherwise
+    """
+    replay = Replay.load(path)
+    replay_player = ReplayPlayer(replay)
+    env_class_path = replay.metadata['env_class']
+    if replay.may_desync and verbose:
+        printc(f"[WARN] {Path(path).name} is episode {replay.metadata['episode'] + 1} recorded in the same environment. "
+               f"The environment's own state from the earlier episodes isn't recorded, so the re-simulation might not "
+               f"match.", color="orange")
+
+    start_time = time.perf_counter()
+    if env_class_path is None:
+        game = _resimulate_game(replay, replay_player, on_frame)
+    else:
+        game = _resimulate_env(replay, replay_player, env_class_path, on_frame)
+    duration = time.perf_counter() - start_time
+
+    state_hash = get_state_hash(game)
+    matches = state_hash == replay.metadata['state_hash']
+    if verbose:
+        num_frames = min(replay_player.frame_index + 1, replay.num_frames)
+        printc(f"[INFO] Re-simulated {num_frames} frames of {Path(path).name} in {duration:.2f}s "
+               f"({num_frames / max(duration, 1e-9):.0f} FPS), score {game.score.score}", color="blue")
+        if matches:
+            printc("[INFO] Final state hash matches the recording.", color="green")
+        else:
+            printc(f"[WARN] Final state hash does NOT match the recording!\n"
+                   f"  recorded:      {replay.metadata['state_hash']}\n"
+                   f"  re-simulated:  {state_hash}", color="orange")
+    return matches
+
+
+def _resimulate_game(replay: Replay, replay_player: ReplayPlayer, on_frame: Optional[Callable]) -> FlappyBird:
+    """ Re-simulates an episode recorded in Mode.PLAY (see FlappyBird.play()). """
+    from src.ai.controllers import AdvancedFlappyModelController, EnemyCloudSkimmerModelController
+
+    game = FlappyBird()
+    _make_headless(game)
+    game.human_player = replay.metadata['human_player']
+    # perform_action() is a static method, so the classes can be used instead of the controllers (no models needed)
+    game.flappy_controller = AdvancedFlappyModelController
+    game.enemy_cloudskimmer_controller = EnemyCloudSkimmerModelController
+    game.replay_player = replay_player
+
+    set_random_state(replay.reset_random_state)
+    game.reset(create_menus=False)  # the start screen is skipped
+    set_random_state(replay.play_random_state)  # in case the start screen used any random numbers
+    game.start_play()
+
+    while replay_player.next_frame():
+        events = [pygame.event.Event(pygame.KEYDOWN, key=key) for key in replay_player.get_pressed_keys()]
+        if game.play_frame(events, replay_player.is_mouse_left_pressed()):
+            break
+        if on_frame is not None:
+            on_frame(game, replay_player.frame_index)
+    return game
+
+
+def _resimulate_env(replay: Replay, replay_player: ReplayPlayer, env_class_path: str, on_frame: Optional[Callable]):
+    """ Re-simulates an episode recorded in an environment (see GymEnv.step()). """
+    from src.ai.environments.gym_env import GymEnv
+
+    module_name, class_name = env_class_path.rsplit('.', 1)
+    env_class = getattr(importlib.import_module(module_name), class_name)
+
+    game_env = env_class()
+    _make_headless(game_env)
+    game_env.replay_player = replay_player
+    gym_env = GymEnv(game_env)
+
+    set_random_state(replay.reset_random_state)
+    game_env.reset_env()
+    set_random_state(replay.play_random_state)
+    gym_env.clip_observation(game_env.get_observation())
+
+    while replay_player.next_frame():
+        _, _, terminated, truncated, _ = gym_env.step(replay_player.get_agent_action())
+        if terminated or truncated:
+            break
+        if on_frame is not None:
+            on_frame(game_env, replay_player.frame_index)
+    return game_env
+
+
+def _make_headless(game: FlappyBird) -> None:
+    game.replay_recorder = None  # don't record the re-simulation itself
+    game.config.render = False
+    game.config.fps = 0
+    game.config.sounds.pause_background_music()
+    game.config.sounds = DummySounds()
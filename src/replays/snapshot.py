@@ -0,0 +1,334 @@
+"""
+Snapshots of the simulation state, so a game (or an environment) can be restored to the exact same state later.
+
+Snapshot format:
+- magic bytes b'FBSS', the format version (uint8) and the schema fingerprint (8 bytes, see get_schema_fingerprint())
+- random state (see get_random_state())
+- pickled state of the entities: player, pipes, score, inventory, items, enemy groups (with their bullets)...
+
+Pygame objects can't be pickled, so shared resources (images, rotated images, masks, fonts) are stored as keys
+that tell us where to find them again, and the game itself (config, game state manager...) is stored as a reference
+to the game the snapshot is restored into. Only surfaces that aren't shared (which should be rare) are stored as pixels.
+
+Snapshots get passed around (see start_states.py), and unpickling can call anything the pickle names, so only the
+classes entities are made of (and the few NumPy & pygame functions that recreate arrays, vectors & rects) can be loaded.
+The entities are pickled as they are, so a snapshot only fits the entity classes it was taken with - the schema
+fingerprint changes whenever one of its classes is renamed or its attributes change, and restoring it fails then.
+"""
+
+import ast
+import hashlib
+import importlib
+import inspect
+import io
+import pickle
+import struct
+import textwrap
+from enum import Enum
+from functools import lru_cache
+from typing import Iterable, Optional
+from weakref import WeakKeyDictionary
+
+import numpy as np
+import pygame
+
+from src.utils import Images, get_mask, get_font, rotation_cache
+from src.utils.images import PLAYER_IMG_NAMES, get_player_frames
+from src.utils.text import loaded_fonts
+from src.utils.utils import cached_masks
+from .replay import get_random_state, set_random_state, RANDOM_STATE_SIZE
+
+MAGIC = b'FBSS'
+VERSION = 2
+HEADER = struct.Struct('<4sB8s')
+
+# attributes of FlappyBird that make up the simulation state
+SNAPSHOT_ATTRIBUTES = ('player', 'pipes', 'score', 'inventory', 'item_manager', 'enemy_manager', 'floor',
+                       'next_closest_pipe_pair')
+# attributes of FlappyBird that entities reference, but belong to the game - they're not part of the snapshot
+GAME_REFERENCES = ('config', 'gsm', 'bullet_broad_phase')
+# modules (and their submodules) whose classes can be loaded from snapshots
+SNAPSHOT_CLASS_MODULES = ('src.entities', 'src.ai.environments', 'src.utils.animation', 'src.utils.game_state')
+SNAPSHOT_CLASS_PREFIXES = tuple(f"{module_name}." for module_name in SNAPSHOT_CLASS_MODULES)
+# anything else that can be loaded from snapshots
+SNAPSHOT_GLOBALS = {
+    ('numpy', 'dtype'), ('numpy', 'ndarray'),
+    ('numpy.core.numeric', '_frombuffer'), ('numpy.core.multiarray', '_reconstruct'), ('numpy.core.multiarray', 'scalar'),
+    ('numpy._core.numeric', '_frombuffer'), ('numpy._core.multiarray', '_reconstruct'), ('numpy._core.multiarray', 'scalar'),
+    ('pygame', '__rect_constructor'), ('pygame.math', 'Vector2'),
+}
+
+_image_keys: WeakKeyDictionary[Images, dict[pygame.Surface, tuple]] = WeakKeyDictionary()
+
+
+def take_snapshot(game, classes: set[type] = None) -> bytes:
+    """
+    Returns the simulation state of the game (or environment), packed into bytes.
+    Environment specific state (step counters, observations...) isn't included.
+
+    :param game: FlappyBird instance (or an environment)
+    :param classes: if given, the classes in the snapshot are added to it (e.g. to fingerprint a whole start state library)
+    :return: the snapshot
+    """
+    file = io.BytesIO()
+    file.write(HEADER.pack(MAGIC, VERSION, bytes(8)))  # the fingerprint is filled in once all classes are known
+    file.write(get_random_state())
+    state = {
+        'attributes': {attribute: getattr(game, attribute) for attribute in SNAPSHOT_ATTRIBUTES},
+        'game_state': game.gsm.get_state(),
+    }
+    pickler = _SnapshotPickler(file, game)
+    pickler.dump(state)
+    if classes is not None:
+        classes.update(pickler.classes)
+    snapshot = file.getbuffer()
+    HEADER.pack_into(snapshot, 0, MAGIC, VERSION, get_schema_fingerprint(pickler.classes))
+    return bytes(snapshot)
+
+
+def restore_snapshot(game, snapshot: bytes | memoryview, restore_random_state: bool = True) -> None:
+    """
+    Restores the game (or environment) to the state from the snapshot.
+    The snapshot can be restored into any game, not just the one it was taken from.
+
+    :param game: FlappyBird instance (or an environment)
+    :param snapshot: bytes created by take_snapshot()
+    :param restore_random_state: whether to restore the random generators as well; if not, the game continues
+                                 differently every time the same snapshot is restored
+    """
+    snapshot = memoryview(snapshot)
+    magic, version, fingerprint = HEADER.unpack_from(snapshot)
+    if magic != MAGIC:
+        raise ValueError("Not a snapshot.")
+    if version != VERSION:
+        raise ValueError(f"Snapshot has version {version}, but only version {VERSION} is supported.")
+
+    offset = HEADER.size
+    random_state = snapshot[offset:offset + RANDOM_STATE_SIZE]
+    unpickler = _SnapshotUnpickler(io.BytesIO(snapshot[offset + RANDOM_STATE_SIZE:]), game)
+    state = unpickler.load()
+    if get_schema_fingerprint(unpickler.classes) != fingerprint:
+        raise ValueError("Snapshot was taken with different entity classes, take it (or harvest the start states) again.")
+
+    for attribute, value in state['attributes'].items():
+        setattr(game, attribute, value)
+    game.gsm.set_state(state['game_state'])
+    if restore_random_state:
+        set_random_state(bytes(random_state))
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, game):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.game_references = {id(game): ('game',)}
+        self.game_references.update((id(getattr(game, name)), ('game', name)) for name in GAME_REFERENCES)
+        self.image_keys = _get_image_keys(game.config.images)
+        self.transformed_image_keys: Optional[dict[int, tuple]] = None  # built when needed
+        self.mask_images: Optional[dict[int, pygame.Surface]] = None  # built when needed
+        self.classes: set[type] = set()  # classes the snapshot contains (instances of), see get_schema_fingerprint()
+
+    def reducer_override(self, obj):
+        # unlike persistent_id(), this isn't called for the most common objects (numbers, strings, lists...)
+        obj_type = type(obj)
+        if obj_type is pygame.Surface:
+            key = self.get_surface_key(obj)
+        elif obj_type is pygame.mask.Mask:
+            key = self.get_mask_key(obj)
+        elif obj_type is pygame.font.Font:
+            key = self.get_font_key(obj)
+        else:
+            key = self.game_references.get(id(obj))
+            if key is None:
+                cls = obj if isinstance(obj, type) else obj_type
+                if f"{cls.__module__}.".startswith(SNAPSHOT_CLASS_PREFIXES):
+                    self.classes.add(cls)
+                return NotImplemented
+        return _reference, key
+
+    def get_surface_key(self, surface: pygame.Surface) -> tuple:
+        key = self.image_keys.get(surface)
+        if key is not None:
+            return key
+
+        # rotated & flipped images are shared through the rotation cache
+        if self.transformed_image_keys is None:
+            self.transformed_image_keys = {id(image): cache_key for cache_key, image in rotation_cache.cache.items()}
+        cache_key = self.transformed_image_keys.get(id(surface))
+        if cache_key is not None:
+            return (cache_key[0], self.get_surface_key(cache_key[1])) + cache_key[2:]
+
+        width, height = surface.get_size()
+        return 'pixels', width, height, pygame.image.tobytes(surface, 'RGBA')
+
+    def get_mask_key(self, mask: pygame.mask.Mask) -> tuple:
+        # masks are cached per image, see get_mask()
+        if self.mask_images is None:
+            self.mask_images = {id(cached_mask): image for image, cached_mask in cached_masks.items()}
+        image = self.mask_images.get(id(mask))
+        if image is not None:
+            return 'mask', self.get_surface_key(image)
+
+        width, height = mask.get_size()
+        bits = pygame.image.tobytes(mask.to_surface(setcolor=(255, 255, 255, 255), unsetcolor=(0, 0, 0, 0)), 'RGBA')
+        return 'mask_bits', width, height, np.packbits(np.frombuffer(bits, dtype=np.uint8)[3::4] > 0).tobytes()
+
+    @staticmethod
+    def get_font_key(font: pygame.font.Font) -> tuple:
+        for key, loaded_font in loaded_fonts.items():
+            if loaded_font is font:
+                path, size = key.rsplit('-', 1)
+                return 'font', path, int(size)
+        raise pickle.PicklingError("Only fonts loaded with get_font() can be snapshotted.")
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, game):
+        super().__init__(file)
+        self.game = game
+        self.images = game.config.images
+        self.classes: set[type] = set()  # classes the snapshot contains, see get_schema_fingerprint()
+
+    def find_class(self, module_name: str, name: str):
+        if module_name == __name__ and name == _reference.__name__:
+            return self.get_reference
+        if module_name == 'builtins' and name == 'getattr':  # used for bound methods
+            return _get_bound_method
+        if (module_name, name) in SNAPSHOT_GLOBALS:
+            return super().find_class(module_name, name)
+
+        cls = load_snapshot_class(module_name, name)
+        self.classes.add(cls)
+        return cls
+
+    def get_reference(self, *key):
+        match key[0]:
+            case 'game':
+                return self.game if len(key) == 1 else getattr(self.game, key[1])
+            case 'mask':
+                return get_mask(self.get_surface(key[1]))
+            case 'mask_bits':
+                _, width, height, bits = key
+                alpha = np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=width * height) * 255
+                pixels = np.zeros((width * height, 4), dtype=np.uint8)
+                pixels[:, 3] = alpha
+                return pygame.mask.from_surface(pygame.image.frombytes(pixels.tobytes(), (width, height), 'RGBA'))
+            case 'font':
+                return get_font(key[1], key[2])
+        return self.get_surface(key)
+
+    def get_surface(self, key: tuple) -> pygame.Surface:
+        match key[0]:
+            case 'images':
+                return _get_image(self.images, key[1:])
+            case 'player':
+                return get_player_frames(key[1])[key[2]]
+            case 'rotate':
+                # the angle was already rounded when the image was rotated, so it has to be used as is
+                return rotation_cache.rotate(self.get_surface(key[1]), key[2], angle_step=None)
+            case 'flip':
+                return rotation_cache.flip(self.get_surface(key[1]), key[2], key[3])
+            case 'pixels':
+                _, width, height, pixels = key
+                return pygame.image.frombytes(pixels, (width, height), 'RGBA').convert_alpha()
+        raise pickle.UnpicklingError(f"Unknown snapshot reference '{key[0]}'.")
+
+
+def load_snapshot_class(module_name: str, name: str) -> type:
+    """
+    Returns a class that can be loaded from snapshots: defined in one of SNAPSHOT_CLASS_MODULES (not just imported
+    there, e.g. 'subprocess.Popen').
+    :raises pickle.UnpicklingError: if the class can't be loaded from snapshots (or doesn't exist anymore)
+    """
+    if f"{module_name}.".startswith(SNAPSHOT_CLASS_PREFIXES) and '.' not in name:
+        try:
+            cls = getattr(importlib.import_module(module_name), name)
+        except (ImportError, AttributeError) as e:
+            raise pickle.UnpicklingError(f"Snapshot is outdated, '{module_name}.{name}' doesn't exist anymore.") from e
+        if isinstance(cls, type) and cls.__module__ == module_name:
+            return cls
+    raise pickle.UnpicklingError(f"'{module_name}.{name}' can't be loaded from a snapshot.")
+
+
+def get_schema_fingerprint(classes: Iterable[type]) -> bytes:
+    """
+    Fingerprint of what the pickled state of the classes looks like: their names and the names of their attributes.
+    Snapshots & start state libraries store it, so they can't be restored into entities that changed in the meantime.
+    """
+    return _get_schema_fingerprint(frozenset(classes))
+
+
+@lru_cache(maxsize=None)
+def _get_schema_fingerprint(classes: frozenset[type]) -> bytes:
+    schema = '\n'.join(sorted(_get_class_schema(cls) for cls in classes))
+    return hashlib.sha256(schema.encode('utf-8')).digest()[:8]
+
+
+@lru_cache(maxsize=None)
+def _get_class_schema(cls: type) -> str:
+    """ Class name and the attributes its methods (and those of its base classes) assign to self. """
+    if issubclass(cls, Enum):
+        return f"{cls.__module__}.{cls.__qualname__}:{','.join(cls.__members__)}"
+    attributes = set()
+    for klass in cls.__mro__:
+        if not klass.__module__.startswith('src.'):
+            continue
+        try:
+            source = textwrap.dedent(inspect.getsource(klass))
+        except (OSError, TypeError):
+            continue
+        for node in ast.walk(ast.parse(source)):
+            if (isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Store)
+                    and isinstance(node.value, ast.Name) and node.value.id == 'self'):
+                attributes.add(node.attr)
+    return f"{cls.__module__}.{cls.__qualname__}:{','.join(sorted(attributes))}"
+
+
+def _get_bound_method(obj, name: str):
+    """ Stands in for getattr(), which pickle uses for bound methods - only methods of the game's objects are allowed. """
+    if not name.startswith('__') and type(obj).__module__.startswith('src.'):
+        method = getattr(obj, name, None)
+        if inspect.ismethod(method):
+            return method
+    raise pickle.UnpicklingError(f"'{type(obj).__name__}.{name}' can't be loaded from a snapshot.")
+
+
+def _reference(*key):
+    """ Stands in for the objects the snapshot only references (see the module docstring). """
+    raise pickle.UnpicklingError("Snapshots can only be loaded with restore_snapshot().")
+
+
+def _get_image_keys(images: Images) -> dict[pygame.Surface, tuple]:
+    """
+    Returns where each image can be found: ('player', player id, frame) for the player frames of every player variant,
+    ('images', attribute, index or key, ...) for the rest of the images.
+    """
+    image_keys = _image_keys.get(images)
+    if image_keys is not None:
+        return image_keys
+
+    image_keys = {}
+    for player_id in range(len(PLAYER_IMG_NAMES)):
+        for frame, image in enumerate(get_player_frames(player_id)):
+            image_keys[image] = ('player', player_id, frame)
+
+    def add(value, key: tuple) -> None:
+        if isinstance(value, pygame.Surface):
+            image_keys.setdefault(value, key)
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                add(item, key + (index,))
+        elif isinstance(value, dict):
+            for name, item in value.items():
+                add(item, key + (name,))
+
+    for attribute, value in vars(images).items():
+        add(value, ('images', attribute))
+    _image_keys[images] = image_keys
+    return image_keys
+
+
+def _get_image(images: Images, key: tuple) -> pygame.Surface:
+    value = getattr(images, key[0])
+    for index in key[1:]:
+        value = value[index]
+    return value
@@ -0,0 +1,226 @@
+"""
+Start state library: mid-game snapshots harvested from real games (recorded replays), which environments sample their
+start states from, instead of always starting a new game (see BaseEnv.restore_start_state()).
+
+Library file format (all numbers are little-endian):
+- magic bytes b'FBSL' and the format version (uint8)
+- length of the JSON metadata (uint32) and the metadata itself (tag names, sources, number of states, the classes in
+  the snapshots & their schema fingerprint...)
+- index: for each state, its offset & size in the file, its tags (bit mask of START_STATE_TAGS) and its source
+  (index in metadata['sources'], the environment class the replay was recorded in, or None for Mode.PLAY)
+- the snapshots themselves (see snapshot.py), uncompressed, so they can be restored straight from the memory-mapped file
+
+The file is memory-mapped, so all environment processes share the same pages and only the sampled states are read.
+Libraries only fit the entity classes they were harvested with, so they're rejected once those classes change (the
+snapshots would be too, but only when they're sampled - in the middle of training).
+"""
+
+import json
+import mmap
+import pickle
+import random
+import struct
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src.entities import CloudSkimmer, SkyDart
+from src.utils import printc, get_git_commit
+from .replay import Replay, get_class_path
+from .snapshot import take_snapshot, load_snapshot_class, get_schema_fingerprint
+
+MAGIC = b'FBSL'
+VERSION = 2
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('size', '<u4'), ('tags', '<u4'), ('source', '<u2')])
+
+START_STATE_TAGS = (
+    'enemies',  # at least one enemy group is alive
+    'cloudskimmers',  # the first enemy group is a full CloudSkimmer group (what the CloudSkimmer environments expect)
+    'skydarts',  # a SkyDart is alive
+    'low_hp',  # the player has at most half of their HP
+)
+LOW_HP = 50
+
+
+def get_start_state_tags(game) -> int:
+    """ Returns the tags of the current game state, as a bit mask of START_STATE_TAGS. """
+    groups = game.enemy_manager.spawned_enemy_groups
+    tags = set()
+    if groups:
+        tags.add('enemies')
+        first_members = groups[0].members
+        if len(first_members) == 3 and all(isinstance(member, CloudSkimmer) for member in first_members):
+            tags.add('cloudskimmers')
+        if any(isinstance(member, SkyDart) for group in groups for member in group.members):
+            tags.add('skydarts')
+    if game.player.hp_bar.current_value <= LOW_HP:
+        tags.add('low_hp')
+    return get_tags_mask(tags)
+
+
+def get_tags_mask(tags) -> int:
+    mask = 0
+    for tag in tags:
+        mask |= 1 << START_STATE_TAGS.index(tag)
+    return mask
+
+
+class StartStateLibrary:
+    """
+    Read-only, memory-mapped start state library, created by harvest_start_states().
+
+    :param path: path of the library file
+    """
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' is not a start state library.")
+        version, metadata_len = struct.unpack_from('<BI', self.data, len(MAGIC))
+        if version != VERSION:
+            raise ValueError(f"Start state library '{path}' has version {version}, "
+                             f"but only version {VERSION} is supported.")
+        offset = len(MAGIC) + struct.calcsize('<BI')
+        self.metadata: dict = json.loads(self.data[offset:offset + metadata_len].decode('utf-8'))
+        offset += metadata_len
+
+        if self.metadata['tags'] != list(START_STATE_TAGS):
+            raise ValueError(f"Start state library '{path}' was harvested with different tags, harvest it again.")
+        if not self.has_current_schema():
+            raise ValueError(f"Start state library '{path}' was harvested with different entity classes, harvest it again.")
+        self.index = np.frombuffer(self.data, dtype=INDEX_DTYPE, count=self.metadata['num_states'], offset=offset)
+        self.sources: list[Optional[str]] = self.metadata['sources']
+        self.candidates: dict[tuple[int, Optional[str]], np.ndarray] = {}  # cached indices of the matching states
+
+    def has_current_schema(self) -> bool:
+        """ Whether the classes in the snapshots still look like they did when the library was harvested. """
+        try:
+            classes = [load_snapshot_class(*class_path.rsplit('.', 1)) for class_path in self.metadata['classes']]
+        except pickle.UnpicklingError:  # a class doesn't exist anymore
+            return False
+        return get_schema_fingerprint(classes).hex() == self.metadata['schema']
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get_candidates(self, required_tags: int, source: Optional[str]) -> np.ndarray:
+        """
+        :param required_tags: bit mask of the tags the states must have
+        :param source: environment class path - states harvested from Mode.PLAY and from this environment match
+        :return: indices of the matching states
+        """
+        key = (required_tags, source)
+        if key not in self.candidates:
+            sources = [index for index, state_source in enumerate(self.sources) if state_source in (None, source)]
+            matches = ((self.index['tags'] & required_tags) == required_tags) & np.isin(self.index['source'], sources)
+            self.candidates[key] = np.flatnonzero(matches)
+        return self.candidates[key]
+
+    def sample(self, required_tags: tuple[str, ...] = (), source: Optional[str] = None) -> Optional[memoryview]:
+        """
+        Returns a random matching snapshot (a view of the memory-mapped file, nothing is copied), or None if no state
+        matches.
+        """
+        candidates = self.get_candidates(get_tags_mask(required_tags), source)
+        if not len(candidates):
+            return None
+        offset, size = self.index[candidates[random.randrange(len(candidates))]][['offset', 'size']]
+        return memoryview(self.data)[int(offset):int(offset) + int(size)]
+
+
+@lru_cache(maxsize=None)
+def load_start_state_library(name: str, directory: str = "data/start_states") -> StartStateLibrary:
+    """ Loads the library once per process - every environment in the process samples from the same mapping. """
+    library = StartStateLibrary(Path(directory) / name)
+    printc(f"[INFO] Loaded {len(library)} start states from {library.path}", color="blue")
+    return library
+
+
+def save_start_state_library(path: str | Path, states: list[tuple[bytes, int, Optional[str]]], classes: set[type],
+                             metadata: dict = None) -> None:
+    """
+    :param path: path of the library file
+    :param states: list of (snapshot, tags bit mask, source environment class path or None)
+    :param classes: classes in the snapshots, collected by take_snapshot()
+    :param metadata: additional metadata to store in the file
+    """
+    sources = list(dict.fromkeys(source for _, _, source in states))
+    metadata = dict(metadata or {}, tags=list(START_STATE_TAGS), sources=sources, num_states=len(states),
+                    classes=sorted(get_class_path(cls) for cls in classes), schema=get_schema_fingerprint(classes).hex())
+    metadata = json.dumps(metadata).encode('utf-8')
+
+    index = np.zeros(len(states), dtype=INDEX_DTYPE)
+    offset = len(MAGIC) + struct.calcsize('<BI') + len(metadata) + index.nbytes
+    for i, (snapshot, tags, source) in enumerate(states):
+        index[i] = (offset, len(snapshot), tags, sources.index(source))
+        offset += len(snapshot)
+
+    with open(path, 'wb') as file:
+        file.write(MAGIC + struct.pack('<BI', VERSION, len(metadata)) + metadata)
+        file.write(index.tobytes())
+        for snapshot, _, _ in states:
+            file.write(snapshot)
+
+
+def harvest_start_states(replay_directory: str = "data/replays", directory: str = "data/start_states",
+                         every_n_frames: int = 30, skip_last_frames: int = 15, max_per_replay: int = 50) -> Path:
+    """
+    Re-simulates every replay in the directory and takes a snapshot every n frames, if the state is interesting
+    (it has at least one tag, e.g. enemies are alive or the player has low HP). States from the last frames before the
+    episode ended are skipped, as there's nothing left to learn from them. Replays that don't re-simulate correctly
+    (see Replay.may_desync) are skipped as well.
+
+    :param replay_directory: directory with the replays to harvest
+    :param directory: directory to save the library to
+    :param every_n_frames: take a snapshot every n frames
+    :param skip_last_frames: number of frames before the end of the episode without snapshots
+    :param max_per_replay: maximum number of states harvested from a single replay
+    :return: path of the saved library
+    """
+    from .resimulator import resimulate  # imports FlappyBird, which imports this package
+
+    replays = sorted(Path(replay_directory).glob('*.fbr'))
+    if not replays:
+        raise FileNotFoundError(f"No replays found in '{replay_directory}'.")
+
+    states = []
+    classes = set()
+    num_harvested_replays = 0
+    for replay_path in replays:
+        replay = Replay.load(replay_path)
+        last_frame = replay.num_frames - skip_last_frames
+        replay_states = []
+
+        def on_frame(game, frame_index: int) -> None:
+            if frame_index % every_n_frames or frame_index >= last_frame or len(replay_states) >= max_per_replay:
+                return
+            tags = get_start_state_tags(game)
+            if tags:
+                replay_states.append((take_snapshot(game, classes), tags, replay.metadata['env_class']))
+
+        if resimulate(replay_path, verbose=False, on_frame=on_frame):
+            states.extend(replay_states)
+            num_harvested_replays += 1
+            printc(f"[INFO] Harvested {len(replay_states)} start states from {replay_path.name}", color="blue")
+        else:
+            reason = " (not the first episode recorded in its environment)" if replay.may_desync else ""
+            printc(f"[WARN] {replay_path.name} doesn't re-simulate correctly{reason}, skipping it.", color="orange")
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    path = Path(directory) / f"start_states_{datetime.now().strftime('%Y%m%d_%H%M%S')}.fbsl"
+    save_start_state_library(path, states, classes, metadata={
+        'created': datetime.now().isoformat(),
+        'commit': get_git_commit(),
+        'num_replays': num_harvested_replays,
+    })
+    printc(f"[INFO] Saved {len(states)} start states from {num_harvested_replays} replays to {path} "
+           f"({path.stat().st_size / 1024:.0f} KB)", color="green")
+    for i, tag in enumerate(START_STATE_TAGS):
+        num_tagged = sum(1 for _, tags, _ in states if tags & (1 << i))
+        printc(f"  {tag}: {num_tagged}", color="gray")
+    return path
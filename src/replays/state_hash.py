@@ -0,0 +1,41 @@
+import hashlib
+import random
+
+import numpy as np
+
+
+def get_state_hash(game) -> str:
+    """
+    Returns a hash of the game state that matters for the simulation: the score, the player, pipes, spawned items,
+    enemies, bullets, inventory and the state of the random generators. Things that only affect how the game looks
+    (background, floor scrolling, particles...) are left out, so a headless re-simulation hashes the same.
+
+    :param game: FlappyBird instance (or an environment)
+    :return: hex digest of the state
+    """
+    player = game.player
+    state = [
+        ('score', game.score.score),
+        ('player', player.x, player.y, player.vel_y, player.rotation,
+         player.hp_bar.current_value, player.shield_bar.current_value, player.food_bar.current_value),
+        ('pipes', [(pipe.x, pipe.y) for pipe in game.pipes.upper + game.pipes.lower]),
+        ('items', [(item.item_name.value, item.x, item.y) for item in game.item_manager.spawned_items]),
+        ('inventory', [(slot.item.item_name.value, slot.item.quantity) for slot in game.inventory.inventory_slots]),
+    ]
+
+    guns = [game.inventory.inventory_slots[0].item]
+    for group in game.enemy_manager.spawned_enemy_groups:
+        for enemy in group.members:
+            state.append(('enemy', type(enemy).__name__, enemy.x, enemy.y, enemy.hp_bar.current_value))
+            if hasattr(enemy, 'gun'):
+                guns.append(enemy.gun)
+
+    # shot bullets are stored in sets, so sort them to get the same order every time
+    bullets = sorted((bullet.x, bullet.y, bullet.velocity.x, bullet.velocity.y)
+                     for gun in guns for bullet in getattr(gun, 'shot_bullets', ()))
+    state.append(('bullets', bullets))
+
+    _, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    state.append(('random', random.getstate(), keys.tobytes(), pos, has_gauss, cached_gaussian))
+
+    return hashlib.sha256(repr(state).encode('utf-8')).hexdigest()
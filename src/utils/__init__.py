@@ -1,10 +1,14 @@
 from .animation import Animation
+from .frame_profiler import FrameProfiler
 from .game_config import GameConfig
 from .game_state import GameState, GameStateManager
 from .image_style import apply_outline_and_shadow
-from .images import Images, load_image, animation_spritesheet_to_frames
+from .images import Images, load_image, animation_spritesheet_to_frames, preload_images
 from .persistance import SettingsManager, ResultsManager
+from .render_queue import RenderQueue
+from .rotation_cache import RotationCache, rotation_cache
 from .sounds import Sounds, DummySounds
-from .text import Fonts, get_font, flappy_text
-from .utils import get_random_value, get_mask, pixel_collision, rotate_on_pivot, printc, one_hot, set_random_seed
+from .text import Fonts, get_font, flappy_text, render_text
+from .utils import get_random_value, get_mask, pixel_collision, rotate_on_pivot, printc, one_hot, set_random_seed, \
+    get_git_commit
 from .window import Window
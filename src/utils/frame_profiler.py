@@ -0,0 +1,209 @@
+import atexit
+import csv
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pygame
+
+from .text import Fonts, get_font
+from .utils import printc
+
+
+class FrameProfilerSection:
+    """ Times a single section of a frame, use it as a context manager. """
+    __slots__ = ('profiler', 'index', 'start_time')
+
+    def __init__(self, profiler: 'FrameProfiler', index: int):
+        self.profiler = profiler
+        self.index = index
+        self.start_time = 0.0
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.current_frame[self.index] += time.perf_counter() - self.start_time
+
+
+class DisabledSection:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+DISABLED_SECTION = DisabledSection()
+
+
+class FrameProfiler:
+    """
+    Lightweight per-subsystem frame timer - a much cheaper alternative to cProfile, for finding out which subsystem
+    spikes when a frame misses its time budget.
+
+    Times of the last WINDOW_SIZE frames are used for the rolling percentiles (p50/p95/p99), which can be shown in a
+    debug overlay (toggled with F3). All frames of the run (up to MAX_RECORDED_FRAMES) are exported to CSV & JSON,
+    together with the number of frames that missed the budget and which section took the longest in each of them.
+
+    When disabled, measure() returns a no-op section, so the instrumentation costs next to nothing.
+    """
+    SECTIONS = ('entity_actions', 'events', 'collisions', 'background', 'pipes', 'floor', 'item_manager', 'player',
+                'enemy_manager', 'inventory', 'score', 'display', 'clock')
+    WINDOW_SIZE = 300  # number of the latest frames used for the rolling percentiles
+    MAX_RECORDED_FRAMES = 200_000  # number of frames kept for the export
+    OVERLAY_REFRESH_INTERVAL = 15  # frames between overlay updates, so re-rendering the text doesn't skew the timings
+    DEFAULT_FPS_BUDGET = 30  # used when the FPS isn't capped
+    instance_ids = itertools.count()  # every game has a profiler, so several can be created in the same second
+
+    def __init__(self, enabled: bool = True, fps: int = 0, directory: str = "data/profiles"):
+        self.enabled = enabled
+        self.frame_budget = 1 / (fps if fps > 0 else self.DEFAULT_FPS_BUDGET)
+        self.directory = Path(directory)
+        # workers started in the same second (and games in the same process) must not overwrite each other's exports
+        self.run_name = (f"frame_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+                         f"_{os.getpid()}_{next(self.instance_ids)}")
+
+        self.sections = {name: FrameProfilerSection(self, index) for index, name in enumerate(self.SECTIONS)}
+        self.clock_index = self.SECTIONS.index('clock')
+        self.current_frame = [0.0] * len(self.SECTIONS)
+        self.frame_start_time = None
+
+        # the last column is the total frame time
+        self.window = np.zeros((self.WINDOW_SIZE, len(self.SECTIONS) + 1), dtype=np.float64)
+        self.recorded_frames = np.zeros((1024, len(self.SECTIONS) + 1), dtype=np.float32)
+        self.num_frames = 0
+        self.num_exported_frames = 0
+        self.slow_frames = 0
+        self.slow_frame_culprits = {name: 0 for name in self.SECTIONS}  # section that took the longest in a slow frame
+
+        self.show_overlay = False
+        self.overlay_surface = None
+        self.font = None
+
+        if enabled:
+            atexit.register(self.export_if_needed)
+
+    def measure(self, name: str):
+        """
+        Times the code inside the with-block as the given section of the current frame.
+        :param name: one of SECTIONS
+        """
+        if not self.enabled:
+            return DISABLED_SECTION
+        return self.sections[name]
+
+    def begin_frame(self) -> None:
+        if self.enabled:
+            self.frame_start_time = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if not self.enabled or self.frame_start_time is None:
+            return
+
+        row = self.current_frame + [time.perf_counter() - self.frame_start_time]
+        self.window[self.num_frames % self.WINDOW_SIZE] = row
+        if self.num_frames < self.MAX_RECORDED_FRAMES:
+            if self.num_frames >= len(self.recorded_frames):
+                self.recorded_frames = np.concatenate((self.recorded_frames, np.zeros_like(self.recorded_frames)))
+            self.recorded_frames[self.num_frames] = row
+        self.num_frames += 1
+
+        # waiting for the clock (FPS cap) isn't work, so it doesn't count towards the budget
+        work_time = row[-1] - row[self.clock_index]
+        if work_time > self.frame_budget:
+            self.slow_frames += 1
+            culprit = max(range(self.clock_index), key=lambda index: row[index])
+            self.slow_frame_culprits[self.SECTIONS[culprit]] += 1
+
+        self.current_frame = [0.0] * len(self.SECTIONS)
+        self.frame_start_time = None
+
+    def get_percentiles(self, percentiles=(50, 95, 99)) -> dict[str, list[float]]:
+        """
+        Rolling percentiles of the latest frames, in milliseconds.
+        :return: section name -> list of values (one for each percentile), including 'frame' for the whole frame
+        """
+        window = self.window[:min(self.num_frames, self.WINDOW_SIZE)]
+        if len(window) == 0:
+            return {}
+        values = np.percentile(window, percentiles, axis=0) * 1000
+        return {name: values[:, index].tolist() for index, name in enumerate(self.SECTIONS + ('frame',))}
+
+    def toggle_overlay(self) -> None:
+        self.show_overlay = not self.show_overlay
+        self.overlay_surface = None
+
+    def draw_overlay(self, screen: pygame.Surface) -> None:
+        if not self.enabled or not self.show_overlay:
+            return
+        if self.overlay_surface is None or self.num_frames % self.OVERLAY_REFRESH_INTERVAL == 0:
+            self.overlay_surface = self.render_overlay()
+        screen.blit(self.overlay_surface, (10, 10))
+
+    def render_overlay(self) -> pygame.Surface:
+        if self.font is None:
+            self.font = get_font(Fonts.FONT_FLAPPY, 18)
+
+        lines = [f"{'ms':<15}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, (p50, p95, p99) in self.get_percentiles().items():
+            lines.append(f"{name:<15}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+        lines.append(f"slow frames: {self.slow_frames}/{self.num_frames}")
+
+        line_height = self.font.get_linesize()
+        surface = pygame.Surface((300, line_height * len(lines) + 10), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+        for i, line in enumerate(lines):
+            surface.blit(self.font.render(line, True, (255, 255, 255)), (5, 5 + i * line_height))
+        return surface
+
+    def export(self) -> None:
+        """
+        Exports the recorded frame times (in milliseconds) to a CSV file and the summary to a JSON file.
+        The files are named after the run, so each export overwrites the previous one with all frames so far.
+        """
+        if not self.enabled or self.num_frames == 0:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        columns = self.SECTIONS + ('frame',)
+        frames = self.recorded_frames[:min(self.num_frames, self.MAX_RECORDED_FRAMES)] * 1000
+
+        with open(self.directory / f"{self.run_name}.csv", "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(('frame_index',) + columns)
+            for index, row in enumerate(frames.tolist()):
+                writer.writerow([index] + [f"{value:.4f}" for value in row])
+
+        p50, p95, p99 = np.percentile(frames, (50, 95, 99), axis=0)
+        summary = {
+            'num_frames': self.num_frames,
+            'frame_budget_ms': self.frame_budget * 1000,
+            'slow_frames': self.slow_frames,
+            'slow_frame_culprits': self.slow_frame_culprits,
+            'sections_ms': {
+                name: {
+                    'mean': float(frames[:, index].mean()),
+                    'p50': float(p50[index]),
+                    'p95': float(p95[index]),
+                    'p99': float(p99[index]),
+                    'max': float(frames[:, index].max()),
+                }
+                for index, name in enumerate(columns)
+            },
+        }
+        with open(self.directory / f"{self.run_name}.json", "w") as file:
+            json.dump(summary, file, indent=4)
+
+        self.num_exported_frames = self.num_frames
+        printc(f"[INFO] Frame profile exported to {self.directory / self.run_name}.csv/.json", color="blue")
+
+    def export_if_needed(self) -> None:
+        if self.num_frames > self.num_exported_frames:
+            self.export()
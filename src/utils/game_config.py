@@ -4,6 +4,7 @@ from .images import Images
 from .sounds import Sounds
 from .window import Window
 from .persistance import SettingsManager
+from .render_queue import RenderQueue
 
 
 class GameConfig:
@@ -18,8 +19,10 @@ class GameConfig:
         settings_manager: SettingsManager,
         debug: bool = False,
         save_results: bool = True,
+        render: bool = True,
     ) -> None:
         self.screen = screen
+        self.render_queue = RenderQueue(screen)  # entities queue their blits here, they're submitted all at once
         self.clock = clock
         self.fps = fps
         self.window = window
@@ -28,6 +31,7 @@ class GameConfig:
         self.settings_manager = settings_manager
         self.debug = debug
         self.save_results = save_results
+        self.render = render  # if False, entities only update their state and nothing is drawn (pure simulation)
 
     def tick(self) -> None:
         self.clock.tick(self.fps)
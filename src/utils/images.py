@@ -1,8 +1,19 @@
 import random
-from typing import Tuple, List, Dict
+from pathlib import Path
+from typing import Tuple, List, Dict, Optional
 
 import pygame
 
+IMAGES_DIR = Path('assets/images')
+PLAYER_IMG_NAMES = ('bird-yellow', 'bird-blue', 'bird-red')
+
+# Process-wide caches, so each file is decoded (and converted) only once per process, no matter how many games
+# (Images instances) there are, or how many times they're reset. Decoded images don't need a display, so they can be
+# preloaded in the parent process (see preload_images()), before the workers are forked - which then share them.
+_decoded_images: Dict[str, Optional[pygame.Surface]] = {}  # None = the file doesn't exist
+_converted_images: Dict[Tuple[str, bool], pygame.Surface] = {}
+_player_frames: Dict[int, Tuple[pygame.Surface, ...]] = {}
+
 
 class Images:
     background: pygame.Surface
@@ -22,13 +33,10 @@ class Images:
         self._load_enemy_images()
 
     def randomize(self) -> None:
-        PLAYER_IMG_NAMES = ('bird-yellow', 'bird-blue', 'bird-red')
-
         random_player_index = random.randint(0, len(PLAYER_IMG_NAMES) - 1)
-        player_spritesheet = load_image(f'player/{PLAYER_IMG_NAMES[random_player_index]}', True)
 
         self.player_id = random_player_index
-        self.player = tuple(animation_spritesheet_to_frames(player_spritesheet, 3))
+        self.player = get_player_frames(random_player_index)
 
     def _load_user_interface_images(self) -> None:
         images_alpha_flags = {
@@ -42,15 +50,13 @@ class Images:
         }
         self.user_interface = {}
         for element, alpha in images_alpha_flags.items():
-            image = load_image(f'user_interface/{element}')
-            self.user_interface[element.split('/')[-1]] = image.convert_alpha() if alpha else image.convert()
+            self.user_interface[element.split('/')[-1]] = get_image(f'user_interface/{element}', alpha=alpha)
 
     def _load_base_images(self) -> None:
-        self.background = load_image('background-day').convert()
-        self.floor = load_image('floor').convert_alpha()
-        self.pipe = (pygame.transform.flip(load_image('pipe').convert_alpha(), False, True),
-                     load_image('pipe').convert_alpha())
-        self.item_spawn_bubble = load_image('item-spawn-bubble').convert_alpha()
+        self.background = get_image('background-day', alpha=False)
+        self.floor = get_image('floor')
+        self.pipe = (get_flipped_image('pipe'), get_image('pipe'))
+        self.item_spawn_bubble = get_image('item-spawn-bubble')
         self.randomize()
 
     def _load_item_images(self) -> None:
@@ -66,14 +72,18 @@ class Images:
 
         for item in item_names:
             item_name = item.split('/')[-1]
-            self.items[item_name] = load_image(_items_dir(item)).convert_alpha()
+            self.items[item_name] = get_image(_items_dir(item))
 
             for version in ('small', 'inventory'):
                 try:
-                    self.items[f"{item_name}_{version}"] = load_image(_items_dir(f'{item}_{version}')).convert_alpha()
+                    self.items[f"{item_name}_{version}"] = get_image(_items_dir(f'{item}_{version}'))
                 except FileNotFoundError:
                     pass
 
+            # spawned items are drawn small, so items without a small version get a scaled one (once, not per spawn)
+            if f"{item_name}_small" not in self.items:
+                self.items[f"{item_name}_small"] = pygame.transform.scale(self.items[item_name], (56, 56))
+
     def _load_enemy_images(self) -> None:
         self.enemies = dict()
         ENEMY_SPRITES = {
@@ -86,11 +96,10 @@ class Images:
             if enemy_name not in self.enemies:
                 self.enemies[enemy_name] = []
             is_spritesheet = num_sprites > 1
-            image = load_image(f'enemies/{enemy_name}', is_spritesheet).convert_alpha()
             if is_spritesheet:
-                self.enemies[enemy_name].extend(animation_spritesheet_to_frames(image, num_sprites))
+                self.enemies[enemy_name].extend(get_spritesheet_frames(f'enemies/{enemy_name}', num_sprites))
             else:
-                self.enemies[enemy_name].append(image)
+                self.enemies[enemy_name].append(get_image(f'enemies/{enemy_name}'))
 
 
 def _items_dir(item_name: str) -> str:
@@ -113,6 +122,78 @@ def load_image(image_name: str, is_spritesheet: bool = False) -> pygame.Surface:
     return pygame.image.load(f'assets/images/{image_name}{suffix}.png')
 
 
+def get_decoded_image(image_name: str, is_spritesheet: bool = False) -> pygame.Surface:
+    """
+    Same as load_image(), but each file is only read & decoded once per process.
+    Don't modify the returned surface, it's shared.
+    """
+    key = f"{image_name}{'_spritesheet' if is_spritesheet else ''}"
+    if key not in _decoded_images:
+        try:
+            _decoded_images[key] = load_image(image_name, is_spritesheet)
+        except FileNotFoundError:
+            _decoded_images[key] = None
+    image = _decoded_images[key]
+    if image is None:
+        raise FileNotFoundError(f"No file '{IMAGES_DIR / key}.png' found.")
+    return image
+
+
+def get_image(image_name: str, is_spritesheet: bool = False, alpha: bool = True) -> pygame.Surface:
+    """
+    Returns the decoded image, converted to the display's pixel format (requires the display to be set).
+    The converted image is cached as well, so it's shared by all Images instances in the process.
+    :param image_name: path of the image inside assets/images, without the extension
+    :param is_spritesheet: whether the image is a spritesheet (has the '_spritesheet' suffix)
+    :param alpha: convert with per-pixel alpha (convert_alpha()) or without it (convert())
+    """
+    key = (f"{image_name}{'_spritesheet' if is_spritesheet else ''}", alpha)
+    image = _converted_images.get(key)
+    if image is None:
+        image = get_decoded_image(image_name, is_spritesheet)
+        image = image.convert_alpha() if alpha else image.convert()
+        _converted_images[key] = image
+    return image
+
+
+def get_flipped_image(image_name: str) -> pygame.Surface:
+    """ Returns the vertically flipped image (e.g. the upper pipe), cached like get_image(). """
+    key = (f"{image_name}_flipped", True)
+    image = _converted_images.get(key)
+    if image is None:
+        image = pygame.transform.flip(get_image(image_name), False, True)
+        _converted_images[key] = image
+    return image
+
+
+def get_spritesheet_frames(image_name: str, num_frames: int) -> Tuple[pygame.Surface, ...]:
+    return tuple(animation_spritesheet_to_frames(get_decoded_image(image_name, True), num_frames))
+
+
+def get_player_frames(player_id: int) -> Tuple[pygame.Surface, ...]:
+    """ Returns the animation frames of the player (bird) variant, split from its spritesheet only the first time. """
+    frames = _player_frames.get(player_id)
+    if frames is None:
+        frames = get_spritesheet_frames(f'player/{PLAYER_IMG_NAMES[player_id]}', 3)
+        _player_frames[player_id] = frames
+    return frames
+
+
+def preload_images() -> int:
+    """
+    Reads & decodes all images in assets/images into the process-wide cache, which doesn't require a display.
+    Call it in the parent process before creating forked workers (e.g. SubprocVecEnv with start_method='fork'),
+    so the workers inherit the decoded images (copy-on-write), instead of each of them reading & decoding every file.
+    Each worker still converts its own copies to the display format, so the saving is small (~7 MB per worker).
+    :return: number of decoded images
+    """
+    for path in sorted(IMAGES_DIR.rglob('*.png')):
+        key = path.relative_to(IMAGES_DIR).with_suffix('').as_posix()
+        if _decoded_images.get(key) is None:
+            _decoded_images[key] = pygame.image.load(path)
+    return sum(image is not None for image in _decoded_images.values())
+
+
 def animation_spritesheet_to_frames(spritesheet: pygame.Surface, num_frames: int) -> List[pygame.Surface]:
     frame_width = spritesheet.get_width() // num_frames
     frame_height = spritesheet.get_height()
@@ -1,4 +1,6 @@
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
 
 
@@ -30,3 +32,28 @@ class FileManager:
         file_path = self.directory / filename
         if file_path.exists():
             file_path.unlink()
+
+
+@contextmanager
+def file_lock(path: str | Path):
+    """
+    Exclusive lock shared by all processes (not just the threads of this one), held while the context is active.
+    The lock file is never deleted, so every process locks the same file.
+    """
+    with open(path, "a+b") as file:
+        if os.name == 'nt':
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
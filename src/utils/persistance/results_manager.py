@@ -1,16 +1,49 @@
+import json
+import os
+import threading
 from bisect import bisect_left
-from .file_manager import FileManager
+
+from .file_manager import FileManager, file_lock
 
 
 class ResultsManager(FileManager):
-    def __init__(self, results_file="results.json"):
+    """
+    Stores results as a sorted snapshot (results.json) plus an append-only log of results submitted since the last
+    compaction (results.log.jsonl), so submitting a result only appends a single line instead of rewriting all results.
+    Once the log gets long enough, it's folded back into the snapshot.
+
+    All results are also kept in memory, sorted by score (highest first, newest first among equal scores),
+    together with a negated score index, so new results can be inserted without rebuilding anything.
+    """
+    COMPACT_AFTER = 1000  # number of results in the log, after which they get folded into the snapshot
+
+    # one lock per results file, shared by all ResultsManager instances (the game & the leaderboard menu have their own)
+    _locks: dict[str, threading.Lock] = {}
+    _locks_lock = threading.Lock()
+
+    def __init__(self, results_file="results.json", log_file="results.log.jsonl"):
         super().__init__()
         self.results_file = results_file
+        self.log_file = log_file
         self.default_results = {
             "results": [],
         }
-        self._initialize_results()
-        self.results = self._load_results()
+        with ResultsManager._locks_lock:
+            self.lock = ResultsManager._locks.setdefault(str(self.directory / results_file), threading.Lock())
+        # the files are also shared with other processes (e.g. AI evaluations running in parallel), so appending to the
+        # log and compacting it holds an OS-level lock as well - otherwise results appended by another process between
+        # reading the log and deleting it would get lost
+        self.lock_file = self.directory / f"{results_file}.lock"
+
+        self.results = {"results": []}
+        self._neg_scores: list[int] = []  # negated scores of self.results['results'], for bisect
+        self._num_logged: int = 0  # number of results in the log file
+
+        with self.lock, file_lock(self.lock_file):
+            self._initialize_results()
+            self._load_results()
+            if self._num_logged >= self.COMPACT_AFTER:
+                self._compact()
 
     def _initialize_results(self):
         """ Initialize results if they do not exist. """
@@ -18,25 +51,89 @@ class ResultsManager(FileManager):
             self._save_results(self.default_results)
 
     def _load_results(self):
-        """ Load results from the results file. """
-        return self.load_file(self.results_file, default=self.default_results)
+        """ Load results from the snapshot and the log. """
+        self.results = self.load_file(self.results_file, default={"results": []})
+        self._neg_scores = [-r['score'] for r in self.results['results']]
+
+        logged_results = self._read_log()
+        for result in logged_results:
+            self._insert(result)
+        self._num_logged = len(logged_results)
+
+    def _read_log(self) -> list[dict]:
+        log_path = self.directory / self.log_file
+        if not log_path.exists():
+            return []
+
+        results = []
+        with open(log_path, "r") as file:
+            for line in file:
+                try:
+                    results.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass  # the last line might be incomplete if the game got killed while writing it
+        return results
+
+    def _append_to_log(self, result: dict):
+        """ Must be called while holding the file lock. """
+        with open(self.directory / self.log_file, "a") as file:
+            file.write(json.dumps(result) + "\n")
+        self._num_logged += 1
+
+    def _compact(self):
+        """ Fold the log into the snapshot. Must be called while holding the file lock. """
+        # reload first, in case another instance (or process) appended results we don't know about
+        self._load_results()
+        self._save_results(self.results)
+        self.delete_file(self.log_file)
+        self._num_logged = 0
 
     def _save_results(self, results):
         """ Save results to the results file. """
-        self.save_file(self.results_file, results)
+        # write to a temporary file first, so the results don't get lost if the game gets killed while saving
+        tmp_file = f"{self.results_file}.tmp"
+        self.save_file(tmp_file, results)
+        os.replace(self.directory / tmp_file, self.directory / self.results_file)
+
+    def _insert(self, result: dict):
+        insert_position = bisect_left(self._neg_scores, -result['score'])
+        self._neg_scores.insert(insert_position, -result['score'])
+        self.results['results'].insert(insert_position, result)
 
     def reset_results(self):
         """ Reset results to default. """
-        self._save_results(self.default_results)
+        with self.lock, file_lock(self.lock_file):
+            self._save_results(self.default_results)
+            self.delete_file(self.log_file)
+            self.results = {"results": []}
+            self._neg_scores = []
+            self._num_logged = 0
         return self.default_results
 
     def submit_result(self, score: int, timestamp: str):
         """ Add a result to the results while ensuring the list remains sorted. """
         new_result = {'score': score, 'timestamp': timestamp}
-        insert_position = bisect_left([-r['score'] for r in self.results['results']], -score, hi=len(self.results['results']))
-        self.results['results'].insert(insert_position, new_result)
-        self._save_results(self.results)
+        with self.lock, file_lock(self.lock_file):
+            self._insert(new_result)
+            self._append_to_log(new_result)
+            if self._num_logged >= self.COMPACT_AFTER:
+                self._compact()
+
+    def get_results(self, offset: int = 0, limit: int = None) -> list[dict]:
+        """
+        Get results, sorted by score (highest first).
+        :param offset: number of top results to skip (for paging)
+        :param limit: max number of results to return, None for all of them
+        :return: copies of the results, so they can be freely modified (e.g. formatted)
+        """
+        end = None if limit is None else offset + limit
+        with self.lock:
+            return [dict(result) for result in self.results['results'][offset:end]]
+
+    def get_top_results(self, n: int) -> list[dict]:
+        """ Get the top `n` results. """
+        return self.get_results(limit=n)
 
-    def get_results(self):
-        """ Get all results. """
-        return self.results['results']
+    def get_num_results(self) -> int:
+        """ Get the total number of results. """
+        return len(self.results['results'])
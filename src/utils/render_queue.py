@@ -0,0 +1,111 @@
+from collections import Counter
+from typing import Optional
+
+import pygame
+
+
+class RenderQueue:
+    """
+    Collects the blits of all entities during a frame and submits them to the screen with a single Surface.blits()
+    call (in the order they were queued, so the layer order stays the same), instead of one blit() call per entity.
+
+    It also keeps track of what was drawn in the previous frame, so screens where little changes (start screen,
+    game over screen) can update only the regions of the display that changed - see get_dirty_rects().
+
+    Rules for entities:
+    - use blit()/blits() instead of drawing onto the screen directly
+    - if a surface that was already queued in a previous frame is drawn onto (reused), call mark_dirty() with its rect
+    - anything else (pygame.draw, ...) must be drawn onto the surface returned by draw_directly()
+    """
+    def __init__(self, screen: pygame.Surface):
+        self.screen = screen
+        self.queue: list[tuple] = []
+
+        # (surface, position & area, affected rect) of everything blitted in this & the previous frame; the previous
+        # frame's surfaces are kept alive, so their ids can't be reused by new surfaces, which would look unchanged
+        self.frame_entries: list[tuple[pygame.Surface, tuple, pygame.Rect]] = []
+        self.previous_frame_entries: list[tuple[pygame.Surface, tuple, pygame.Rect]] = []
+
+        self.dirty_rects: list[pygame.Rect] = []  # marked by the entities (drawn onto reused surfaces)
+        self.direct_rects: list[pygame.Rect] = []  # drawn directly onto the screen (not tracked)
+        self.previous_direct_rects: list[pygame.Rect] = []
+        self.full_redraw = False  # something was drawn directly onto the screen, but we don't know where
+        self.previous_full_redraw = True  # nothing is known about what's on the display at the start
+
+    def blit(self, surface: pygame.Surface, dest, area: Optional[pygame.Rect] = None) -> None:
+        self.queue.append((surface, dest) if area is None else (surface, dest, area))
+
+    def blits(self, blit_sequence) -> None:
+        self.queue.extend(blit_sequence)
+
+    def mark_dirty(self, rect) -> None:
+        """ Marks the region as changed, e.g. when a surface that's blitted every frame was drawn onto. """
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def draw_directly(self, rect=None) -> pygame.Surface:
+        """
+        Submits the queued blits (so the layer order is kept) and returns the screen, to draw onto it directly.
+        :param rect: region that will be drawn onto, None if unknown (then the whole display is updated)
+        :return: the screen
+        """
+        self.flush()
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.direct_rects.append(pygame.Rect(rect))
+        return self.screen
+
+    def flush(self) -> None:
+        """ Blits everything that's queued onto the screen. """
+        if not self.queue:
+            return
+        queue = self.queue
+        self.queue = []
+        rects = self.screen.blits(queue)
+        # the affected rects are clipped to the screen, so they can't tell whether e.g. the scrolling floor moved
+        self.frame_entries.extend(
+            (entry[0], (entry[1][0], entry[1][1], tuple(entry[2]) if len(entry) > 2 else None), rect)
+            for entry, rect in zip(queue, rects)
+        )
+
+    def discard(self) -> None:
+        """ Drops everything that's queued (e.g. when nothing is rendered in sim mode). """
+        self.queue.clear()
+
+    def get_dirty_rects(self) -> Optional[list[pygame.Rect]]:
+        """
+        Flushes the queue and compares this frame's blits with the previous frame's.
+        Blits of the same surface at the same position (in the same order) are unchanged, everything else is dirty.
+        :return: regions of the screen that changed since the previous frame, None if the whole screen should be updated
+        """
+        self.flush()
+        if self.full_redraw or self.previous_full_redraw:
+            return None
+
+        previous_keys = [(id(surface), position, tuple(rect)) for surface, position, rect in self.previous_frame_entries]
+        keys = [(id(surface), position, tuple(rect)) for surface, position, rect in self.frame_entries]
+        previous_counts, counts = Counter(previous_keys), Counter(keys)
+        unchanged = previous_counts & counts
+
+        # unchanged blits in a different order may overlap differently, so we can't tell what changed
+        if [key for key in previous_keys if key in unchanged] != [key for key in keys if key in unchanged]:
+            return None
+
+        changed = (counts - unchanged) + (previous_counts - unchanged)
+        rects = [pygame.Rect(rect) for _, _, rect in changed]
+        rects.extend(self.dirty_rects)
+        rects.extend(self.direct_rects)
+        rects.extend(self.previous_direct_rects)  # whatever was drawn there in the previous frame may be gone now
+        # e.g. a moved surface is dirty both where it was and where it is now, which is often the same (clipped) rect
+        unique_rects = dict.fromkeys(tuple(rect) for rect in rects if rect.width > 0 and rect.height > 0)
+        return [pygame.Rect(rect) for rect in unique_rects]
+
+    def end_frame(self) -> None:
+        """ Call once the frame is on the display. """
+        self.previous_frame_entries = self.frame_entries
+        self.frame_entries = []
+        self.previous_direct_rects = self.direct_rects
+        self.direct_rects = []
+        self.dirty_rects = []
+        self.previous_full_redraw = self.full_redraw
+        self.full_redraw = False
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Optional
+
+import pygame
+
+
+class RotationCache:
+    """
+    Shared cache of rotated (and flipped) images, as pygame.transform.rotate is one of the most expensive calls in a frame
+    and the same images get rotated by the same angles over and over again (guns, bullets, SkyDarts, the player...).
+
+    Least recently used images get evicted once the cache is full.
+    Cached images are shared, so they must not be drawn onto.
+    """
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.cache: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def rotate(self, image: pygame.Surface, angle: float, angle_step: Optional[float] = 1) -> pygame.Surface:
+        """
+        Returns the image rotated by the given angle.
+        :param image: the image to rotate
+        :param angle: the angle of rotation in degrees
+        :param angle_step: the angle gets rounded to a multiple of this many degrees, so similar angles share the same
+                           rotated image; use None for the exact angle (when the rotated image's size affects the game
+                           state, like bullet collisions, and not just how things look)
+        :return: the rotated image
+        """
+        angle = self.quantize_angle(angle, angle_step)
+        return self._get(('rotate', image, angle), lambda: pygame.transform.rotate(image, angle))
+
+    def flip(self, image: pygame.Surface, flip_x: bool = True, flip_y: bool = False) -> pygame.Surface:
+        """
+        Returns the flipped image.
+        """
+        return self._get(('flip', image, flip_x, flip_y), lambda: pygame.transform.flip(image, flip_x, flip_y))
+
+    @staticmethod
+    def quantize_angle(angle: float, angle_step: Optional[float] = 1) -> float:
+        if angle_step is None:
+            return angle
+        return (round(angle / angle_step) * angle_step) % 360
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: tuple, create_image) -> pygame.Surface:
+        image = self.cache.get(key)
+        if image is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return image
+
+        self.misses += 1
+        image = create_image()
+        self.cache[key] = image
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        return image
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+
+rotation_cache = RotationCache()
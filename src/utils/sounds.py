@@ -93,6 +93,9 @@ class Sounds(BaseSounds):
         self.global_volume = volume
         self.music_volume = 1.0
         self.sounds_volume = 1.0
+        # own random generator, so playing sounds doesn't change the game's random state (muted games and replays
+        # wouldn't be deterministic otherwise)
+        self.random = random.Random()
 
         self._load_base_sounds()
         self._load_weapon_sounds()
@@ -115,7 +118,7 @@ class Sounds(BaseSounds):
         sound.play()
 
     def play_random(self, sounds: List[pygame.mixer.Sound]) -> None:
-        self.play(random.choice(sounds))
+        self.play(self.random.choice(sounds))
 
     def set_global_volume(self, volume: float) -> None:
         self.set_muted(volume == 0)
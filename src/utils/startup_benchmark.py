@@ -0,0 +1,135 @@
+"""
+Startup (import time) benchmark (Mode.BENCHMARK_STARTUP).
+
+Each scenario is imported in a fresh Python process with `-X importtime`, which reports how long every module took to
+import (on its own and including the modules it imported). The runs are repeated and the median is used, as the
+first run is usually slower (cold file cache).
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .utils import printc, get_git_commit
+
+# scenario name -> code that's run to import everything the scenario needs
+STARTUP_SCENARIOS = {
+    'play_human': "import src.mode_manager",
+    'play_ai': "import src.mode_manager; import src.ai.controllers",
+    'environments': "import src.mode_manager; from src.ai.environments.env_manager import EnvManager",
+}
+
+# packages that should only be imported when they're needed, reported for each scenario
+HEAVY_PACKAGES = ('torch', 'stable_baselines3', 'sb3_contrib', 'gymnasium', 'matplotlib', 'pandas', 'supabase',
+                  'requests', 'dotenv')
+
+
+def run_startup_benchmark(scenarios: dict[str, str] = None, num_runs: int = 5, num_top_modules: int = 15,
+                          directory: str = "data/benchmarks") -> dict:
+    """
+    Measures the import time of each scenario and saves the results to a JSON file (named after the current time and
+    git commit), so commits can be compared.
+
+    :param scenarios: scenario name -> code to run, STARTUP_SCENARIOS by default
+    :param num_runs: number of fresh processes per scenario
+    :param num_top_modules: number of the slowest modules/packages to print
+    :param directory: directory to save the results to
+    :return: the results
+    """
+    commit = get_git_commit()
+    results = {
+        'created': datetime.now().isoformat(),
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'num_runs': num_runs,
+        'scenarios': {},
+    }
+
+    for name, code in (scenarios or STARTUP_SCENARIOS).items():
+        printc(f"[INFO] Benchmarking startup of '{name}' ({num_runs} runs)...", color="blue")
+        try:
+            scenario = _run_scenario(code, num_runs)
+            _print_scenario(scenario, num_top_modules)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, 'stderr', None)
+            scenario = {'error': f"{type(e).__name__}: {e}" + (f"\n{stderr.strip()}" if stderr else "")}
+            printc(f"[WARN] Startup benchmark failed: {scenario['error']}", color="yellow")
+        results['scenarios'][name] = scenario
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    path = Path(directory) / f"startup_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'unknown'}.json"
+    with open(path, "w") as file:
+        json.dump(results, file, indent=4)
+    printc(f"[INFO] Benchmark results saved to {path}", color="blue")
+    return results
+
+
+def _run_scenario(code: str, num_runs: int) -> dict:
+    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+
+    wall_times = []
+    runs = []  # module -> (self time, cumulative time) in microseconds, for each run
+    for _ in range(num_runs):
+        start_time = time.perf_counter()
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=root_dir, env=env,
+                                 capture_output=True, text=True, check=True)
+        wall_times.append(time.perf_counter() - start_time)
+        runs.append(parse_importtime(process.stderr))
+
+    modules = {}
+    for module in runs[-1]:
+        self_times = [run[module][0] for run in runs if module in run]
+        cumulative_times = [run[module][1] for run in runs if module in run]
+        modules[module] = {'self_ms': statistics.median(self_times) / 1000,
+                           'cumulative_ms': statistics.median(cumulative_times) / 1000}
+
+    # self times of all modules of a top level package (e.g. torch.nn -> torch) add up to the package's total time
+    packages = {}
+    for module, times in modules.items():
+        package = module.split('.')[0]
+        packages[package] = packages.get(package, 0.0) + times['self_ms']
+
+    return {
+        'code': code,
+        'wall_time_ms': statistics.median(wall_times) * 1000,
+        'import_time_ms': sum(times['self_ms'] for times in modules.values()),
+        'num_modules': len(modules),
+        'heavy_packages': [package for package in HEAVY_PACKAGES if package in packages],
+        'packages_ms': dict(sorted(packages.items(), key=lambda item: item[1], reverse=True)),
+        'modules_ms': dict(sorted(modules.items(), key=lambda item: item[1]['cumulative_ms'], reverse=True)),
+    }
+
+
+def parse_importtime(output: str) -> dict[str, tuple[int, int]]:
+    """
+    Parses the output of `python -X importtime`.
+    :return: module name -> (self time, cumulative time) in microseconds
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        modules[parts[2].strip()] = (int(parts[0]), int(parts[1]))
+    return modules
+
+
+def _print_scenario(scenario: dict, num_top_modules: int) -> None:
+    heavy_packages = ", ".join(scenario['heavy_packages']) or "none"
+    printc(f"  {scenario['wall_time_ms']:.0f} ms in total, {scenario['import_time_ms']:.0f} ms importing "
+           f"{scenario['num_modules']} modules (heavy packages: {heavy_packages})", color="green")
+    packages = list(scenario['packages_ms'].items())[:num_top_modules]
+    printc("  slowest packages: " + ", ".join(f"{package} {time_ms:.0f}ms" for package, time_ms in packages),
+           color="gray")
+    modules = list(scenario['modules_ms'].items())[:num_top_modules]
+    printc("  slowest modules (incl. their imports): " +
+           ", ".join(f"{module} {times['cumulative_ms']:.0f}ms" for module, times in modules), color="gray")
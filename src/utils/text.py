@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import pygame
 
 from .image_style import render_outline, render_color_overlay
@@ -22,8 +24,46 @@ def _load_font(path: str, font_size: int) -> pygame.font:
     return pygame.font.Font(f'assets/{path}', font_size)
 
 
+# Cache rendered texts, as the same texts (scores, item quantities, labels...) get rendered every frame, and
+# outlining them is expensive. Least recently used texts get evicted once the cache is full.
+# Cached surfaces are shared, so they must not be drawn onto.
+TEXT_CACHE_SIZE = 512
+rendered_texts: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+
+
+def _get_cached_text(key: tuple, render_func) -> pygame.Surface:
+    surface = rendered_texts.get(key)
+    if surface is not None:
+        rendered_texts.move_to_end(key)
+        return surface
+
+    surface = render_func()
+    rendered_texts[key] = surface
+    if len(rendered_texts) > TEXT_CACHE_SIZE:
+        rendered_texts.popitem(last=False)
+    return surface
+
+
+def render_text(text: str, font, text_color=(255, 255, 255), antialias: bool = True) -> pygame.Surface:
+    """
+    Cached version of font.render(), for plain texts.
+    """
+    key = ('plain', text, font, tuple(text_color), antialias)
+    return _get_cached_text(key, lambda: font.render(text, antialias, text_color))
+
+
 def flappy_text(text: str, font, text_color=(255, 255, 255), outline_color=(0, 0, 0), outline_width: int = 5,
-                shadow_distance: tuple[int, int] = (0, 0), outline_algorithm: int = 3):
+                shadow_distance: tuple[int, int] = (0, 0), outline_algorithm: int = 3) -> pygame.Surface:
+    """
+    Renders the text with an outline and shadow. The result is cached, so it must not be drawn onto.
+    """
+    key = ('flappy', text, font, tuple(text_color), tuple(outline_color), outline_width, tuple(shadow_distance), outline_algorithm)
+    return _get_cached_text(key, lambda: _render_flappy_text(text, font, text_color, outline_color, outline_width,
+                                                             shadow_distance, outline_algorithm))
+
+
+def _render_flappy_text(text: str, font, text_color, outline_color, outline_width: int,
+                        shadow_distance: tuple[int, int], outline_algorithm: int) -> pygame.Surface:
     text_surface = font.render(text, True, text_color).convert_alpha()
     outlined_text_surface = render_outline(surface=text_surface,
                                            outline_color=outline_color,
@@ -1,17 +1,24 @@
 import random
+import subprocess
+import sys
 import time
+from collections import OrderedDict
+from typing import Optional
 
 import numpy as np
 import pygame
 
+from .rotation_cache import rotation_cache
 
-def set_random_seed(seed: int = None):
+
+def set_random_seed(seed: int = None) -> int:
     """
     Sets global random seeds for Python, NumPy, TensorFlow, and PyTorch.
     If `seed` is a non-negative value, it sets them to that value.
     If `seed` is None, it sets them to a dynamic time-based seed.
 
     :param seed: The seed value to set. If None, uses a dynamic seed based on the current time.
+    :return: The seed that was set.
     """
     if seed is not None:
         if not isinstance(seed, int):
@@ -29,21 +36,19 @@ def set_random_seed(seed: int = None):
     random.seed(seed)
     np.random.seed(seed)
 
-    try:
-        import tensorflow as tf  # noqa
+    # TensorFlow & PyTorch are only seeded if something already imported them, as importing them just to set the seed
+    # takes seconds (e.g. Mode.PLAY doesn't need them at all). Whatever imports them later must set the seed again.
+    tf = sys.modules.get('tensorflow')
+    if tf is not None:
         tf.random.set_seed(seed)
-    except ImportError:
-        # Don't print this to reduce debug clutter, as you don't use TensorFlow in this project.
-        # printc("[INFO] TensorFlow not available, skipping TensorFlow random seed.", color="blue")
-        pass
 
-    try:
-        import torch
+    torch = sys.modules.get('torch')
+    if torch is not None:
         torch.manual_seed(seed)
         if torch.cuda.is_available():
             torch.cuda.manual_seed_all(seed)
-    except ImportError:
-        printc("[INFO] PyTorch not available, skipping PyTorch random seed.", color="blue")
+
+    return seed
 
 
 def one_hot(index: int, total: int) -> np.ndarray:
@@ -93,14 +98,31 @@ def get_random_value(value: list | tuple, random_type: str = "auto", as_int: boo
     return value
 
 
+# Cache collision masks per Surface, as most entities share a handful of images (pipes, item bubbles, enemy
+# animation frames...), so there's no need to build a new mask every time an entity is created or changes its image.
+# Keyed by the Surface object itself, so images must not be drawn onto after their mask was created.
+MASK_CACHE_SIZE = 512
+cached_masks: OrderedDict[pygame.Surface, pygame.mask.Mask] = OrderedDict()
+
+
 def get_mask(image: pygame.Surface) -> pygame.mask.Mask:
     """
     Get a mask for collision detection from a Pygame image.
+    Masks are cached per Surface (least recently used ones get evicted), so the returned mask must not be modified.
 
     :param image: A Pygame Surface containing the image.
     :return: A collision mask representing the non-transparent parts of the image.
     """
-    return pygame.mask.from_surface(image)
+    mask = cached_masks.get(image)
+    if mask is not None:
+        cached_masks.move_to_end(image)
+        return mask
+
+    mask = pygame.mask.from_surface(image)
+    cached_masks[image] = mask
+    if len(cached_masks) > MASK_CACHE_SIZE:
+        cached_masks.popitem(last=False)
+    return mask
 
 
 def pixel_collision(rect1: pygame.Rect, rect2: pygame.Rect, mask1: pygame.mask.Mask, mask2: pygame.mask.Mask) -> bool:
@@ -127,7 +149,7 @@ def pixel_collision(rect1: pygame.Rect, rect2: pygame.Rect, mask1: pygame.mask.M
     return bool(mask1.overlap(mask2, offset))
 
 
-def rotate_on_pivot(image, angle, pivot, origin):
+def rotate_on_pivot(image, angle, pivot, origin, angle_step: float | None = 1):
     """
     Rotate an image around a pivot point.
 
@@ -135,9 +157,11 @@ def rotate_on_pivot(image, angle, pivot, origin):
     :param angle: The angle of rotation in degrees.
     :param pivot: The pivot point around which the image will be rotated.
     :param origin: The origin point of the image.
+    :param angle_step: The angle gets rounded to a multiple of this many degrees (see RotationCache.rotate()).
     :return: The rotated image and its bounding rectangle.
     """
-    surf = pygame.transform.rotate(image, angle)
+    angle = rotation_cache.quantize_angle(angle, angle_step)
+    surf = rotation_cache.rotate(image, angle, angle_step=None)
 
     offset = pivot + (origin - pivot).rotate(-angle)
     rect = surf.get_rect(center=offset)
@@ -186,3 +210,12 @@ def printc(*message, color="default", styles=None, end="\n"):
 
     style_str = "".join([style_codes[style] for style in styles]) if styles is not None else ""
     print(*[f"{color_codes[color]}{style_str}{msg}{reset_all_code}" for msg in message], end=end)
+
+
+def get_git_commit() -> Optional[str]:
+    """ Short hash of the current git commit (used to name benchmark results), None if it can't be determined. """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
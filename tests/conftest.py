@@ -0,0 +1,39 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# the game loads its assets & data relative to the repository root, and must run without a display or audio device
+os.chdir(ROOT_DIR)
+sys.path.insert(0, str(ROOT_DIR))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+@pytest.fixture(scope="session")
+def game():
+    """ Muted game (dummy display), shared by the tests that need the game's config, images or entities. """
+    from src.config import Config
+    Config.options['mute'] = True
+    Config.fps_cap = 0
+
+    from src.flappybird import FlappyBird
+    return FlappyBird()
+
+
+@pytest.fixture
+def player_changed(monkeypatch):
+    """ Makes snapshots (and start state libraries) taken before it look like an attribute was added to Player since. """
+    from src.entities import Player
+    from src.replays import snapshot
+
+    get_class_schema = snapshot._get_class_schema
+    monkeypatch.setattr(snapshot, '_get_class_schema',
+                        lambda cls: get_class_schema(cls) + (',new_attribute' if cls is Player else ''))
+    snapshot._get_schema_fingerprint.cache_clear()
+    yield
+    snapshot._get_schema_fingerprint.cache_clear()
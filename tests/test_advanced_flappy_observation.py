@@ -0,0 +1,24 @@
+import numpy as np
+
+from src.ai.environments import EnvManager, EnvType
+from src.ai.environments.env_types import EnvVariant
+from src.config import Config
+
+
+def test_missing_pipe_pairs_are_zeroed(monkeypatch):
+    monkeypatch.setitem(Config.options, 'sim', True)
+    monkeypatch.setitem(Config.options, 'mute', True)
+    env = EnvManager(EnvType.ADVANCED_FLAPPY, EnvVariant.MAIN).get_env()
+    env.reset(seed=1)
+    game = env.game_env
+    observation = game.observation_manager.observation_instances[game.player]
+
+    full_pipes = observation.get_observation()['pipes']
+    assert np.count_nonzero(full_pipes[2])  # all three slots are filled at first
+
+    # keep only the first two pipe pairs - the third slot must not keep the previous observation's values
+    pipes = game.pipes
+    pipes.upper, pipes.lower = pipes.upper[:2], pipes.lower[:2]
+    two_pipes = observation.get_observation()['pipes']
+    assert np.array_equal(two_pipes[:2], full_pipes[:2])
+    assert not np.any(two_pipes[2])
@@ -0,0 +1,28 @@
+import atexit
+import multiprocessing as mp
+
+from src.utils.frame_profiler import FrameProfiler
+
+
+def profile_one_frame(directory) -> None:
+    profiler = FrameProfiler(directory=directory)
+    atexit.unregister(profiler.export_if_needed)
+    profiler.begin_frame()
+    with profiler.measure('player'):
+        pass
+    profiler.end_frame()
+    profiler.export()
+
+
+def test_profilers_started_at_the_same_time_dont_overwrite_each_other(tmp_path):
+    # two games in this process, and one in a worker process - all within the same second
+    ctx = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else 'spawn')
+    worker = ctx.Process(target=profile_one_frame, args=(tmp_path,))
+    worker.start()
+    profile_one_frame(tmp_path)
+    profile_one_frame(tmp_path)
+    worker.join()
+    assert worker.exitcode == 0
+
+    assert len(list(tmp_path.glob('*.csv'))) == 3
+    assert len(list(tmp_path.glob('*.json'))) == 3
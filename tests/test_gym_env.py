@@ -0,0 +1,21 @@
+import numpy as np
+from gymnasium import spaces
+
+from src.ai.environments.gym_env import GymEnv
+
+
+def test_discrete_clip_keeps_the_upper_bound_of_spaces_with_a_start():
+    clip = GymEnv._get_clip_operation(spaces.Discrete(3, start=5))  # valid values: 5, 6, 7
+    assert clip(7) == 7
+    assert clip(100) == 7
+    assert clip(np.array([2.])) == 5
+    assert spaces.Discrete(3, start=5).contains(int(clip(100)))
+
+
+def test_multi_discrete_clip_keeps_the_upper_bound_of_spaces_with_a_start():
+    space = spaces.MultiDiscrete([3, 4], start=[1, -2])  # valid values: 1..3 and -2..1
+    clip = GymEnv._get_clip_operation(space)
+    assert np.array_equal(clip(np.array([3, 1])), [3, 1])
+    assert np.array_equal(clip(np.array([9, 9])), [3, 1])
+    assert np.array_equal(clip(np.array([-9, -9])), [1, -2])
+    assert space.contains(clip(np.array([9, 9])))
@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+from src.entities.menus.elements import Leaderboard
+
+COLUMN_INFO = {'rank': {'label': 'Rank', 'weight': 0.3}, 'score': {'label': 'Score', 'weight': 0.7}}
+
+
+@pytest.fixture
+def leaderboard(game, monkeypatch):
+    leaderboard = Leaderboard(config=game.config, width=300, height=200, data=[], column_info=COLUMN_INFO)
+    leaderboard.rendered_rows = []
+    render_row = leaderboard.render_row
+
+    def counting_render_row(index, entry):
+        leaderboard.rendered_rows.append((index, dict(entry)))
+        return render_row(index, entry)
+
+    monkeypatch.setattr(leaderboard, 'render_row', counting_render_row)
+    return leaderboard
+
+
+def test_placeholder_row_is_rendered_once(leaderboard):
+    for _ in range(3):
+        leaderboard.draw()
+    assert leaderboard.rendered_rows == [(0, {'rank': "\\", 'score': "\\"})]
+
+
+def test_data_set_from_another_thread_is_applied_on_draw(leaderboard):
+    leaderboard.draw()
+    row_surfaces = dict(leaderboard.row_surfaces)
+
+    data = [{'rank': i + 1, 'score': 100 - i} for i in range(20)]
+    thread = threading.Thread(target=leaderboard.set_data, args=(data, COLUMN_INFO))
+    thread.start()
+    thread.join()
+
+    # nothing the main thread uses was touched by the other thread
+    assert leaderboard.data == [] and dict(leaderboard.row_surfaces) == row_surfaces
+
+    leaderboard.rendered_rows.clear()
+    leaderboard.draw()
+    assert leaderboard.data is data
+    assert leaderboard.rendered_rows[0] == (0, data[0])
+    assert all(entry == data[index] for index, entry in leaderboard.rendered_rows)
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from src.database import scores_service
+from src.entities.menus import leaderboard_menu
+from src.entities.menus.leaderboard_menu import LeaderboardMenu
+from src.entities.menus.menu_manager import MenuManager
+
+NUM_RESULTS = 450
+
+
+class Results:
+    """ Stand-in for ResultsManager, with NUM_RESULTS results. """
+    def __init__(self):
+        self.results = [{'score': NUM_RESULTS - i, 'timestamp': "2024-01-01T12:00:00.000000+0000"}
+                        for i in range(NUM_RESULTS)]
+
+    def get_results(self, offset: int = 0, limit: int = None) -> list[dict]:
+        end = None if limit is None else offset + limit
+        return [dict(result) for result in self.results[offset:end]]
+
+
+def draw_until(leaderboard, condition, timeout: float = 5) -> None:
+    end_time = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end_time, "the leaderboard wasn't updated in time"
+        leaderboard.draw()
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def personal_leaderboard(game, monkeypatch):
+    monkeypatch.setattr(leaderboard_menu, 'ResultsManager', Results)
+    monkeypatch.setattr(scores_service, 'get_scores_page', lambda *args, **kwargs: [])  # no network for the global tab
+    return LeaderboardMenu(game.config, MenuManager()).leaderboard
+
+
+def test_personal_leaderboard_pages_through_all_results(personal_leaderboard):
+    leaderboard = personal_leaderboard
+    page_size = LeaderboardMenu.PERSONAL_PAGE_SIZE
+
+    draw_until(leaderboard, lambda: len(leaderboard.data) == page_size)
+    time.sleep(0.1)
+    leaderboard.draw()
+    assert len(leaderboard.data) == page_size  # the next page is only loaded once scrolled near the end
+
+    while leaderboard.on_near_end is not None:
+        num_loaded = len(leaderboard.data)
+        leaderboard.scroll_offset = leaderboard.max_scroll_offset
+        draw_until(leaderboard, lambda: len(leaderboard.data) > num_loaded)
+
+    assert len(leaderboard.data) == NUM_RESULTS
+    assert [entry['rank'] for entry in leaderboard.data] == list(range(1, NUM_RESULTS + 1))
+    assert [entry['score'] for entry in leaderboard.data] == list(range(NUM_RESULTS, 0, -1))
@@ -0,0 +1,41 @@
+import multiprocessing as mp
+
+import numpy as np
+
+from src.ai.controllers.numpy_policy import NumpyPolicy
+
+
+def make_policy(seed: int) -> NumpyPolicy:
+    rng = np.random.default_rng(seed)
+    weights = [rng.standard_normal((400, 400)), rng.standard_normal((400, 4))]
+    biases = [rng.standard_normal(400), rng.standard_normal(4)]
+    return NumpyPolicy(weights, biases, ['tanh', 'identity'], [0.0, 0.0], np.full(400, -10.0), np.full(400, 10.0),
+                       obs_keys=None, action_dims=[4], multi_discrete=False, source_hash=str(seed))
+
+
+def save_repeatedly(path: str, seed: int) -> None:
+    policy = make_policy(seed)
+    for _ in range(30):
+        policy.save(path)
+
+
+def test_concurrent_saves_never_expose_a_partial_file(tmp_path):
+    # several workers converting the same model save it to the same path, while others load it
+    path = str(tmp_path / "policy_numpy_policy.npz")
+    make_policy(0).save(path)
+    ctx = mp.get_context('fork')
+    writers = [ctx.Process(target=save_repeatedly, args=(path, seed)) for seed in (1, 2, 3)]
+    for writer in writers:
+        writer.start()
+
+    while True:
+        writers_done = not any(writer.is_alive() for writer in writers)
+        policy = NumpyPolicy.load(path)  # raises if the file is half-written
+        assert np.array_equal(policy.weights[0], make_policy(int(policy.source_hash)).weights[0])
+        if writers_done:
+            break
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    assert [file.name for file in tmp_path.iterdir()] == ["policy_numpy_policy.npz"]  # no temporary files left behind
@@ -0,0 +1,28 @@
+from src.ai.environments import EnvManager, EnvType
+from src.ai.environments.env_types import EnvVariant
+from src.config import Config
+from src.replays import Replay, ReplayRecorder
+from src.replays.resimulator import resimulate
+
+
+def test_later_episodes_recorded_in_an_environment_are_flagged(tmp_path, monkeypatch):
+    monkeypatch.setitem(Config.options, 'sim', True)
+    monkeypatch.setitem(Config.options, 'mute', True)
+    env = EnvManager(EnvType.ADVANCED_FLAPPY, EnvVariant.MAIN).get_env()
+    env.game_env.replay_recorder = ReplayRecorder(directory=tmp_path)
+    env.reset(seed=1)
+    env.action_space.seed(1)
+
+    num_episodes = 0
+    while num_episodes < 3:
+        action_masks = EnvManager.format_action_mask(env.action_masks(), env.action_space)
+        _, _, terminated, truncated, _ = env.step(env.action_space.sample(tuple(action_masks)))
+        if terminated or truncated:
+            num_episodes += 1
+            env.reset()
+
+    paths = sorted(tmp_path.glob('*.fbr'))
+    replays = [Replay.load(path) for path in paths]
+    assert [replay.metadata['episode'] for replay in replays] == [0, 1, 2]
+    assert [replay.may_desync for replay in replays] == [False, True, True]
+    assert resimulate(paths[0], verbose=False)
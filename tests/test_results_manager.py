@@ -0,0 +1,30 @@
+import multiprocessing as mp
+import os
+
+from src.utils import ResultsManager
+
+NUM_PROCESSES = 4
+NUM_RESULTS = 60
+
+
+def submit_results(directory: str, process_index: int) -> None:
+    os.chdir(directory)  # results are stored in data/, relative to the working directory
+    ResultsManager.COMPACT_AFTER = 7  # compact often, while the other processes keep appending
+    results_manager = ResultsManager()
+    for i in range(NUM_RESULTS):
+        results_manager.submit_result(process_index * NUM_RESULTS + i, f"2024-01-01 00:00:{i:02d}")
+
+
+def test_concurrent_writers_dont_lose_results(tmp_path, monkeypatch):
+    ctx = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else 'spawn')
+    processes = [ctx.Process(target=submit_results, args=(str(tmp_path), i)) for i in range(NUM_PROCESSES)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    monkeypatch.chdir(tmp_path)
+    scores = [result['score'] for result in ResultsManager().get_results()]
+    assert sorted(scores) == list(range(NUM_PROCESSES * NUM_RESULTS))
+    assert scores == sorted(scores, reverse=True)
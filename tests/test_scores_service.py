@@ -0,0 +1,127 @@
+import json
+import multiprocessing as mp
+import random
+from types import SimpleNamespace
+
+import pygame
+import pytest
+import requests
+
+from src.config import Config
+from src.database import database, scores_service
+from src.database.FakeSupabaseClient import FakeSupabaseClient
+from src.database.scores_service import ScoreSubmitter
+from src.flappybird import FlappyBird
+
+
+class OfflineClient:
+    """ Supabase client without an internet connection. """
+    def table(self, name):
+        raise requests.ConnectionError()
+
+
+class FileClient:
+    """ Supabase client that appends inserted rows to a file (shared by all processes), with a flaky connection. """
+    def __init__(self, path):
+        self.path = path
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows):
+        self.rows = rows
+        return self
+
+    def execute(self):
+        if random.random() < 0.3:
+            raise requests.ConnectionError()
+        with open(self.path, "a") as file:
+            file.write("".join(json.dumps(row) + "\n" for row in self.rows))
+        return SimpleNamespace(data=self.rows)
+
+
+@pytest.fixture
+def submitter(tmp_path, monkeypatch):
+    submitter = ScoreSubmitter()
+    submitter.directory = tmp_path
+    submitter.FLUSH_INTERVAL = 60  # the background thread shouldn't send anything on its own during the test
+    monkeypatch.setattr(scores_service, 'score_submitter', submitter)
+    return submitter
+
+
+def test_score_submitted_right_before_quitting_is_sent(submitter, monkeypatch):
+    client = FakeSupabaseClient(in_memory=True)
+    monkeypatch.setattr(database, 'supabase', client)
+
+    scores_service.submit_score("player", 42)
+    with pytest.raises(SystemExit):
+        FlappyBird.handle_quit(None, pygame.event.Event(pygame.QUIT))
+
+    assert [(row['username'], row['score']) for row in client.tables['Scores']] == [("player", 42)]
+    assert not submitter.file_exists(submitter.unsent_scores_file)
+
+
+def test_score_submitted_right_before_quitting_offline_is_saved(submitter, monkeypatch):
+    monkeypatch.setattr(database, 'supabase', OfflineClient())
+
+    scores_service.submit_score("player", 42)
+    with pytest.raises(SystemExit):
+        FlappyBird.handle_quit(None, pygame.event.Event(pygame.QUIT))
+
+    assert submitter.load_file(submitter.unsent_scores_file) == [{'username': "player", 'score': 42}]
+
+
+def test_flush_without_submitted_scores_keeps_unsent_scores(submitter):
+    submitter.save_file(submitter.unsent_scores_file, [{'username': "player", 'score': 7}])
+    assert submitter.flush()
+    assert submitter.load_file(submitter.unsent_scores_file) == [{'username': "player", 'score': 7}]
+
+
+def test_fake_database_option(monkeypatch):
+    monkeypatch.setitem(Config.options, 'fake_database', True)
+    client = database.create_supabase_client()
+    assert isinstance(client, FakeSupabaseClient) and client.in_memory
+
+
+def submit_scores(directory, inserted_path: str, process_index: int) -> None:
+    database.supabase = FileClient(inserted_path)
+    submitter = ScoreSubmitter()
+    submitter.directory = directory
+    submitter.BATCH_SIZE = 7
+    submitter.FLUSH_INTERVAL = 0.01  # the background thread sends batches while scores are still being submitted
+    for i in range(40):
+        submitter.submit(f"process{process_index}", i)
+    while not submitter.flush():
+        pass
+
+
+def test_processes_share_unsent_scores_without_duplicates_or_losses(tmp_path):
+    leftover = [{'username': "last time", 'score': i} for i in range(30)]
+    submitter = ScoreSubmitter()
+    submitter.directory = tmp_path
+    submitter.save_file(submitter.unsent_scores_file, leftover)
+
+    inserted_path = tmp_path / "inserted.jsonl"
+    ctx = mp.get_context('fork' if 'fork' in mp.get_all_start_methods() else 'spawn')
+    processes = [ctx.Process(target=submit_scores, args=(tmp_path, str(inserted_path), i)) for i in range(2)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+
+    inserted = [json.loads(line) for line in inserted_path.read_text().splitlines()]
+    expected = leftover + [{'username': f"process{p}", 'score': i} for p in range(2) for i in range(40)]
+    key = lambda row: (row['username'], row['score'])  # noqa: E731
+    assert sorted(inserted, key=key) == sorted(expected, key=key)  # every score inserted exactly once
+    assert not submitter.file_exists(submitter.unsent_scores_file)
+
+
+def test_corrupted_unsent_scores_file_is_ignored(submitter, monkeypatch):
+    client = FakeSupabaseClient(in_memory=True)
+    monkeypatch.setattr(database, 'supabase', client)
+    (submitter.directory / submitter.unsent_scores_file).write_text('[{"username": "play')  # killed while saving
+
+    scores_service.submit_score("player", 42)
+    assert scores_service.flush_scores()
+    assert [(row['username'], row['score']) for row in client.tables['Scores']] == [("player", 42)]
@@ -0,0 +1,49 @@
+import multiprocessing as mp
+import time
+
+import gymnasium as gym
+import numpy as np
+import pytest
+
+from src.ai.vec_envs import SharedMemoryVecEnv
+
+
+class MaskedEnv(gym.Env):
+    """ Tiny env with MultiDiscrete actions & int8 action masks split per sub-action, like the game's envs. """
+    observation_space = gym.spaces.Box(low=-1.0, high=1.0, shape=(3,), dtype=np.float32)
+    action_space = gym.spaces.MultiDiscrete([3, 3])
+
+    def reset(self, *, seed=None, options=None):
+        super().reset(seed=seed)
+        return np.zeros(3, dtype=np.float32), {}
+
+    def step(self, action):
+        return np.full(3, 0.5, dtype=np.float32), 1.0, False, False, {}
+
+    def action_masks(self) -> np.ndarray:
+        return np.array([[1, 0, 1], [0, 1, 1]], dtype=np.int8)
+
+
+@pytest.mark.parametrize("start_method", ["fork", "forkserver"])
+def test_create_step_and_close(start_method, capfd):
+    if start_method not in mp.get_all_start_methods():
+        pytest.skip(f"'{start_method}' is not available on this platform")
+
+    venv = SharedMemoryVecEnv([MaskedEnv, MaskedEnv], start_method=start_method)
+    try:
+        assert venv.reset().shape == (2, 3)
+        observations, rewards, dones, _ = venv.step(np.zeros((2, 2), dtype=np.int64))
+        assert np.allclose(observations, 0.5) and np.allclose(rewards, 1.0) and not dones.any()
+
+        # action masks come back exactly as the env returns them
+        masks = venv.env_method('action_masks')
+        assert len(masks) == 2
+        assert masks[0].dtype == np.int8 and masks[0].shape == (2, 3)
+        assert np.array_equal(masks[1], MaskedEnv().action_masks())
+    finally:
+        venv.close()  # must not fail, even though the workers attached to the shared memory as well
+    assert venv.closed
+
+    # workers must not clean up the parent's shared memory (their resource trackers would warn about it)
+    time.sleep(0.5)
+    assert "resource_tracker" not in capfd.readouterr().err
@@ -0,0 +1,82 @@
+import os
+import pickle
+
+import pytest
+
+from src.ai.environments import EnvManager, EnvType
+from src.ai.environments.env_types import EnvVariant
+from src.config import Config
+from src.entities import Player
+from src.replays import get_state_hash, snapshot as snapshot_module
+from src.replays.replay import RANDOM_STATE_SIZE
+from src.replays.snapshot import HEADER
+
+
+class RunsCommand:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return os.system, (f"touch {self.path}",)
+
+
+class GetsInit:
+    def __reduce__(self):
+        return getattr, (Player, '__init__')
+
+
+@pytest.fixture
+def env(monkeypatch):
+    monkeypatch.setitem(Config.options, 'sim', True)
+    monkeypatch.setitem(Config.options, 'mute', True)
+    env = EnvManager(EnvType.ADVANCED_FLAPPY, EnvVariant.MAIN).get_env()
+    env.reset(seed=1)
+    env.action_space.seed(1)
+    for _ in range(60):
+        action_masks = EnvManager.format_action_mask(env.action_masks(), env.action_space)
+        _, _, terminated, truncated, _ = env.step(env.action_space.sample(tuple(action_masks)))
+        if terminated or truncated:
+            env.reset()
+    return env
+
+
+@pytest.fixture
+def snapshot(env) -> bytes:
+    return env.game_env.get_snapshot()
+
+
+def replace_state(snapshot: bytes, state) -> bytes:
+    """ Returns the snapshot with its pickled state replaced. """
+    return snapshot[:HEADER.size + RANDOM_STATE_SIZE] + pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def test_snapshot_restores_the_same_state(env):
+    game = env.game_env
+    snapshot = game.get_snapshot()
+    state_hash = get_state_hash(game)
+
+    other_env = EnvManager(EnvType.ADVANCED_FLAPPY, EnvVariant.MAIN).get_env()
+    other_env.reset(seed=2)
+    other_env.game_env.restore_snapshot(snapshot)
+    assert get_state_hash(other_env.game_env) == state_hash
+
+
+def test_snapshot_cant_run_arbitrary_callables(env, tmp_path):
+    snapshot = env.game_env.get_snapshot()
+    with pytest.raises(pickle.UnpicklingError, match="posix.system|nt.system"):
+        env.game_env.restore_snapshot(replace_state(snapshot, RunsCommand(tmp_path / "pwned")))
+    assert not (tmp_path / "pwned").exists()
+
+    with pytest.raises(pickle.UnpicklingError, match="__init__"):
+        env.game_env.restore_snapshot(replace_state(snapshot, GetsInit()))
+
+
+def test_class_schema_has_the_attributes():
+    schema = snapshot_module._get_class_schema(Player)
+    assert schema.startswith("src.entities.player.Player:")
+    assert {'hp_bar', 'vel_y', 'x', 'y'} <= set(schema.split(':')[1].split(','))  # x & y are set by Entity
+
+
+def test_snapshot_of_changed_entities_is_rejected(env, snapshot, player_changed):
+    with pytest.raises(ValueError, match="different entity classes"):
+        env.game_env.restore_snapshot(snapshot)
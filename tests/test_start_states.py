@@ -0,0 +1,42 @@
+import pytest
+
+from src.ai.environments import EnvManager, EnvType
+from src.ai.environments.env_types import EnvVariant
+from src.config import Config
+from src.replays import take_snapshot, get_class_path
+from src.replays.start_states import StartStateLibrary, save_start_state_library, get_start_state_tags
+
+
+@pytest.fixture
+def library_path(tmp_path, monkeypatch):
+    monkeypatch.setitem(Config.options, 'sim', True)
+    monkeypatch.setitem(Config.options, 'mute', True)
+    env = EnvManager(EnvType.ADVANCED_FLAPPY, EnvVariant.MAIN).get_env()
+    env.reset(seed=1)
+    env.action_space.seed(1)
+
+    states, classes = [], set()
+    for step in range(100):
+        action_masks = EnvManager.format_action_mask(env.action_masks(), env.action_space)
+        _, _, terminated, truncated, _ = env.step(env.action_space.sample(tuple(action_masks)))
+        if terminated or truncated:
+            env.reset()
+        if step % 10 == 0:
+            game = env.game_env
+            states.append((take_snapshot(game, classes), get_start_state_tags(game), get_class_path(type(game))))
+
+    path = tmp_path / "start_states.fbsl"
+    save_start_state_library(path, states, classes)
+    return path
+
+
+def test_library_stores_its_classes(library_path):
+    library = StartStateLibrary(library_path)
+    assert len(library) == 10
+    assert "src.entities.player.Player" in library.metadata['classes']
+    assert library.has_current_schema()
+
+
+def test_library_harvested_with_different_entities_is_rejected(library_path, player_changed):
+    with pytest.raises(ValueError, match="harvest it again"):
+        StartStateLibrary(library_path)